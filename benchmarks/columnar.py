@@ -0,0 +1,64 @@
+"""
+Time validating rows and summing a column with the rows and columnar layouts.
+
+Run from the repository root:
+
+    python -m benchmarks.columnar --rows 100000
+"""
+
+import argparse
+import time
+
+from .records import BenchmarkDataSet, make_rows
+
+
+def rows(data: list) -> float:
+    """
+    Validate rows as datasets and sum a column of them.
+    :param data: A list of dictionaries.
+    :return: The sum.
+    """
+    return sum(row["amount"] for row in BenchmarkDataSet.validate_objects(data))
+
+
+def columnar(data: list) -> float:
+    """
+    Validate rows into columns and sum a column.
+    :param data: A list of dictionaries.
+    :return: The sum.
+    """
+    return sum(BenchmarkDataSet.validate_objects(data, layout="columnar")["amount"])
+
+
+def run(count: int, repeat: int) -> dict:
+    """
+    Time both layouts on the same rows.
+    :param count: The number of rows.
+    :param repeat: The number of times to repeat each run. The best is kept.
+    :return: The best time in seconds, by name.
+    """
+    data = make_rows(count)
+    assert rows(data) == columnar(data)
+
+    timings = {}
+    for function in (rows, columnar):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(data)
+            seconds = time.perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+        timings[function.__name__] = best
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    timings = run(args.rows, args.repeat)
+    baseline = timings["rows"]
+    for name, seconds in timings.items():
+        print(f"{name:>10}: {seconds:8.3f}s ({baseline / seconds:6.2f}x)")
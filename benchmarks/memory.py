@@ -0,0 +1,109 @@
+"""
+Measure the peak memory of building datasets from validated documents. In fast
+mode the copies of the document are most of the memory used, while the Cerberus
+validator allocates far more than the copies while it runs.
+
+Run from the repository root:
+
+    python -m benchmarks.memory --fields 5000 --compile-mode fast
+"""
+
+import argparse
+import tracemalloc
+from typing import Optional
+
+from flask_api_tools.validators import DataSet, SanitisedDataSet
+
+
+class BenchmarkDataSet(DataSet):
+    pass
+
+
+class BenchmarkSanitisedDataSet(SanitisedDataSet):
+    pass
+
+
+def make_document(fields: int, compile_mode: Optional[str]) -> dict:
+    """
+    Build a wide document and give both datasets a schema for it.
+    :param fields: The number of fields.
+    :param compile_mode: The compile mode of both datasets.
+    :return: A dictionary.
+    """
+    schema = {f"field_{i}": {"type": "string"} for i in range(fields)}
+    for data_set in (BenchmarkDataSet, BenchmarkSanitisedDataSet):
+        data_set.schema = schema
+        data_set.compile_mode = compile_mode
+        data_set.clear_validator_cache()
+    return {f"field_{i}": f"Value {i}" for i in range(fields)}
+
+
+def copied(data_set: type, document: dict) -> dict:
+    """
+    Validate a document and copy the validator's output into the dataset, the way
+    datasets used to be built.
+    :param data_set: The DataSet class.
+    :param document: A dictionary.
+    :return: Validated data
+    """
+    if data_set.compile_mode == "fast":
+        return data_set(data_set._fast_validator().validate(document))
+
+    with data_set._validator_pool().validator() as validator:
+        assert validator.validate(document), validator.errors
+        return data_set(validator.document)
+
+
+def adopted(data_set: type, document: dict) -> dict:
+    """
+    Validate a document with validate_object.
+    :param data_set: The DataSet class.
+    :param document: A dictionary.
+    :return: Validated data
+    """
+    return data_set.validate_object(document)
+
+
+def peak(function, data_set: type, document: dict) -> int:
+    """
+    Measure the peak memory allocated while a function runs.
+    :param function: The function.
+    :param data_set: The DataSet class.
+    :param document: A dictionary.
+    :return: The peak in bytes.
+    """
+    function(data_set, document)
+    tracemalloc.start()
+    try:
+        function(data_set, document)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(fields: int, compile_mode: Optional[str]) -> dict:
+    """
+    Measure both ways of building each dataset from the same document.
+    :param fields: The number of fields in the document.
+    :param compile_mode: The compile mode of both datasets.
+    :return: The peak in bytes, by name.
+    """
+    document = make_document(fields, compile_mode)
+    peaks = {}
+    for data_set in (BenchmarkDataSet, BenchmarkSanitisedDataSet):
+        assert copied(data_set, document) == adopted(data_set, document)
+        for function in (copied, adopted):
+            name = f"{data_set.__bases__[0].__name__} {function.__name__}"
+            peaks[name] = peak(function, data_set, document)
+    return peaks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fields", type=int, default=5000)
+    parser.add_argument("--compile-mode", choices=("cerberus", "fast"), default="fast")
+    args = parser.parse_args()
+
+    compile_mode = "fast" if args.compile_mode == "fast" else None
+    for name, size in run(args.fields, compile_mode).items():
+        print(f"{name:>25}: {size / 1024:10.1f} KiB")
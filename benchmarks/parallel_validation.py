@@ -0,0 +1,80 @@
+"""
+Benchmark DataSet.validate_objects across a pool of workers.
+
+Run from the repository root:
+
+    python -m benchmarks.parallel_validation --rows 100000 --workers 4
+"""
+
+import argparse
+import os
+import time
+
+from flask_api_tools.validators import DataSet
+
+
+class BenchmarkDataSet(DataSet):
+    schema = {
+        "uuid": {"type": "string", "check_with": "uuid"},
+        "name": {"type": "string", "coerce": "to_string"},
+        "count": {"type": "integer", "coerce": "to_integer"},
+        "score": {"type": "float", "nullable": True, "coerce": "to_nullable_float"},
+        "active": {"type": "boolean", "coerce": "to_bool"},
+        "start_date": {"type": "date", "nullable": True, "coerce": "to_date"},
+    }
+
+
+def make_rows(count: int) -> list:
+    """
+    Build a list of rows that validate against the benchmark schema.
+    :param count: The number of rows.
+    :return: A list of dictionaries.
+    """
+    return [
+        {
+            "uuid": "7c674878-e544-431c-8c11-f11565299cac",
+            "name": f"Name {i}",
+            "count": str(i),
+            "score": "" if i % 5 == 0 else str(i / 7),
+            "active": "True" if i % 2 else "False",
+            "start_date": f"2020-01-{i % 28 + 1:02}",
+        }
+        for i in range(count)
+    ]
+
+
+def run(rows: int, max_workers: int, executor: str, chunk_size: int) -> dict:
+    """
+    Time validation of the same rows with 1 up to max_workers workers.
+    :param rows: The number of rows.
+    :param max_workers: The largest number of workers to time.
+    :param executor: Either "process" or "thread".
+    :param chunk_size: The number of rows sent to a worker at a time.
+    :return: The time taken in seconds, by number of workers.
+    """
+    data = make_rows(rows)
+    timings = {}
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        BenchmarkDataSet.validate_objects(
+            data, workers=workers, executor=executor, chunk_size=chunk_size
+        )
+        timings[workers] = time.perf_counter() - start
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--executor", choices=("process", "thread"), default="process")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    timings = run(args.rows, args.workers, args.executor, args.chunk_size)
+    baseline = timings[1]
+    for workers, seconds in timings.items():
+        print(
+            f"{workers:>3} {args.executor} workers: {seconds:8.3f}s "
+            f"({baseline / seconds:5.2f}x)"
+        )
@@ -0,0 +1,90 @@
+"""
+Measure the memory held by validated rows kept as datasets and as records.
+
+Run from the repository root:
+
+    python -m benchmarks.records --rows 100000
+"""
+
+import argparse
+import tracemalloc
+
+from flask_api_tools.validators import DataSet
+
+
+class BenchmarkDataSet(DataSet):
+    compile_mode = "fast"
+    schema = {
+        "id": {"type": "integer", "coerce": "to_integer"},
+        "name": {"type": "string"},
+        "region": {"type": "string"},
+        "amount": {"type": "float", "coerce": "to_float"},
+        "quantity": {"type": "integer", "coerce": "to_integer"},
+        "active": {"type": "boolean", "coerce": "to_bool"},
+    }
+
+
+def make_rows(count: int) -> list:
+    """
+    Build report-like rows.
+    :param count: The number of rows.
+    :return: A list of dictionaries.
+    """
+    return [
+        {
+            "id": str(i),
+            "name": f"Name {i % 100}",
+            "region": ("north", "south", "east", "west")[i % 4],
+            "amount": i / 7,
+            "quantity": i % 50,
+            "active": "True",
+        }
+        for i in range(count)
+    ]
+
+
+def held(function, rows: list) -> int:
+    """
+    Measure the memory still allocated once a function has returned, while its
+    result is kept.
+    :param function: The function.
+    :param rows: A list of dictionaries.
+    :return: The memory in bytes.
+    """
+    function(rows[:10])
+    tracemalloc.start()
+    try:
+        result = function(rows)
+        size = tracemalloc.get_traced_memory()[0]
+        del result
+        return size
+    finally:
+        tracemalloc.stop()
+
+
+def run(rows: int) -> dict:
+    """
+    Measure the memory held by the same rows as datasets and as records.
+    :param rows: The number of rows.
+    :return: The memory in bytes, by name.
+    """
+    data = make_rows(rows)
+    assert BenchmarkDataSet.validate_objects(data) == BenchmarkDataSet.as_records(data)
+    return {
+        "validate_objects": held(BenchmarkDataSet.validate_objects, data),
+        "as_records": held(BenchmarkDataSet.as_records, data),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    sizes = run(args.rows)
+    baseline = sizes["validate_objects"]
+    for name, size in sizes.items():
+        print(
+            f"{name:>20}: {size / 1024 / 1024:8.1f} MiB "
+            f"({size / args.rows:6.0f} bytes a row, {baseline / size:5.2f}x)"
+        )
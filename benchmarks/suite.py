@@ -0,0 +1,327 @@
+"""
+Time the validators and the rate limiter, and compare the timings with a baseline.
+
+Run from the repository root:
+
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.2
+
+Each benchmark is timed with timeit: the number of loops is picked so that a run
+takes at least 0.2 seconds, the run is repeated, and the best and median time per
+call are kept. Comparing uses the median, and exits with a status of 1 if any
+benchmark is slower than the baseline by more than the threshold.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+
+from unittest import mock
+
+import fakeredis
+
+from .records import BenchmarkDataSet, make_rows
+from .sanitiser import make_rows as make_form_rows
+from flask import Flask
+from flask_api_tools.rate_limiting.in_memory_limiter import InMemoryLimiter
+from flask_api_tools.validators import SanitisedDataSet, Validator
+from limits import parse
+from typing import Callable, Dict, List, Optional
+
+# Inputs for each coercer, covering the "None" and empty values they special case.
+# Every `_normalize_coerce_*` method of Validator needs an entry here.
+NORMALISER_SAMPLES = {
+    "to_string": ["forename", 42, "None", None],
+    "to_nullable_string": ["forename", 42, "", "None", None],
+    "to_integer": ["42", 42, "", "None", None],
+    "to_nullable_integer": ["42", 42, "", "None", None],
+    "to_bool": ["True", "False", "", "None", None],
+    "to_float": ["4.2", 4.2, "", "None", None],
+    "to_nullable_float": ["4.2", 4.2, "", "None", None],
+    "to_date": ["2020-01-31", "", "None", None],
+    "to_datetime": ["2020-01-31T12:30:00", "", "None", None],
+}
+
+# The row counts validate_objects is timed at. Cerberus is only timed up to 1k rows.
+ROW_COUNTS = (1, 1000, 100000)
+CERBERUS_MAX_ROWS = 1000
+
+# Limits high enough never to be exceeded while a benchmark runs.
+LIMITS = "1000000000/second;1000000000/minute;1000000000/hour"
+
+
+class BenchmarkSkipped(Exception):
+    pass
+
+
+class CerberusDataSet(BenchmarkDataSet):
+    compile_mode = None
+
+
+def measure(function: Callable, repeat: int) -> Dict[str, float]:
+    """
+    Time a function.
+    :param function: A function that takes no arguments.
+    :param repeat: The number of runs.
+    :return: The best and median seconds per call, and the calls per run.
+    """
+    timer = timeit.Timer(function)
+    loops, _ = timer.autorange()
+    times = [seconds / loops for seconds in timer.repeat(repeat=repeat, number=loops)]
+    return {"best": min(times), "median": statistics.median(times), "loops": loops}
+
+
+def validator_benchmarks() -> Dict[str, Callable[[], Callable]]:
+    """
+    :return: A function that sets up each validator benchmark, by name.
+    """
+    benchmarks = {}
+    for name, data_set in (("cerberus", CerberusDataSet), ("fast", BenchmarkDataSet)):
+        benchmarks[f"validate_object[{name}]"] = _validate_object(data_set)
+        for count in ROW_COUNTS:
+            if data_set is CerberusDataSet and count > CERBERUS_MAX_ROWS:
+                continue
+            benchmarks[f"validate_objects[{name}-{count}]"] = _validate_objects(
+                data_set, count
+            )
+
+    for method in sorted(dir(Validator)):
+        if method.startswith("_normalize_coerce_"):
+            coercer = method[len("_normalize_coerce_") :]
+            if coercer not in NORMALISER_SAMPLES:
+                raise KeyError(f"There are no sample inputs for {method}")
+            benchmarks[f"normalise[{coercer}]"] = _normalise(method, coercer)
+
+    benchmarks["sanitised_data_set[1]"] = _sanitised_data_set(1)
+    benchmarks["sanitised_data_set[1000]"] = _sanitised_data_set(1000)
+    return benchmarks
+
+
+def limiter_benchmarks() -> Dict[str, Callable[[], Callable]]:
+    """
+    :return: A function that sets up each rate limiter benchmark, by name.
+    """
+    return {
+        "limiter_hit": _limiter_hit,
+        "limiter_check[3-limits]": _limiter_check(local_quota=False),
+        "limiter_check[3-limits-local]": _limiter_check(local_quota=True),
+    }
+
+
+def run(
+    repeat: int, match: Optional[str] = None, out=sys.stdout
+) -> Dict[str, Dict[str, float]]:
+    """
+    Run the benchmarks.
+    :param repeat: The number of runs of each benchmark.
+    :param match: Only run the benchmarks with this in their name.
+    :param out: Where to print progress.
+    :return: The timings of each benchmark, by name.
+    """
+    benchmarks = dict(validator_benchmarks(), **limiter_benchmarks())
+    results = {}
+    for name, setup in benchmarks.items():
+        if match and match not in name:
+            continue
+        try:
+            function = setup()
+        except BenchmarkSkipped as e:
+            print(f"{name:>40}: skipped ({e})", file=out)
+            continue
+        results[name] = measure(function, repeat)
+        print(f"{name:>40}: {_format(results[name]['median'])}", file=out)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+    out=sys.stdout,
+) -> List[str]:
+    """
+    Compare timings with a baseline.
+    :param results: The timings of each benchmark, by name.
+    :param baseline: The baseline timings, by name.
+    :param threshold: How much slower than the baseline a benchmark can be, as a
+                      fraction of the baseline.
+    :param out: Where to print the comparison.
+    :return: The names of the benchmarks that are slower than the threshold allows.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:>40}: not in the baseline", file=out)
+            continue
+
+        ratio = result["median"] / baseline[name]["median"]
+        regressed = ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:>40}: {_format(baseline[name]['median'])} -> "
+            f"{_format(result['median'])} ({ratio:5.2f}x)"
+            f"{'  REGRESSION' if regressed else ''}",
+            file=out,
+        )
+    return regressions
+
+
+def _validate_object(data_set) -> Callable[[], Callable]:
+    """
+    :param data_set: The dataset class.
+    :return: A function that sets up timing validate_object.
+    """
+
+    def setup():
+        row = make_rows(1)[0]
+        data_set.validate_object(row)
+        return lambda: data_set.validate_object(row)
+
+    return setup
+
+
+def _validate_objects(data_set, count: int) -> Callable[[], Callable]:
+    """
+    :param data_set: The dataset class.
+    :param count: The number of rows.
+    :return: A function that sets up timing validate_objects.
+    """
+
+    def setup():
+        rows = make_rows(count)
+        data_set.validate_objects(rows[:1])
+        return lambda: data_set.validate_objects(rows)
+
+    return setup
+
+
+def _normalise(method: str, coercer: str) -> Callable[[], Callable]:
+    """
+    :param method: The name of the normaliser method.
+    :param coercer: The name of the coercer, as used in a schema.
+    :return: A function that sets up timing a normaliser on its sample inputs.
+    """
+
+    def setup():
+        normalise = getattr(Validator(), method)
+        samples = NORMALISER_SAMPLES[coercer]
+        return lambda: [normalise(value) for value in samples]
+
+    return setup
+
+
+def _sanitised_data_set(count: int) -> Callable[[], Callable]:
+    """
+    :param count: The number of rows.
+    :return: A function that sets up timing building SanitisedDataSets.
+    """
+
+    def setup():
+        rows = make_form_rows(count)
+        SanitisedDataSet(rows[0])
+        return lambda: [SanitisedDataSet(row) for row in rows]
+
+    return setup
+
+
+def _limiter(app: Flask) -> InMemoryLimiter:
+    """
+    Build a limiter whose Redis storage is fakeredis.
+    :param app: The app to limit.
+    :return: The limiter.
+    :raise BenchmarkSkipped: if fakeredis cannot run the storage's Lua scripts.
+    """
+    server = fakeredis.FakeServer()
+    app.redis = fakeredis.FakeStrictRedis(server=server)
+    client = fakeredis.FakeStrictRedis(server=server)
+    with mock.patch("redis.from_url", return_value=client):
+        limiter = InMemoryLimiter(
+            app=app, key_func=lambda: "127.0.0.1", storage_uri="redis://localhost"
+        )
+
+    try:
+        limiter.limiter.hit(parse(LIMITS.split(";")[0]), "setup")
+    except Exception as e:
+        raise BenchmarkSkipped(f"fakeredis cannot run Lua scripts: {e}")
+    return limiter
+
+
+def _limiter_hit() -> Callable:
+    """
+    Set up timing a single hit of the storage.
+    :return: The function to time.
+    """
+    limiter = _limiter(Flask(__name__))
+    limit = parse(LIMITS.split(";")[0])
+    return lambda: limiter.limiter.hit(limit, "127.0.0.1", "benchmark")
+
+
+def _limiter_check(local_quota: bool) -> Callable[[], Callable]:
+    """
+    :param local_quota: Whether hits are answered from worker memory first.
+    :return: A function that sets up timing checking the limits of a route that
+             has several.
+    """
+
+    def setup():
+        app = Flask(__name__)
+        app.config["RATELIMIT_LOCAL_QUOTA"] = local_quota
+        limiter = _limiter(app)
+
+        @app.route("/")
+        @limiter.limit(LIMITS)
+        def index():
+            return ""
+
+        context = app.test_request_context("/")
+        context.push()
+        return limiter.check
+
+    return setup
+
+
+def _format(seconds: float) -> str:
+    """
+    :param seconds: A time in seconds.
+    :return: The time in the most readable unit.
+    """
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:8.2f}{unit}"
+    return f"{seconds * 1e9:8.2f}ns"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--match", help="only run benchmarks with this in the name")
+    parser.add_argument("--save", help="write the timings to this JSON file")
+    parser.add_argument("--compare", help="compare with the timings in this file")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.match)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {"python": platform.python_version(), "results": results},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(
+                f"\n{len(regressions)} benchmarks regressed: {', '.join(regressions)}"
+            )
+            sys.exit(1)
@@ -0,0 +1,76 @@
+import time
+
+from .scripts import SCRIPT_HIT_ALL, hit_all_args
+from typing import List, Sequence, Tuple
+
+
+class AsyncRateLimiter:
+    """
+    A fixed window rate limiter that keeps its counts in Redis through a
+    ``redis.asyncio`` client, so that checking limits does not block the event loop.
+    It uses the same keys as the Redis storage of ``limits``, so async and sync
+    checks of a limit share one count.
+    """
+
+    def __init__(self, redis, elastic_expiry: bool = False):
+        """
+        :param redis: A ``redis.asyncio`` client.
+        :param elastic_expiry: Whether every hit extends the window, as with the
+                               fixed-window-elastic-expiry strategy.
+        """
+        self.redis = redis
+        self.elastic_expiry = elastic_expiry
+        self._hit_all = redis.register_script(SCRIPT_HIT_ALL)
+
+    async def hit(self, item, *identifiers) -> bool:
+        """
+        Create a hit on the rate limit.
+        :param item: A ``RateLimitItem``.
+        :param identifiers: The strings that identify the limit.
+        :return: True if the hit is within the limit.
+        """
+        return await self.hit_all([(item, identifiers)]) == 0
+
+    async def hit_all(self, limits: List[Tuple[object, Sequence[str]]]) -> int:
+        """
+        Hit several limits in order in one call to Redis, stopping at the first
+        that is exceeded.
+        :param limits: The ``RateLimitItem`` of each limit and the strings that
+                       identify it.
+        :return: The 1-based index of the limit exceeded, or 0 if none were.
+        """
+        if not limits:
+            return 0
+        keys, argv = hit_all_args(limits, self.elastic_expiry)
+        return int(await self._hit_all(keys, argv))
+
+    async def test(self, item, *identifiers) -> bool:
+        """
+        Check the rate limit is not exceeded, without creating a hit.
+        :param item: A ``RateLimitItem``.
+        :param identifiers: The strings that identify the limit.
+        :return: True if the limit is not exceeded.
+        """
+        return int(await self.redis.get(item.key_for(*identifiers)) or 0) < item.amount
+
+    async def get_window_stats(self, item, *identifiers) -> Tuple[int, int]:
+        """
+        :param item: A ``RateLimitItem``.
+        :param identifiers: The strings that identify the limit.
+        :return: The time the window resets and the number of hits remaining.
+        """
+        key = item.key_for(*identifiers)
+        async with self.redis.pipeline(transaction=False) as pipeline:
+            pipeline.get(key)
+            pipeline.ttl(key)
+            count, ttl = await pipeline.execute()
+        return int(max(ttl, 0) + time.time()), max(0, item.amount - int(count or 0))
+
+    async def check(self) -> bool:
+        """
+        :return: True if Redis can be reached.
+        """
+        try:
+            return bool(await self.redis.ping())
+        except Exception:
+            return False
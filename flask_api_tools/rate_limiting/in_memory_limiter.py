@@ -1,14 +1,92 @@
+import asyncio
+import importlib.util
+import redis
+
+from .async_rate_limiter import AsyncRateLimiter
+from .local_rate_limiter import LocalRateLimiter
+from .scripts import SCRIPT_HIT_ALL, hit_all_args
+from .storage_monitor import StorageMonitor
 from flask_limiter import Limiter
-from flask import Flask
+from flask_limiter.errors import RateLimitExceeded
+from flask_limiter.wrappers import LimitGroup
+from flask import Flask, g, request
+from functools import wraps
+from itertools import chain
 from limits.errors import ConfigurationError
+from limits.storage import RedisClusterStorage, RedisStorage
+from limits.strategies import (
+    FixedWindowElasticExpiryRateLimiter,
+    FixedWindowRateLimiter,
+)
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# The options of the Redis client the limiter builds, by the config key that sets each.
+REDIS_OPTIONS = {
+    "RATELIMIT_REDIS_MAX_CONNECTIONS": "max_connections",
+    "RATELIMIT_REDIS_SOCKET_TIMEOUT": "socket_timeout",
+    "RATELIMIT_REDIS_SOCKET_CONNECT_TIMEOUT": "socket_connect_timeout",
+    "RATELIMIT_REDIS_HEALTH_CHECK_INTERVAL": "health_check_interval",
+}
 
 
 class InMemoryLimiter(Limiter):
     """
     Class extends Flask-Limiter with Redis (or any other supported in-memory storage backend)
     configuration and automatic checks
+
+    Set ``RATELIMIT_LOCAL_QUOTA`` to answer hits that are clearly under the limit from
+    worker memory, sending them to the storage in batches of
+    ``RATELIMIT_LOCAL_BATCH_SIZE`` (default 10) or every ``RATELIMIT_LOCAL_SYNC_INTERVAL``
+    seconds (default 1). See ``LocalRateLimiter`` for how far over a limit this can go.
+
+    With Redis storage and a fixed window strategy, every limit that applies to a request
+    is checked and hit in one Lua script call, instead of one call per limit.
+
+    Set ``RATELIMIT_MONITOR_INTERVAL`` to check the storage in the background every that
+    many seconds, switching to the in-memory fallback while it is slow or failing. See
+    ``StorageMonitor`` for the other ``RATELIMIT_MONITOR_*`` keys.
+
+    Async views decorated with ``async_limit`` check their limits through ``redis.asyncio``
+    instead, so that they do not block the event loop. Each event loop gets a client of
+    its own, built the first time it checks a limit.
+
+    Pass ``redis_client`` (or set ``RATELIMIT_REDIS_CLIENT``) to keep limits with an
+    existing Redis client or connection pool, such as the app's, instead of a pool of
+    the limiter's own. The ``RATELIMIT_REDIS_*`` keys in ``REDIS_OPTIONS`` tune the pool
+    the limiter builds otherwise.
     """
 
+    SCRIPT_HIT_ALL = SCRIPT_HIT_ALL
+
+    _hit_all_script = None
+    _shared_redis_client = None
+    _async_redis: Optional[Callable] = None
+    monitor: Optional[StorageMonitor] = None
+
+    def __init__(
+        self,
+        app: Optional[Flask] = None,
+        redis_client=None,
+        async_redis_client=None,
+        **kwargs,
+    ) -> None:
+        """
+        :param app: ``Flask`` instance to initialize the extension with.
+        :param redis_client: A Redis client or connection pool to keep limits with.
+                             Defaults to the app's ``RATELIMIT_REDIS_CLIENT``.
+        :param async_redis_client: A function that builds a ``redis.asyncio`` client,
+                                   called once for each event loop, or a client to
+                                   use on a single event loop. Defaults to the
+                                   app's ``RATELIMIT_ASYNC_REDIS_CLIENT``.
+        :param kwargs: Any other Flask-Limiter arguments.
+        """
+        self._redis_client = redis_client
+        self._async_redis_client = async_redis_client
+        self._async_limiters: Dict = {}
+        self._async_limiters_lock = Lock()
+        super().__init__(app=app, **kwargs)
+
     def init_app(self, app: Flask) -> None:
         """
         patch self._check_storage into Flask-limiter, and ensure the storage backend is connected properly
@@ -19,15 +97,468 @@ class InMemoryLimiter(Limiter):
         :return: None
         :raise ConfigurationError: if storage is incorrectly configured
         """
+        if app:
+            self._configure_redis(app)
         super().init_app(app=app)
+        self._hit_all_script = None
 
         if app:
             for handler in app.logger.handlers:
                 self.logger.addHandler(handler)
                 self.logger.debug(f"Added log handler to limiter: {str(handler)}")
 
+            if self.enabled:
+                self._share_redis_client(app)
+                if app.config.get("RATELIMIT_LOCAL_QUOTA", False):
+                    self._enable_local_quota(app)
+                self._async_redis = self._async_redis_factory(app)
+                with self._async_limiters_lock:
+                    self._async_limiters.clear()
+
         self._check_storage()
 
+        if app and self.enabled and app.config.get("RATELIMIT_MONITOR_INTERVAL"):
+            self._start_monitor(app)
+
+    def reset(self) -> None:
+        """
+        Reset the storage, and forget the counts and hits held in worker memory
+        :return: None
+        """
+        super().reset()
+        if isinstance(self._limiter, LocalRateLimiter):
+            self._limiter.clear()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Report how the connections of the storage's Redis connection pool are used.
+        The counts are read from the pool's internals, so they may be missing with
+        other versions of redis-py
+        :return: The maximum, created, in use and available connections, and whether
+                 the client was given to the limiter. Empty if the storage is not Redis.
+        """
+        if not isinstance(self._storage, RedisStorage):
+            return {}
+
+        pool = self._storage.storage.connection_pool
+        if hasattr(pool, "pool"):
+            # A BlockingConnectionPool fills its queue with None for the connections
+            # it has not created yet.
+            created = len(getattr(pool, "_connections", []))
+            available = sum(1 for c in list(pool.pool.queue) if c is not None)
+            in_use = created - available
+        else:
+            created = getattr(pool, "_created_connections", None)
+            available = len(getattr(pool, "_available_connections", []))
+            in_use = len(getattr(pool, "_in_use_connections", []))
+        return {
+            "max_connections": pool.max_connections,
+            "created": created,
+            "in_use": in_use,
+            "available": available,
+            "shared": self._shared_redis_client is not None,
+        }
+
+    def _Limiter__evaluate_limits(self, endpoint: str, limits: List) -> None:
+        """
+        Replaces Flask-Limiter's private ``__evaluate_limits`` so that every limit of a
+        request is checked and hit in one call to Redis. Limits are hit in order and
+        the first one exceeded stops the rest, as Flask-Limiter does one at a time.
+        Other storages, strategies, conditional deductions and the in-memory fallback
+        use Flask-Limiter's own checks.
+        :param endpoint: The endpoint of the request.
+        :param limits: The limits that apply to the request.
+        :return: None
+        :raise RateLimitExceeded: if a limit is exceeded
+        """
+        script = self._hit_all()
+        if script is None or any(lim.deduct_when for lim in limits):
+            return super()._Limiter__evaluate_limits(endpoint, limits)
+
+        checks = self._limit_checks(endpoint, limits)
+        items = [(lim.limit, args) for lim, args in checks]
+        failed = script(*hit_all_args(items, self._elastic_expiry)) if checks else 0
+        self._apply_limit_checks(checks, failed)
+
+    def async_limit(
+        self,
+        limit_value,
+        key_func: Optional[Callable] = None,
+        per_method: bool = False,
+        methods: Optional[List[str]] = None,
+        error_message=None,
+        exempt_when: Optional[Callable] = None,
+        override_defaults: bool = True,
+    ) -> Callable:
+        """
+        Decorator to rate limit an async view, with the same arguments as ``limit``.
+        The view's limits, the application limits and (unless overridden) the default
+        limits are checked with ``async_limiter`` in one call to Redis, without
+        blocking the event loop. Without an ``async_limiter`` (storage other than a
+        single Redis server, or another strategy) and while the in-memory fallback is
+        in use, they are checked the same way as for other views, including the checks
+        for whether the storage has recovered.
+        :param limit_value: The limits, as a string or a function that returns one.
+        :param key_func: The function that identifies the caller.
+        :param per_method: Whether the limits apply to each HTTP method separately.
+        :param methods: The HTTP methods the limits apply to.
+        :param error_message: The message of the 429 response.
+        :param exempt_when: A function that returns True if the request is exempt.
+        :param override_defaults: Whether the limits replace the default limits.
+        :return: The decorator.
+        """
+        group = LimitGroup(
+            limit_value,
+            key_func or self._key_func,
+            None,
+            per_method,
+            methods,
+            error_message,
+            exempt_when,
+            override_defaults,
+            None,
+        )
+
+        def decorator(view: Callable) -> Callable:
+            # The limits are checked by the view itself, not before the request.
+            self._exempt_routes.add(f"{view.__module__}.{view.__name__}")
+
+            @wraps(view)
+            async def limited(*args, **kwargs):
+                await self._check_request_limit_async(list(group))
+                return await view(*args, **kwargs)
+
+            return limited
+
+        return decorator
+
+    @property
+    def async_limiter(self) -> Optional[AsyncRateLimiter]:
+        """
+        The async rate limiter of the running event loop. ``redis.asyncio`` clients are
+        tied to the loop they first run on, and without an ASGI server Flask runs each
+        async view on a new loop, so every loop gets a limiter and client of its own.
+        Those of loops that have been closed are dropped
+        :return: The async rate limiter, or None if async views use the sync checks or
+                 no event loop is running.
+        """
+        if self._async_redis is None:
+            return None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+        with self._async_limiters_lock:
+            async_limiter = self._async_limiters.get(loop)
+            if async_limiter is None:
+                for closed in [
+                    other for other in self._async_limiters if other.is_closed()
+                ]:
+                    del self._async_limiters[closed]
+                async_limiter = self._async_limiters[loop] = AsyncRateLimiter(
+                    self._async_redis(), elastic_expiry=self._elastic_expiry
+                )
+        return async_limiter
+
+    async def check_storage_async(self) -> bool:
+        """
+        Check the storage can be reached without blocking the event loop
+        :return: True if the storage can be reached.
+        """
+        async_limiter = self.async_limiter
+        if async_limiter is not None:
+            return await async_limiter.check()
+        return self._storage.check()
+
+    async def _check_request_limit_async(self, route_limits: List) -> None:
+        """
+        Check the limits of the current request to an async view
+        :param route_limits: The limits of the view.
+        :return: None
+        :raise RateLimitExceeded: if a limit is exceeded
+        """
+        if (
+            not (self.enabled and self.initialized)
+            or request.blueprint in self._blueprint_exempt
+            or any(fn() for fn in self._request_filters)
+        ):
+            return
+
+        endpoint = request.endpoint or ""
+        if self._storage_dead and self._fallback_limiter:
+            # As Flask-Limiter does for other views, which these views are exempt from.
+            if (
+                self._Limiter__should_check_backend()
+                and await self.check_storage_async()
+            ):
+                self.logger.info("Rate limit storage recovered")
+                self._storage_dead = False
+                self._Limiter__check_backend_count = 0
+            else:
+                fallback_limits = list(chain(*self._in_memory_fallback))
+                if fallback_limits:
+                    self._Limiter__evaluate_limits(endpoint, fallback_limits)
+                    return
+
+        limits = list(chain(*self._application_limits)) + route_limits
+        if all(lim.method_exempt for lim in route_limits) or all(
+            not lim.override_defaults for lim in route_limits
+        ):
+            limits += list(chain(*self._default_limits))
+
+        async_limiter = self.async_limiter
+        if async_limiter is None or self._storage_dead:
+            # Without fallback limits of its own, the in-memory fallback checks the
+            # request's limits, as Flask-Limiter does.
+            self._Limiter__evaluate_limits(endpoint, limits)
+            return
+
+        try:
+            checks = self._limit_checks(endpoint, limits)
+            failed = await async_limiter.hit_all(
+                [(lim.limit, args) for lim, args in checks]
+            )
+        except Exception:
+            if self._in_memory_fallback_enabled and not self._storage_dead:
+                self.logger.warning(
+                    "Rate limit storage unreachable - falling back to in-memory storage"
+                )
+                self._storage_dead = True
+                await self._check_request_limit_async(route_limits)
+                return
+            if self._swallow_errors:
+                self.logger.exception("Failed to rate limit. Swallowing error")
+                return
+            raise
+        self._apply_limit_checks(checks, failed)
+
+    def _configure_redis(self, app: Flask) -> None:
+        """
+        Point the storage at Redis when a client is shared, otherwise add the
+        ``RATELIMIT_REDIS_*`` options to those of the Redis client Flask-Limiter builds
+        :param app: ``Flask`` instance with the Redis configuration.
+        :return: None
+        """
+        config = app.config
+        uri = self._storage_uri or config.get("RATELIMIT_STORAGE_URL")
+        if self._redis_client is not None or config.get("RATELIMIT_REDIS_CLIENT"):
+            # The shared client replaces the one built from this URI.
+            if uri is None:
+                config["RATELIMIT_STORAGE_URL"] = "redis://"
+            return
+
+        if uri and uri.split("://")[0] in ("redis", "rediss", "redis+unix"):
+            # Flask-Limiter's default options are a dict shared by every instance.
+            options = dict(self._storage_options)
+            for key, option in REDIS_OPTIONS.items():
+                if key in config:
+                    options.setdefault(option, config[key])
+            self._storage_options = options
+
+    def _share_redis_client(self, app: Flask) -> None:
+        """
+        Replace the Redis client of the storage with the one given to the limiter
+        :param app: ``Flask`` instance with the Redis configuration.
+        :return: None
+        """
+        self._shared_redis_client = None
+        client = self._redis_client or app.config.get("RATELIMIT_REDIS_CLIENT")
+        if client is None:
+            return
+
+        if type(self._storage) is not RedisStorage:
+            self.logger.warning(
+                f"A Redis client can only be shared with Redis storage: {self._storage}"
+            )
+            return
+
+        if isinstance(client, redis.ConnectionPool):
+            client = redis.Redis(connection_pool=client)
+        self._storage.storage = client
+        self._storage.initialize_storage(None)
+        self._shared_redis_client = client
+        self.logger.debug(f"Sharing Redis client with rate limit storage: {client}")
+
+    def _async_redis_factory(self, app: Flask) -> Optional[Callable]:
+        """
+        Find how to build the ``redis.asyncio`` client of each event loop, if the
+        storage is a single Redis server and the strategy is a fixed window.
+        ``redis.asyncio`` is only imported when the first client is built, and async
+        views use the sync checks if it is not installed
+        :param app: ``Flask`` instance with the storage configuration.
+        :return: A function that builds a client, or None if async views use the sync
+                 checks.
+        """
+        if type(self._storage) is not RedisStorage or type(self._limiter) not in (
+            FixedWindowRateLimiter,
+            FixedWindowElasticExpiryRateLimiter,
+        ):
+            return None
+
+        client = self._async_redis_client or app.config.get(
+            "RATELIMIT_ASYNC_REDIS_CLIENT"
+        )
+        if client is not None:
+            return client if callable(client) else lambda: client
+        if self._shared_redis_client is not None:
+            # The storage URI is not where the shared client connects to.
+            return None
+        if importlib.util.find_spec("redis.asyncio") is None:
+            self.logger.debug("redis.asyncio not found - async views use sync checks")
+            return None
+
+        uri = (self._storage_uri or app.config["RATELIMIT_STORAGE_URL"]).replace(
+            "redis+unix", "unix"
+        )
+        options = dict(self._storage_options)
+
+        def build():
+            from redis.asyncio import from_url
+
+            return from_url(uri, **options)
+
+        return build
+
+    def _limit_checks(self, endpoint: str, limits: List) -> List[Tuple]:
+        """
+        Find the limits that apply to the current request, and what identifies each
+        :param endpoint: The endpoint of the request.
+        :param limits: The limits of the request.
+        :return: The ``RateLimitItem`` and identifiers of each limit that applies.
+        """
+        if not getattr(g, "conditional_deductions", None):
+            g.conditional_deductions = {}
+
+        checks = []
+        for lim in limits:
+            if lim.is_exempt or lim.method_exempt:
+                continue
+
+            limit_scope = lim.scope or endpoint
+            if lim.per_method:
+                limit_scope += f":{request.method}"
+            args = [lim.key_func(), limit_scope]
+            if not all(args):
+                self.logger.error(
+                    "Skipping limit: %s. Empty value found in parameters.", lim.limit
+                )
+                continue
+
+            if self._key_prefix:
+                args = [self._key_prefix] + args
+            checks.append((lim, args))
+        return checks
+
+    def _apply_limit_checks(self, checks: List[Tuple], failed: int) -> None:
+        """
+        Record the limit for the rate limit headers, and raise if one was exceeded
+        :param checks: The limits that were hit, and their identifiers.
+        :param failed: The 1-based index of the limit exceeded, or 0 if none were.
+        :return: None
+        :raise RateLimitExceeded: if a limit was exceeded
+        """
+        if failed:
+            lim, args = checks[failed - 1]
+            self.logger.warning(
+                "ratelimit %s (%s) exceeded at endpoint: %s",
+                lim.limit,
+                args[-2],
+                args[-1],
+            )
+            g.view_rate_limit = [lim.limit] + args
+            raise RateLimitExceeded(lim)
+
+        limit_for_header = None
+        for lim, args in checks:
+            if not limit_for_header or lim.limit < limit_for_header[0]:
+                limit_for_header = [lim.limit] + args
+        g.view_rate_limit = limit_for_header
+
+    @property
+    def _elastic_expiry(self) -> bool:
+        """
+        :return: True if every hit extends the window of a limit.
+        """
+        return type(self._limiter) is FixedWindowElasticExpiryRateLimiter
+
+    def _hit_all(self):
+        """
+        Register the script that hits every limit of a request, if the storage and
+        strategy support it and the storage has not fallen back to memory
+        :return: The script, or None if Flask-Limiter's own checks must be used.
+        """
+        if (
+            self._storage_dead
+            or not isinstance(self._storage, RedisStorage)
+            or isinstance(self._storage, RedisClusterStorage)
+            or type(self._limiter)
+            not in (FixedWindowRateLimiter, FixedWindowElasticExpiryRateLimiter)
+        ):
+            return None
+
+        if self._hit_all_script is None:
+            self._hit_all_script = self._storage.storage.register_script(
+                self.SCRIPT_HIT_ALL
+            )
+        return self._hit_all_script
+
+    def _Limiter__should_check_backend(self) -> bool:
+        """
+        Replaces Flask-Limiter's private ``__should_check_backend``, so that requests
+        do not check whether the storage has recovered while the monitor decides that
+        :return: True if the request should check the storage.
+        """
+        if self.monitor is not None and self.monitor.is_alive():
+            return False
+        return super()._Limiter__should_check_backend()
+
+    def _start_monitor(self, app: Flask) -> None:
+        """
+        Start a StorageMonitor, configured by the app's ``RATELIMIT_MONITOR_*`` keys
+        :param app: ``Flask`` instance with the monitor configuration.
+        :return: None
+        """
+        if not self._in_memory_fallback_enabled:
+            self.logger.warning(
+                "Rate limit storage monitor needs the in-memory fallback enabled"
+            )
+            return
+
+        if self.monitor is not None:
+            self.monitor.stop()
+        config = app.config
+        self.monitor = StorageMonitor(
+            self,
+            interval=config["RATELIMIT_MONITOR_INTERVAL"],
+            max_latency=config.get("RATELIMIT_MONITOR_MAX_LATENCY", 0.1),
+            max_error_rate=config.get("RATELIMIT_MONITOR_MAX_ERROR_RATE", 0.5),
+            window=config.get("RATELIMIT_MONITOR_WINDOW", 10),
+            recovery_probes=config.get("RATELIMIT_MONITOR_RECOVERY_PROBES", 3),
+        )
+        self.monitor.start()
+        self.logger.debug(f"Started monitoring rate limit storage: {self._storage}")
+
+    def _enable_local_quota(self, app: Flask) -> None:
+        """
+        Put a LocalRateLimiter in front of the storage, so that hits clearly under the
+        limit are answered without a call to the storage
+        :param app: ``Flask`` instance with the local quota configuration.
+        :return: None
+        """
+        if type(self._limiter) is not FixedWindowRateLimiter:
+            self.logger.warning(
+                f"Local quotas need the fixed-window strategy, not {self._limiter}"
+            )
+            return
+
+        self._limiter = LocalRateLimiter(
+            self._limiter,
+            batch_size=app.config.get("RATELIMIT_LOCAL_BATCH_SIZE", 10),
+            sync_interval=app.config.get("RATELIMIT_LOCAL_SYNC_INTERVAL", 1.0),
+        )
+        self.logger.debug(f"Local quotas enabled in front of: {self._storage}")
+
     def _check_storage(self) -> None:
         """
         Check the storage backed is connected correctly
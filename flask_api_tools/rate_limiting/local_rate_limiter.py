@@ -0,0 +1,210 @@
+import time
+
+from .scripts import SCRIPT_INCR_BY
+from limits.storage import RedisStorage
+from limits.strategies import FixedWindowRateLimiter, RateLimiter
+from threading import Lock
+from typing import Dict, Tuple
+
+
+class LocalRateLimiter(RateLimiter):
+    """
+    A fixed window rate limiter that answers hits from worker memory while a limit
+    is clearly not close to being exceeded, and sends them to the storage in
+    batches.
+
+    The first hit of each key in a window goes to the storage, which returns the
+    count of every worker. After that, up to ``batch_size`` hits are admitted
+    locally while the last count seen plus the local hits is under the limit.
+    They are added to the storage in one call once there are ``batch_size`` of
+    them, or on the first hit after ``sync_interval`` seconds. Near the limit every
+    hit goes to the storage.
+
+    A worker only admits hits locally while the last count it saw is under the
+    limit, and at most ``batch_size`` of them before it syncs, so a window admits
+    at most ``workers * batch_size`` hits over the limit.
+    """
+
+    def __init__(
+        self,
+        limiter: FixedWindowRateLimiter,
+        batch_size: int = 10,
+        sync_interval: float = 1.0,
+        max_keys: int = 10000,
+    ):
+        """
+        :param limiter: The fixed window rate limiter of the storage.
+        :param batch_size: The maximum number of hits admitted locally before they
+                           are sent to the storage.
+        :param sync_interval: The maximum number of seconds local hits are held for
+                              before they are sent, on the next hit of the key.
+        :param max_keys: The number of keys held locally above which the keys of
+                         windows that have ended are dropped.
+        :raise ValueError: if the rate limiter is not a fixed window rate limiter.
+        """
+        if type(limiter) is not FixedWindowRateLimiter:
+            raise ValueError("Only the fixed-window strategy can be batched locally")
+        super(LocalRateLimiter, self).__init__(limiter.storage())
+        self.limiter = limiter
+        self.batch_size = batch_size
+        self.sync_interval = sync_interval
+        self.max_keys = max_keys
+        self.local_hits = 0
+        self.storage_hits = 0
+        self._quotas: Dict[str, _Quota] = {}
+        self._lock = Lock()
+        self._incr_by_script = None
+
+    def hit(self, item, *identifiers) -> bool:
+        """
+        Create a hit on the rate limit.
+        :param item: A ``RateLimitItem``.
+        :param identifiers: The strings that identify the limit.
+        :return: True if the hit is within the limit.
+        """
+        key = item.key_for(*identifiers)
+        now = time.time()
+        with self._lock:
+            quota = self._quota(key, now)
+            if (
+                quota is not None
+                and quota.pending < self.batch_size
+                and quota.count + quota.pending < item.amount
+                and now - quota.synced < self.sync_interval
+            ):
+                quota.pending += 1
+                self.local_hits += 1
+                return True
+
+            amount = 1
+            if quota is not None:
+                amount += quota.pending
+                quota.pending = 0
+            self.storage_hits += 1
+
+        return self._sync(key, item.get_expiry(), amount, now) <= item.amount
+
+    def test(self, item, *identifiers) -> bool:
+        """
+        Check the rate limit is not exceeded, without creating a hit.
+        :param item: A ``RateLimitItem``.
+        :param identifiers: The strings that identify the limit.
+        :return: True if the limit is not exceeded.
+        """
+        with self._lock:
+            quota = self._quota(item.key_for(*identifiers), time.time())
+            if quota is not None:
+                return quota.count + quota.pending < item.amount
+        return self.limiter.test(item, *identifiers)
+
+    def get_window_stats(self, item, *identifiers) -> Tuple[int, int]:
+        """
+        :param item: A ``RateLimitItem``.
+        :param identifiers: The strings that identify the limit.
+        :return: The time the window resets and the number of hits remaining.
+        """
+        with self._lock:
+            quota = self._quota(item.key_for(*identifiers), time.time())
+            if quota is not None:
+                return int(quota.reset), max(
+                    0, item.amount - quota.count - quota.pending
+                )
+        return self.limiter.get_window_stats(item, *identifiers)
+
+    def flush(self) -> None:
+        """
+        Send every hit admitted locally to the storage, for example before the
+        worker exits.
+        """
+        now = time.time()
+        with self._lock:
+            pending = {}
+            for key, quota in list(self._quotas.items()):
+                if self._quota(key, now) is not None and quota.pending:
+                    pending[key] = (quota.reset - now, quota.pending)
+                    quota.pending = 0
+
+        for key, (expiry, amount) in pending.items():
+            self._sync(key, max(1, int(expiry)), amount, now)
+
+    def clear(self) -> None:
+        """
+        Forget every count and hit held locally, without sending them.
+        """
+        with self._lock:
+            self._quotas.clear()
+
+    def _quota(self, key: str, now: float):
+        """
+        Find the local state of a key, dropping it if its window has ended. The
+        lock must be held.
+        :param key: The key of the limit.
+        :param now: The current time.
+        :return: The state, or None if there is none for the current window.
+        """
+        quota = self._quotas.get(key)
+        if quota is not None and quota.reset <= now:
+            del self._quotas[key]
+            return None
+        return quota
+
+    def _sync(self, key: str, expiry: int, amount: int, now: float) -> int:
+        """
+        Add hits to the storage and remember the count it returns.
+        :param key: The key of the limit.
+        :param expiry: The length of the window in seconds.
+        :param amount: The number of hits.
+        :param now: The time of the hits.
+        :return: The count of the window, including the hits.
+        """
+        count, reset = self._incr_by(key, expiry, amount)
+        with self._lock:
+            quota = self._quotas.get(key)
+            if quota is None:
+                if len(self._quotas) >= self.max_keys:
+                    for expired in [
+                        k for k, q in self._quotas.items() if q.reset <= now
+                    ]:
+                        del self._quotas[expired]
+                quota = self._quotas[key] = _Quota()
+            quota.count = count
+            quota.reset = reset
+            quota.synced = now
+        return count
+
+    def _incr_by(self, key: str, expiry: int, amount: int) -> Tuple[int, float]:
+        """
+        Add several hits to the count of a fixed window. With Redis storage the hits
+        and the expiry of a new window are set by one script, so that a key is never
+        left without an expiry.
+        :param key: The key of the limit.
+        :param expiry: The length of the window in seconds.
+        :param amount: The number of hits.
+        :return: The count of the window, and the time it resets.
+        """
+        storage = self.storage()
+        if isinstance(storage, RedisStorage):
+            if self._incr_by_script is None:
+                self._incr_by_script = storage.storage.register_script(SCRIPT_INCR_BY)
+            count, ttl = self._incr_by_script([key], [amount, expiry])
+            return int(count), time.time() + int(ttl) / 1000
+
+        # Other storages can only count one hit at a time.
+        for _ in range(amount):
+            count = storage.incr(key, expiry)
+        return count, storage.get_expiry(key)
+
+
+class _Quota:
+    """
+    The local state of a limit key: the last count seen in the storage, the hits
+    admitted locally since, when the window resets and when it was last synced.
+    """
+
+    __slots__ = ("count", "pending", "reset", "synced")
+
+    def __init__(self):
+        self.count = 0
+        self.pending = 0
+        self.reset = 0.0
+        self.synced = 0.0
@@ -0,0 +1,45 @@
+# Hits each limit key in turn, stopping at the first that is over its amount, and
+# returns its (1-based) index, or 0 if every limit allowed the hit. ARGV[1] is 1 for
+# elastic expiry, followed by the amount and expiry of each key.
+SCRIPT_HIT_ALL = """
+    local elastic = tonumber(ARGV[1])
+    for i = 1, #KEYS do
+        local current = redis.call("incr", KEYS[i])
+        if elastic == 1 or current == 1 then
+            redis.call("expire", KEYS[i], tonumber(ARGV[i * 2 + 1]))
+        end
+        if current > tonumber(ARGV[i * 2]) then
+            return i
+        end
+    end
+    return 0
+"""
+
+# Adds ARGV[1] hits to a fixed window key, setting its expiry of ARGV[2] seconds if it
+# has none, in one atomic call. Returns the count and the milliseconds until the
+# window resets.
+SCRIPT_INCR_BY = """
+    local current = redis.call("incrby", KEYS[1], tonumber(ARGV[1]))
+    local ttl = redis.call("pttl", KEYS[1])
+    if ttl < 0 then
+        redis.call("expire", KEYS[1], tonumber(ARGV[2]))
+        ttl = tonumber(ARGV[2]) * 1000
+    end
+    return {current, ttl}
+"""
+
+
+def hit_all_args(limits, elastic_expiry: bool):
+    """
+    Build the keys and arguments of SCRIPT_HIT_ALL.
+    :param limits: The ``RateLimitItem`` of each limit and the strings that identify
+                   it.
+    :param elastic_expiry: Whether every hit extends the window.
+    :return: The keys and the arguments.
+    """
+    keys = []
+    argv = [int(elastic_expiry)]
+    for item, identifiers in limits:
+        keys.append(item.key_for(*identifiers))
+        argv += [item.amount, item.get_expiry()]
+    return keys, argv
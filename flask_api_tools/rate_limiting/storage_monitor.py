@@ -0,0 +1,173 @@
+import time
+
+from collections import deque
+from threading import Event, Lock, Thread
+from typing import Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class StorageMonitor:
+    """
+    A circuit breaker for the storage of a Flask-Limiter limiter, driven by a
+    background thread that checks the storage every ``interval`` seconds.
+
+    While the circuit is closed, limits are kept in the storage. It opens, switching
+    the limiter to its in-memory fallback, when a check takes longer than
+    ``max_latency`` seconds or the share of the last ``window`` checks that failed
+    reaches ``max_error_rate``. It also opens when a request finds the storage
+    unreachable and Flask-Limiter falls back by itself. While it is open, each check
+    is a probe for recovery: after the first that succeeds in time the circuit is
+    half-open, and after ``recovery_probes`` in a row it closes and the storage is used
+    again. Each change of state is logged with the limiter's logger.
+    """
+
+    def __init__(
+        self,
+        limiter,
+        interval: float = 5.0,
+        max_latency: float = 0.1,
+        max_error_rate: float = 0.5,
+        window: int = 10,
+        recovery_probes: int = 3,
+    ):
+        """
+        :param limiter: The limiter, which must have the in-memory fallback enabled.
+        :param interval: The number of seconds between checks.
+        :param max_latency: The number of seconds a check can take before the circuit
+                            opens.
+        :param max_error_rate: The share of failed checks, from 0 to 1, at which the
+                               circuit opens.
+        :param window: The number of recent checks the error rate is measured over.
+        :param recovery_probes: The number of checks in a row that must succeed in
+                                time for an open circuit to close.
+        """
+        self.limiter = limiter
+        self.interval = interval
+        self.max_latency = max_latency
+        self.max_error_rate = max_error_rate
+        self.recovery_probes = recovery_probes
+        self.state = CLOSED
+        self.latency: Optional[float] = None
+        self._results: deque = deque(maxlen=window)
+        self._healthy_probes = 0
+        self._lock = Lock()
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def error_rate(self) -> float:
+        """
+        :return: The share of the recent checks that failed, from 0 to 1.
+        """
+        return self._results.count(False) / len(self._results) if self._results else 0.0
+
+    def is_alive(self) -> bool:
+        """
+        :return: True if the background thread is running.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Start checking the storage in a background thread. Threads do not survive a
+        fork, so this must be called in each worker process.
+        """
+        if self.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = Thread(
+            target=self._run, name="flask-api-tools-storage-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the background thread.
+        :param timeout: The number of seconds to wait for it to stop.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def probe(self) -> str:
+        """
+        Check the storage once and move the circuit to the state that calls for.
+        :return: The state of the circuit.
+        """
+        start = time.perf_counter()
+        try:
+            healthy = bool(self.limiter._storage.check())
+        except Exception:
+            healthy = False
+        latency = time.perf_counter() - start
+
+        with self._lock:
+            self.latency = latency
+            self._results.append(healthy)
+            in_time = healthy and latency <= self.max_latency
+
+            if self.state == CLOSED:
+                if self.limiter._storage_dead:
+                    self._open("a request could not reach the storage")
+                elif (
+                    healthy and latency > self.max_latency
+                ) or self.error_rate >= self.max_error_rate:
+                    self._open(
+                        f"latency {latency * 1000:.1f}ms, "
+                        f"error rate {self.error_rate:.0%}"
+                    )
+            elif not in_time:
+                if self.state == HALF_OPEN:
+                    self._change(OPEN, f"probe failed, latency {latency * 1000:.1f}ms")
+                self._healthy_probes = 0
+            else:
+                self._healthy_probes += 1
+                if self._healthy_probes >= self.recovery_probes:
+                    self._close()
+                elif self.state == OPEN:
+                    self._change(HALF_OPEN, "probe succeeded")
+            return self.state
+
+    def _run(self) -> None:
+        """
+        Probe the storage every interval until stopped.
+        """
+        while not self._stopped.wait(self.interval):
+            try:
+                self.probe()
+            except Exception:
+                self.limiter.logger.exception("Rate limit storage monitor failed")
+
+    def _open(self, reason: str) -> None:
+        """
+        Switch the limiter to its in-memory fallback. The lock must be held.
+        :param reason: Why the circuit is opening.
+        """
+        self.limiter._storage_dead = True
+        self._healthy_probes = 0
+        self._change(OPEN, reason)
+
+    def _close(self) -> None:
+        """
+        Switch the limiter back to the storage. The lock must be held.
+        """
+        self.limiter._storage_dead = False
+        self._healthy_probes = 0
+        self._results.clear()
+        self._change(CLOSED, f"{self.recovery_probes} probes succeeded")
+
+    def _change(self, state: str, reason: str) -> None:
+        """
+        Log a change of state.
+        :param state: The new state.
+        :param reason: Why the state is changing.
+        """
+        log = self.limiter.logger.info if state == CLOSED else self.limiter.logger.error
+        log(
+            f"Rate limit storage circuit {self.state} -> {state} ({reason}): "
+            f"{self.limiter._storage}"
+        )
+        self.state = state
@@ -1,3 +1,37 @@
-from .data_set import DataSet
-from .sanitised_data_set import SanitisedDataSet
-from .validator import Validator
+from importlib import import_module
+
+# The module each public name is defined in. Modules are only imported when one of
+# their names is first used, so that importing the package stays fast and the
+# sanitiser's dependencies are only loaded by services that sanitise.
+_MODULES = {
+    "Columns": ".columns",
+    "DataSet": ".data_set",
+    "Record": ".record",
+    "RedisResultCache": ".redis_result_cache",
+    "ResultCache": ".result_cache",
+    "SanitisedDataSet": ".sanitised_data_set",
+    "ValidationResult": ".validation_result",
+    "Validator": ".validator",
+    "warmup": ".warm_up",
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str):
+    """
+    Import the module a public name is defined in the first time it is used.
+    :param name: The name.
+    :return: The value of the name.
+    :raise AttributeError: if the name is not public.
+    """
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(_MODULES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
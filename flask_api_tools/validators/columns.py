@@ -0,0 +1,162 @@
+from array import array
+from collections.abc import Mapping
+from typing import Dict, List, Optional
+
+# The array typecode used for the values of each schema type. Columns of any other
+# type are lists.
+TYPECODES = {"integer": "q", "float": "d"}
+
+# Stands in for the missing and null values of a column held in an array.
+_PLACEHOLDERS = {"q": 0, "d": 0.0}
+
+
+class Columns(dict):
+    """
+    Validated rows held as a column for each field of the schema. Integer and float
+    fields are held in an array, every other field in a list. Fields that are
+    nullable or not required also have a null bitmap, with a bit set for each row
+    where the value is None or missing.
+    """
+
+    def __init__(self, length: int, columns: Dict, nulls: Dict[str, bytearray]):
+        """
+        :param length: The number of rows.
+        :param columns: The column of each field.
+        :param nulls: The null bitmap of each field that can be null.
+        """
+        super(Columns, self).__init__(columns)
+        self.length = length
+        self.nulls = nulls
+
+    def is_null(self, field, index: int) -> bool:
+        """
+        Check whether the value of a field is None or missing in a row.
+        :param field: The field.
+        :param index: The index of the row.
+        :return: True if the value is None or missing.
+        :raise IndexError: if there is no row at the index.
+        """
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+
+        nulls = self.nulls.get(field)
+        return nulls is not None and bool(nulls[index >> 3] & (1 << (index & 7)))
+
+    @classmethod
+    def from_documents(
+        cls, schema: Dict, documents: List[Dict], require_all: bool = False
+    ) -> "Columns":
+        """
+        Build the columns for a list of validated documents.
+        :param schema: The schema the documents were validated against.
+        :param documents: The normalised documents.
+        :param require_all: Whether fields are required unless the schema says
+                            otherwise.
+        :return: Columns.
+        :raise ValueError: if a document has fields that are not in the schema.
+        """
+        return cls.from_values(
+            schema, len(documents), column_values(schema, documents), require_all
+        )
+
+    @classmethod
+    def from_values(
+        cls, schema: Dict, length: int, values: Dict[str, List], require_all: bool
+    ) -> "Columns":
+        """
+        Build the columns from a list of the validated values of each field.
+        :param schema: The schema the values were validated against.
+        :param length: The number of rows.
+        :param values: The values of each field, with None for missing values.
+        :param require_all: Whether fields are required unless the schema says
+                            otherwise.
+        :return: Columns.
+        """
+        columns: Dict = {}
+        nulls: Dict[str, bytearray] = {}
+        for field, definition in schema.items():
+            if not isinstance(definition, Mapping):
+                definition = {}
+
+            if definition.get("nullable", False) or not definition.get(
+                "required", require_all
+            ):
+                nulls[field] = _null_bitmap(values[field])
+            columns[field] = _column(values[field], _typecode(definition))
+
+        return cls(length, columns, nulls)
+
+
+def column_values(schema: Dict, documents: List[Dict]) -> Dict[str, List]:
+    """
+    Collect the values of each field of the schema across a list of documents.
+    :param schema: The schema the documents were validated against.
+    :param documents: The normalised documents.
+    :return: The values of each field, with None for missing values.
+    :raise ValueError: if a document has fields that are not in the schema.
+    """
+    values: Dict[str, List] = {}
+    missing = 0
+    for field in schema:
+        try:
+            values[field] = [document[field] for document in documents]
+        except KeyError:
+            values[field] = [document.get(field) for document in documents]
+            missing += sum(1 for document in documents if field not in document)
+
+    # Every field of a document has values unless it is not in the schema.
+    if sum(map(len, documents)) != len(documents) * len(schema) - missing:
+        unknown = sorted(set(str(k) for d in documents for k in d if k not in schema))
+        raise ValueError(
+            f"Columns can only hold fields in the schema: {', '.join(unknown)}"
+        )
+
+    return values
+
+
+def _typecode(definition: Mapping) -> Optional[str]:
+    """
+    Find the array typecode for the type rule of a field.
+    :param definition: The rules defined for the field.
+    :return: A typecode, or None if the field should be held in a list.
+    """
+    types = definition.get("type")
+    if isinstance(types, (list, tuple)) and len(types) == 1:
+        types = types[0]
+    if isinstance(types, str):
+        return TYPECODES.get(types)
+    return None
+
+
+def _column(values: List, typecode: Optional[str]):
+    """
+    Build the column for the values of a field.
+    :param values: The values of the field, with None for missing values.
+    :param typecode: The array typecode, or None for a list.
+    :return: An array, or the list of values if they do not fit in an array.
+    """
+    if typecode is None:
+        return values
+
+    column = values
+    if None in values:
+        placeholder = _PLACEHOLDERS[typecode]
+        column = [placeholder if value is None else value for value in values]
+    try:
+        return array(typecode, column)
+    except (OverflowError, TypeError):
+        return values
+
+
+def _null_bitmap(values: List) -> bytearray:
+    """
+    Build the null bitmap for the values of a field.
+    :param values: The values of the field, with None for missing values.
+    :return: A bytearray with a bit set for each null or missing value.
+    """
+    bitmap = bytearray((len(values) + 7) >> 3)
+    if None in values:
+        for index, value in enumerate(values):
+            if value is None:
+                bitmap[index >> 3] |= 1 << (index & 7)
+    return bitmap
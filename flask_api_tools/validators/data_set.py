@@ -1,7 +1,25 @@
+import hashlib
+import json
+import time
+
+from .columns import Columns, column_values
+from .fast_validator import FastValidator, compile_schema
+from .lazy_class_attribute import LazyClassAttribute
+from .record import Record
+from .result_cache import ResultCache
+from .validation_result import ValidationResult
 from .validator import Validator
+from .validator_pool import ValidatorPool
 from cerberus import DocumentError
+from collections.abc import Mapping
 from copy import copy
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# The ways validate_objects and validate_many can return validated data.
+LAYOUTS = ("rows", "records", "columnar")
+
+# The types JSON reads back as the same type.
+_JSON_SCALARS = (str, int, float, bool, type(None))
 
 
 class DataSet(dict):
@@ -14,8 +32,29 @@ class DataSet(dict):
     purge_unknown: Optional[bool] = None
     require_all: Optional[bool] = None
 
-    _validator: Validator = Validator()
-    _validator_config: Dict = copy(_validator._config)
+    # Set to "fast" to validate with a function generated from the schema,
+    # falling back to the validator for rules it cannot handle.
+    compile_mode: Optional[str] = None
+
+    # The number of idle compiled validators kept for reuse by each dataset.
+    validator_pool_size: int = 8
+
+    # Set to a ResultCache to reuse the validated output of identical input in
+    # validate_object and validate_objects.
+    result_cache: Optional[ResultCache] = None
+
+    # The validator is only built when it is first used, to keep imports fast.
+    _validator: Validator = LazyClassAttribute(lambda owner: Validator())
+    _validator_config: Dict = LazyClassAttribute(
+        lambda owner: copy(owner._validator._config)
+    )
+
+    # Pools of validators with the schema already compiled, shared by every
+    # dataset and keyed by the dataset class and its config overrides.
+    _validator_pools: Dict[Tuple, ValidatorPool] = {}
+    _fast_validators: Dict[Tuple, Optional[FastValidator]] = {}
+    _record_types: Dict[Tuple, type] = {}
+    _schema_fingerprints: Dict[Tuple, str] = {}
 
     def __init__(self, *args, **kwargs):
         """
@@ -30,39 +69,127 @@ class DataSet(dict):
         :param data: A dictionary.
         :return: Validated data
         """
-        validator = cls._configure_validator()
-
-        if not validator.validate(obj):
-            raise DocumentError(validator.errors)
-
-        cls._reset_validator()
-
-        return cls(validator.document)
+        return cls._from_document(cls._cached(obj, cls._validate_document))
 
     @classmethod
-    def validate_objects(cls, objs: List) -> List:
+    def validate_objects(
+        cls,
+        objs: Iterable,
+        workers: int = 1,
+        executor: str = "process",
+        chunk_size: int = 1000,
+        layout: str = "rows",
+    ):
         """
         Validates a list of dictionaries against the defined schema
-        :param data: A list of dictionaries.
+        :param data: A list of dictionaries, or any other iterable of them.
+        :param workers: The number of workers to split the list across. The list
+                        is validated in the calling thread if this is 1.
+        :param executor: Either "process" or "thread", the kind of pool the
+                         workers are run in.
+        :param chunk_size: The number of dictionaries sent to a worker at a time.
+                           The result cache is not used when the list is split
+                           across workers.
+        :param layout: "rows" for a list of datasets, "records" for a list of
+                       records, or "columnar" for Columns with a column of values
+                       for each field.
         :return: Validated data
+        :raise ValueError: if the layout is not recognised, or workers are used
+                           with a layout other than "rows".
         """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout: {layout}")
+        if workers > 1 and layout != "rows":
+            raise ValueError("Workers can only be used with the rows layout")
+
+        objs = list(objs)
+        if layout == "columnar":
+            return cls._validate_columns(objs)
+
         collection: List = []
 
         if not objs:
             return collection
 
-        validator = cls._configure_validator()
-
-        for o in objs:
-            if validator.validate(o):
-                collection.append(cls(validator.document))
-            else:
-                raise DocumentError(validator.errors)
+        if workers > 1:
+            return cls._validate_objects_in_parallel(
+                objs, workers, executor, chunk_size
+            )
 
-        cls._reset_validator()
+        documents = cls._cached(objs, cls._validate_documents)
+        if layout == "records":
+            collection.extend(cls._to_records(documents))
+        else:
+            collection.extend(cls._from_documents(documents))
 
         return collection
 
+    @classmethod
+    def validate_objects_partial(cls, objs: Iterable) -> ValidationResult:
+        """
+        Validates a list of dictionaries against the defined schema without
+        stopping at the first invalid dictionary, so that a single pass both
+        accepts the valid dictionaries and reports the invalid ones.
+        :param objs: A list of dictionaries.
+        :return: A ValidationResult with the validated data and the errors of the
+                 invalid dictionaries by index.
+        """
+        errors: Dict[int, Dict] = {}
+        objs = list(objs)
+        valid = cls._from_documents(cls._validate_documents(objs, errors))
+        return ValidationResult(valid, errors)
+
+    @classmethod
+    def as_records(cls, objs: List) -> List[Record]:
+        """
+        Validates a list of dictionaries against the defined schema and returns
+        compact, read-only records instead of datasets. Use this to keep a large
+        number of rows in memory.
+        :param objs: A list of dictionaries.
+        :return: A list of records of the dataset's record type.
+        :raise ValueError: if a validated dictionary has fields that are not in
+                           the schema.
+        """
+        return cls.validate_objects(objs, layout="records")
+
+    @classmethod
+    def record_type(cls) -> type:
+        """
+        Return the record type generated from the fields of the schema, generating
+        it the first time it is used.
+        :return: A subclass of Record.
+        """
+        key = cls._validator_key()
+        try:
+            return cls._record_types[key]
+        except KeyError:
+            return cls._record_types.setdefault(
+                key, Record.for_fields(f"{cls.__name__}Record", tuple(cls.schema))
+            )
+
+    @classmethod
+    def validate_patch(cls, original: Dict, patch: Dict) -> Dict:
+        """
+        Validates the changes of a PATCH request against the defined schema and
+        merges them into an already validated dictionary. Only the changed fields
+        are normalised and validated, along with the fields whose dependencies or
+        excludes rules refer to them. Every other field of the original is
+        trusted as it is.
+        :param original: A dictionary that has already been validated, such as
+                         the stored document.
+        :param patch: The changed fields.
+        :return: Validated data
+        :raise DocumentError: if the changes are invalid.
+        """
+        schema, document = cls._patch_document(original, patch)
+        validator = cls._compile_validator(schema)
+        if not validator.validate(document, update=True):
+            raise DocumentError(validator.errors)
+
+        merged = cls._new_document(original)
+        merged.update(validator.document)
+        return cls._from_document(merged)
+
     @classmethod
     def validate_one(cls, response: Dict) -> Dict:
         """
@@ -77,14 +204,56 @@ class DataSet(dict):
         return cls.validate_object(data[0])
 
     @classmethod
-    def validate_many(cls, response: Dict) -> List:
+    def validate_many(cls, response: Dict, layout: str = "rows"):
         """
         Gets data objects from an API request and makes sure that
         data validates against the defined schema.
         :param response: An api client response.
+        :param layout: "rows" for a list of datasets, "records" for a list of
+                       records, or "columnar" for Columns with a column of values
+                       for each field.
         :return: Validated data
         """
-        return cls.validate_objects(response.get("data", []))
+        return cls.validate_objects(response.get("data", []), layout=layout)
+
+    @classmethod
+    def iter_validate_objects(
+        cls, objs: Iterable, errors: Optional[Dict[int, Dict]] = None
+    ) -> Iterator:
+        """
+        Validates an iterable of dictionaries against the defined schema, one at
+        a time, so that only the current dictionary is held in memory.
+        :param objs: Any iterable of dictionaries, including a generator.
+        :param errors: If a dictionary is passed, invalid objects are skipped and
+                       their errors are stored in it by index. Otherwise the first
+                       invalid object raises a DocumentError.
+        :return: A generator of validated data
+        """
+        for index, o in enumerate(objs):
+            try:
+                document = cls._validate_document(o)
+            except DocumentError as e:
+                if errors is None:
+                    raise
+                errors[index] = e.args[0]
+            else:
+                yield cls._from_document(document)
+
+    @classmethod
+    def iter_validate_many(
+        cls, response: Dict, errors: Optional[Dict[int, Dict]] = None
+    ) -> Iterator:
+        """
+        Gets data objects from an API request and makes sure that data validates
+        against the defined schema, one object at a time. The data can be any
+        iterable, such as a lazy parser over a JSON array.
+        :param response: An api client response.
+        :param errors: If a dictionary is passed, invalid objects are skipped and
+                       their errors are stored in it by index. Otherwise the first
+                       invalid object raises a DocumentError.
+        :return: A generator of validated data
+        """
+        return cls.iter_validate_objects(response.get("data", []), errors)
 
     @classmethod
     def set_validator(cls, validator: Validator) -> None:
@@ -95,38 +264,530 @@ class DataSet(dict):
         """
         cls._validator = validator
         cls._validator_config = copy(cls._validator._config)
+        cls.clear_validator_cache()
+
+    @classmethod
+    def clear_validator_cache(cls) -> None:
+        """
+        Discard the compiled validators of this dataset and every dataset that
+        extends it. Call this after changing the schema at runtime.
+        """
+        for cache in (
+            cls._validator_pools,
+            cls._fast_validators,
+            cls._record_types,
+            cls._schema_fingerprints,
+        ):
+            for key in list(cache):
+                if issubclass(key[0], cls):
+                    cache.pop(key, None)
+
+    @classmethod
+    def _new_document(cls, obj: Dict) -> Dict:
+        """
+        Copy a dictionary into the document the validators normalise in place.
+        Where the dataset behaves exactly like a dict the copy is already an
+        instance of the dataset, so it can be returned without being copied again.
+        :param obj: A dictionary.
+        :return: A copy of the dictionary.
+        """
+        behaves_as_dict = (
+            cls.__init__ is DataSet.__init__ and cls.__setitem__ is dict.__setitem__
+        )
+        if not behaves_as_dict:
+            return dict(obj)
+
+        document = cls.__new__(cls)
+        dict.update(document, obj)
+        return document
+
+    @classmethod
+    def precompile_all(cls, validators: int = 1) -> Dict[str, Dict[str, float]]:
+        """
+        Compile the schema of this dataset and every dataset that extends it, so
+        that the first request served does not pay for it. Call this from an app
+        factory or a gunicorn post_fork hook.
+        :param validators: The number of compiled validators to add to the pool
+                           of each dataset, up to its size.
+        :return: The seconds each step took, by dataset.
+        """
+        timings = {}
+        for data_set in [cls] + cls._subclasses():
+            if data_set.schema:
+                name = f"{data_set.__module__}.{data_set.__qualname__}"
+                timings[name] = data_set._warm_up(validators)
+        return timings
+
+    @classmethod
+    def _subclasses(cls) -> List[type]:
+        """
+        Find every dataset that extends this one, however indirectly.
+        :return: The dataset classes.
+        """
+        subclasses: List[type] = []
+        for subclass in cls.__subclasses__():
+            for data_set in [subclass] + subclass._subclasses():
+                if data_set not in subclasses:
+                    subclasses.append(data_set)
+        return subclasses
+
+    @classmethod
+    def _warm_up(cls, validators: int) -> Dict[str, float]:
+        """
+        Compile the validators of this dataset.
+        :param validators: The number of compiled validators to add to the pool,
+                           up to its size.
+        :return: The seconds each step took.
+        """
+        timings = {}
+
+        start = time.perf_counter()
+        pool = cls._validator_pool()
+        for _ in range(min(validators, pool.size - len(pool))):
+            pool.release(pool.factory())
+        timings["validator"] = time.perf_counter() - start
+
+        if cls.compile_mode == "fast":
+            start = time.perf_counter()
+            cls._fast_validator()
+            timings["fast_validator"] = time.perf_counter() - start
+
+        return timings
+
+    @classmethod
+    def _from_document(cls, document: Dict) -> Dict:
+        """
+        Build the dataset for a validated document, adopting the document itself
+        when it was already built as an instance of the dataset.
+        :param document: The normalised document.
+        :return: Validated data
+        """
+        if type(document) is cls:
+            return document
+        return cls(document)
+
+    @classmethod
+    def _from_documents(cls, documents: List[Dict]) -> List:
+        """
+        Build the datasets for a list of validated documents.
+        :param documents: The normalised documents.
+        :return: Validated data
+        """
+        return [cls._from_document(document) for document in documents]
+
+    @classmethod
+    def _to_records(cls, documents: List[Dict]) -> List[Record]:
+        """
+        Build the records for a list of validated documents.
+        :param documents: The normalised documents.
+        :return: A list of records.
+        """
+        from_document = cls.record_type().from_document
+        return [from_document(document) for document in documents]
 
     @classmethod
-    def _reset_validator(cls) -> None:
+    def _to_columns(cls, values: Dict[str, List], length: int) -> Columns:
         """
-        Reset validator's config to how the instance was first created.
+        Build the columns from the validated values of each field.
+        :param values: The values of each field, with None for missing values.
+        :param length: The number of rows.
+        :return: Columns.
         """
-        cls._validator._config = copy(cls._validator_config)
+        require_all = cls.require_all
+        if require_all is None:
+            require_all = cls._validator.require_all
+        return Columns.from_values(cls.schema, length, values, require_all)
 
     @classmethod
-    def _configure_validator(cls) -> Validator:
+    def _validate_columns(cls, objs: List) -> Columns:
         """
-        Configure and return the validator.
+        Normalise and validate a list of dictionaries into columns. In fast mode
+        the values of each field are collected straight into a column, without
+        building a document for each dictionary, unless a dictionary is invalid.
+        :param objs: A list of dictionaries.
+        :return: Columns.
+        :raise DocumentError: if any dictionary is invalid.
+        :raise ValueError: if a validated dictionary has fields that are not in the
+                           schema.
+        """
+        values = None
+        if cls.compile_mode == "fast" and cls.result_cache is None:
+            fast_validator = cls._fast_validator()
+            if fast_validator is not None:
+                values = fast_validator.validate_columns(objs)
+
+        if values is None:
+            documents = cls._cached(objs, cls._validate_documents)
+            values = column_values(cls.schema, documents)
+        return cls._to_columns(values, len(objs))
+
+    @classmethod
+    def _validate_document(cls, obj: Dict) -> Dict:
+        """
+        Normalise and validate a dictionary against the defined schema.
+        :param obj: A dictionary.
+        :return: The normalised document.
+        :raise DocumentError: if the dictionary is invalid.
+        """
+        if cls.compile_mode == "fast":
+            fast_validator = cls._fast_validator()
+            if fast_validator is not None:
+                document = fast_validator.validate(obj, cls._new_document)
+                if document is not None:
+                    return document
+
+        return cls._validate_with_validator(obj)
+
+    @classmethod
+    def _validate_documents(
+        cls, objs: List, errors: Optional[Dict[int, Dict]] = None
+    ) -> List[Dict]:
+        """
+        Normalise and validate a list of dictionaries against the defined schema.
+        In fast mode each field is coerced and checked across the whole list at
+        once, and only the dictionaries that fail are validated one at a time.
+        :param objs: A list of dictionaries.
+        :param errors: If a dictionary is passed, invalid dictionaries are left out
+                       and their errors are stored in it by index.
+        :return: The normalised documents.
+        :raise DocumentError: if any dictionary is invalid and no errors dictionary
+                              is passed.
+        """
+        documents: List[Optional[Dict]] = [None] * len(objs)
+        if cls.compile_mode == "fast":
+            fast_validator = cls._fast_validator()
+            if fast_validator is not None:
+                documents = fast_validator.validate_many(objs, cls._new_document)
+
+        validated: List[Dict] = []
+        for index, document in enumerate(documents):
+            if document is None:
+                try:
+                    document = cls._validate_with_validator(objs[index])
+                except DocumentError as e:
+                    if errors is None:
+                        raise
+                    errors[index] = e.args[0]
+                    continue
+            validated.append(document)
+
+        return validated
+
+    @classmethod
+    def _cached(cls, obj, validate: Callable):
+        """
+        Validate through the result cache, if the dataset has one. Only valid
+        results are cached, and each hit is a new copy of the cached result.
+        :param obj: A dictionary or a list of dictionaries.
+        :param validate: Normalises and validates the object without the cache.
+        :return: The normalised document or documents.
+        :raise DocumentError: if the object is invalid.
+        """
+        cache = cls.result_cache
+        if cache is None:
+            return validate(obj)
+
+        key = cls._result_key(obj)
+        if key is None:
+            return validate(obj)
+
+        result = cache.get(key)
+        if result is None:
+            result = validate(obj)
+            cache.set(key, result)
+        return result
+
+    @classmethod
+    def _result_key(cls, obj) -> Optional[str]:
+        """
+        Build the key the result of validating an object is cached under, from
+        the dataset, its schema and config, and a hash of the object.
+        :param obj: A dictionary or a list of dictionaries.
+        :return: The key, or None if the object cannot be hashed as JSON.
+        """
+        # JSON would give different objects the same key, such as {1: "x"} and
+        # {"1": "x"}, or a tuple and a list.
+        if not _is_plain_json(obj):
+            return None
+        try:
+            payload = json.dumps(obj, sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+
+        digest = hashlib.sha256(payload.encode()).hexdigest()
+        return f"{cls._schema_fingerprint()}:{digest}"
+
+    @classmethod
+    def _schema_fingerprint(cls) -> str:
+        """
+        Return a hash of the dataset, its schema and its config, so that results
+        are never shared between datasets or kept across schema changes.
+        :return: A hex digest.
+        """
+        key = cls._validator_key()
+        try:
+            return cls._schema_fingerprints[key]
+        except KeyError:
+            source = repr(
+                (
+                    f"{cls.__module__}.{cls.__qualname__}",
+                    cls.schema,
+                    key[1:],
+                    sorted(cls._validator_config.items()),
+                    cls.compile_mode,
+                )
+            )
+            fingerprint = hashlib.sha256(source.encode()).hexdigest()[:16]
+            return cls._schema_fingerprints.setdefault(key, fingerprint)
+
+    @classmethod
+    def _patch_document(cls, original: Dict, patch: Dict) -> Tuple[Dict, Dict]:
+        """
+        Build the schema and document a patch is validated with. The changed
+        fields keep their rules. Unchanged fields whose dependencies or excludes
+        refer to a changed field only keep those rules, so that their trusted
+        values are not normalised again. The fields those rules refer to are
+        included without any rules, so that they can be looked up.
+        :param original: The validated dictionary.
+        :param patch: The changed fields.
+        :return: The schema and the document.
+        """
+        changed = set(patch)
+        dependents = set(
+            field
+            for field, definition in cls.schema.items()
+            if field not in changed
+            and field in original
+            and _referenced_fields(definition) & changed
+        )
+
+        schema: Dict = {}
+        for field in changed | dependents:
+            for referenced in _referenced_fields(cls.schema.get(field)):
+                schema[referenced] = {}
+        for field in dependents:
+            schema[field] = {
+                rule: value
+                for rule, value in cls.schema[field].items()
+                if rule in ("dependencies", "excludes")
+            }
+        for field in changed:
+            if field in cls.schema:
+                schema[field] = cls.schema[field]
+
+        document = {field: original[field] for field in schema if field in original}
+        document.update(patch)
+        return schema, document
+
+    @classmethod
+    def _validate_objects_in_parallel(
+        cls, objs: List, workers: int, executor: str, chunk_size: int
+    ) -> List:
+        """
+        Validates a list of dictionaries in chunks across a pool of workers, each
+        of which uses its own validators. Results are collected in order, so the
+        error raised is always the one for the first invalid dictionary.
+        :param objs: A list of dictionaries.
+        :param workers: The number of workers.
+        :param executor: Either "process" or "thread".
+        :param chunk_size: The number of dictionaries sent to a worker at a time.
+        :return: Validated data
+        :raise ValueError: if the executor is not recognised.
+        """
+        # Imported here as concurrent.futures is slow to import and rarely used.
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        executors = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+        if executor not in executors:
+            raise ValueError(f"Unknown executor: {executor}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        collection: List = []
+        with executors[executor](max_workers=workers) as pool:
+            futures = [
+                pool.submit(_validate_chunk, cls, objs[i : i + chunk_size])
+                for i in range(0, len(objs), chunk_size)
+            ]
+            try:
+                for future in futures:
+                    collection.extend(future.result())
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return collection
+
+    @classmethod
+    def _validate_with_validator(cls, obj: Dict) -> Dict:
+        """
+        Normalise and validate a dictionary with a validator from the pool. Invalid
+        documents always end up here so that the errors are reported exactly as
+        Cerberus reports them.
+        :param obj: A dictionary.
+        :return: The normalised document.
+        :raise DocumentError: if the dictionary is invalid.
+        """
+        if isinstance(obj, dict):
+            obj = _DocumentCopy(obj, cls._new_document)
+
+        with cls._validator_pool().validator() as validator:
+            if not validator.validate(obj):
+                raise DocumentError(validator.errors)
+
+            return validator.document
+
+    @classmethod
+    def _validator_key(cls) -> Tuple:
+        """
+        Build the key the validator pool for this dataset is cached under.
+        :returns: A tuple of the dataset class and its config overrides.
+        """
+        return (
+            cls,
+            cls.allow_unknown,
+            cls.ignore_none_values,
+            cls.purge_readonly,
+            cls.purge_unknown,
+            cls.require_all,
+        )
+
+    @classmethod
+    def _validator_pool(cls) -> ValidatorPool:
+        """
+        Return the pool of compiled validators for this dataset. Validators are
+        checked out of the pool so that threads never share one.
+        :returns: A ValidatorPool.
+        """
+        key = cls._validator_key()
+        pool = cls._validator_pools.get(key)
+        if pool is None:
+            pool = cls._validator_pools.setdefault(
+                key, ValidatorPool(cls._compile_validator, cls.validator_pool_size)
+            )
+        return pool
+
+    @classmethod
+    def _fast_validator(cls) -> Optional[FastValidator]:
+        """
+        Return the function generated from the schema of this dataset, generating
+        it the first time it is used.
+        :returns: A FastValidator, or None if the schema cannot be compiled.
+        """
+        key = cls._validator_key()
+        try:
+            return cls._fast_validators[key]
+        except KeyError:
+            return cls._fast_validators.setdefault(
+                key, compile_schema(cls._compile_validator())
+            )
+
+    @classmethod
+    def _compile_validator(cls, schema: Optional[Dict] = None) -> Validator:
+        """
+        Create a copy of the dataset's validator with the schema compiled and the
+        config overrides applied. The dataset's own validator is left untouched.
+        :param schema: The schema to compile, if not the dataset's schema.
         :returns: A Validator.
         """
-        cls._reset_validator()
-        cls._validator.schema = cls.schema
+        validator = copy(cls._validator)
+        validator._config = copy(cls._validator_config)
+        validator.error_handler = copy(cls._validator.error_handler)
+        validator.schema = cls.schema if schema is None else schema
 
         # Only override the above config settings if a boolean is set. This is
         # to prevent the dataset from overriding the above config all the time.
         if cls.allow_unknown != None:
-            cls._validator.allow_unknown = cls.allow_unknown
+            validator.allow_unknown = cls.allow_unknown
 
         if cls.ignore_none_values != None:
-            cls._validator.ignore_none_values = cls.ignore_none_values
+            validator.ignore_none_values = cls.ignore_none_values
 
         if cls.purge_readonly != None:
-            cls._validator.purge_readonly = cls.purge_readonly
+            validator.purge_readonly = cls.purge_readonly
 
         if cls.purge_unknown != None:
-            cls._validator.purge_unknown = cls.purge_unknown
+            validator.purge_unknown = cls.purge_unknown
 
         if cls.require_all != None:
-            cls._validator.require_all = cls.require_all
+            validator.require_all = cls.require_all
+
+        return validator
+
+
+def _referenced_fields(definition) -> Set:
+    """
+    Find the fields the dependencies and excludes rules of a field refer to.
+    :param definition: The rules defined for the field.
+    :return: The names of the top level fields referred to.
+    """
+    if not isinstance(definition, Mapping):
+        return set()
+
+    names: List = []
+    for rule in ("dependencies", "excludes"):
+        value = definition.get(rule)
+        if isinstance(value, (str, int)):
+            names.append(value)
+        elif isinstance(value, (Mapping, list, tuple, set)):
+            names.extend(value)
+
+    return set(
+        name.lstrip("^").split(".")[0] if isinstance(name, str) else name
+        for name in names
+    )
+
+
+def _is_plain_json(value) -> bool:
+    """
+    Check a value is made only of the types JSON reads back unchanged.
+    :param value: The value.
+    :return: True if the value is dicts with string keys, lists, strings, numbers,
+             booleans and None.
+    """
+    if isinstance(value, dict):
+        return all(
+            type(key) is str and _is_plain_json(item) for key, item in value.items()
+        )
+    if type(value) is list:
+        return all(_is_plain_json(item) for item in value)
+    return type(value) in _JSON_SCALARS
+
+
+def _validate_chunk(data_set: type, objs: List) -> List:
+    """
+    Validate a chunk of a list in a worker, without the result cache. This is a
+    module level function so that it can be sent to a process pool.
+    :param data_set: The DataSet class.
+    :param objs: A list of dictionaries.
+    :return: Validated data
+    """
+    return data_set._from_documents(data_set._validate_documents(objs))
+
+
+class _DocumentCopy(Mapping):
+    """
+    Wraps a dictionary passed to a Cerberus validator, so that the copy the
+    validator takes and normalises is built by the dataset.
+    """
+
+    def __init__(self, obj: Dict, new_document: Callable[[Dict], Dict]):
+        """
+        :param obj: A dictionary.
+        :param new_document: Builds the copy of the dictionary.
+        """
+        self.obj = obj
+        self.new_document = new_document
+
+    def __copy__(self) -> Dict:
+        return self.new_document(self.obj)
+
+    def __getitem__(self, key):
+        return self.obj[key]
+
+    def __iter__(self):
+        return iter(self.obj)
 
-        return cls._validator
+    def __len__(self) -> int:
+        return len(self.obj)
@@ -0,0 +1,470 @@
+from .validator import Validator
+from collections.abc import Mapping
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# The rules a schema may use to be compiled. Any other rule makes the schema fall
+# back to the Cerberus validator.
+SUPPORTED_RULES = frozenset(
+    ("type", "required", "nullable", "coerce", "check_with", "meta")
+)
+
+
+class _Missing:
+    """
+    The type of the marker for a field missing from a document.
+    """
+
+
+# Marks a field that is missing from a document in a column of values.
+_MISSING = _Missing()
+
+
+class FastValidator:
+    """
+    Validation functions generated for a single schema. They only decide whether a
+    document is valid, so the Cerberus validator is still used to report errors.
+    """
+
+    def __init__(
+        self,
+        function: Callable[[Dict], bool],
+        batch_function: Callable[[List[Dict]], Set[int]],
+        source: str,
+        columns_function: Optional[Callable[[List[Dict]], Tuple[Dict, Set[int]]]],
+    ):
+        """
+        :param function: The generated function, which normalises a document in
+                         place and returns whether it is valid.
+        :param batch_function: The generated function, which normalises a list of
+                               documents in place one field at a time and returns
+                               the indexes of the invalid documents.
+        :param source: The source code of the generated functions.
+        :param columns_function: The generated function, which normalises a list
+                                 of documents into a list of values for each field
+                                 without changing the documents, and returns the
+                                 lists and the indexes of the invalid documents.
+                                 None if unknown fields are allowed.
+        """
+        self.function = function
+        self.batch_function = batch_function
+        self.source = source
+        self.columns_function = columns_function
+
+    def validate(
+        self, obj: Dict, new_document: Callable[[Dict], Dict] = dict
+    ) -> Optional[Dict]:
+        """
+        Normalise and validate a dictionary.
+        :param obj: A dictionary.
+        :param new_document: Builds the copy of the dictionary that is normalised.
+        :return: The normalised document, or None if the document is invalid or
+                 needs to be handled by the Cerberus validator.
+        """
+        if not isinstance(obj, dict):
+            return None
+
+        document = new_document(obj)
+        try:
+            if self.function(document):
+                return document
+        except Exception:
+            pass
+        return None
+
+    def validate_many(
+        self, objs: List[Dict], new_document: Callable[[Dict], Dict] = dict
+    ) -> List[Optional[Dict]]:
+        """
+        Normalise and validate a list of dictionaries, coercing and checking each
+        field across every dictionary in one pass.
+        :param objs: A list of dictionaries, or any other iterable of them.
+        :param new_document: Builds the copy of each dictionary that is normalised.
+        :return: The normalised documents, with None in place of every document
+                 that is invalid or needs to be handled by the Cerberus validator.
+        """
+        if not isinstance(objs, list):
+            objs = list(objs)
+        if not all(isinstance(o, dict) for o in objs):
+            return [None] * len(objs)
+
+        documents: List[Optional[Dict]] = [new_document(o) for o in objs]
+        try:
+            invalid = self.batch_function(documents)
+        except Exception:
+            return [None] * len(objs)
+
+        for index in invalid:
+            documents[index] = None
+        return documents
+
+    def validate_columns(self, objs: List[Dict]) -> Optional[Dict[str, List]]:
+        """
+        Normalise and validate a list of dictionaries into a list of values for
+        each field, without building a document for each dictionary.
+        :param objs: A list of dictionaries.
+        :return: The values of each field, with None for missing values, or None if
+                 any dictionary is invalid or needs to be handled by the Cerberus
+                 validator.
+        """
+        if self.columns_function is None:
+            return None
+        if not all(isinstance(o, dict) for o in objs):
+            return None
+
+        try:
+            columns, invalid = self.columns_function(objs)
+        except Exception:
+            return None
+        if invalid:
+            return None
+        return columns
+
+
+def compile_schema(validator: Validator) -> Optional[FastValidator]:
+    """
+    Generate validation functions for the schema and config of a validator.
+    :param validator: A validator with the schema compiled and config applied.
+    :return: A FastValidator, or None if the schema uses rules or config that can
+             only be handled by the Cerberus validator.
+    """
+    schema = validator.schema
+    if schema is None or validator.ignore_none_values:
+        return None
+    if not isinstance(validator.allow_unknown, bool):
+        return None
+
+    namespace: Dict = {
+        "_schema_keys": frozenset(schema),
+        "_missing": _MISSING,
+        "_coerce_column": _coerce_column,
+        "_invalid_values": _invalid_values,
+    }
+    row_lines: List[str] = ["def validate(document):"]
+    column_lines: List[str] = [
+        "def validate_many(documents):",
+        "    invalid = set()",
+    ]
+    columns_lines: List[str] = [
+        "def validate_columns(documents):",
+        "    invalid = set()",
+        "    columns = {}",
+    ]
+
+    if validator.purge_unknown and not validator.allow_unknown:
+        row_lines += [
+            "    for key in [k for k in document if k not in _schema_keys]:",
+            "        del document[key]",
+        ]
+        column_lines += [
+            "    for document in documents:",
+            "        for key in [k for k in document if k not in _schema_keys]:",
+            "            del document[key]",
+        ]
+    elif not validator.allow_unknown:
+        row_lines += [
+            "    if not _schema_keys.issuperset(document):",
+            "        return False",
+        ]
+        unknown_lines = [
+            "    invalid.update(",
+            "        index",
+            "        for index, document in enumerate(documents)",
+            "        if not _schema_keys.issuperset(document)",
+            "    )",
+        ]
+        column_lines += unknown_lines
+        columns_lines += unknown_lines
+
+    for index, (field, definition) in enumerate(schema.items()):
+        rules = _compile_rules(validator, index, field, definition, namespace)
+        if rules is None:
+            return None
+        row_lines += _row_lines(rules)
+        column_lines += _column_lines(rules)
+        columns_lines += _column_lines(rules, columns=True)
+
+    row_lines.append("    return True")
+    column_lines.append("    return invalid")
+    columns_lines.append("    return columns, invalid")
+    source = "\n".join(row_lines + [""] + column_lines + [""] + columns_lines)
+    # The generated source only refers to fields and rules through the namespace,
+    # so nothing from the schema is ever evaluated as code.
+    exec(compile(source, "<fast_validator>", "exec"), namespace)  # nosec
+    return FastValidator(
+        namespace["validate"],
+        namespace["validate_many"],
+        source,
+        # Unknown fields are kept in the documents, so there is no column for them.
+        None if validator.allow_unknown else namespace["validate_columns"],
+    )
+
+
+def _compile_rules(
+    validator: Validator, index: int, field, definition, namespace: Dict
+) -> Optional[Dict]:
+    """
+    Add the values the rules of a single field refer to into the namespace of the
+    generated functions.
+    :param validator: The validator the schema was compiled for.
+    :param index: The position of the field in the schema.
+    :param field: The field name.
+    :param definition: The rules defined for the field.
+    :param namespace: The namespace of the generated functions.
+    :return: The names and flags the generated code for the field is built from,
+             or None if the field cannot be compiled.
+    """
+    if not isinstance(definition, Mapping) or not SUPPORTED_RULES.issuperset(
+        definition
+    ):
+        return None
+
+    nullable = definition.get("nullable", False)
+    required = definition.get("required", validator.require_all)
+    if not isinstance(nullable, bool) or not isinstance(required, bool):
+        return None
+
+    rules = {
+        "field": f"_field_{index}",
+        "coerce": None,
+        "nullable": nullable,
+        "required": required,
+        "check": None,
+        "types": None,
+        "uuid": None,
+    }
+    namespace[rules["field"]] = field
+
+    if "coerce" in definition:
+        coercer = _coercer(validator, definition["coerce"])
+        if coercer is None:
+            return None
+        rules["coerce"] = f"_coerce_{index}"
+        namespace[rules["coerce"]] = coercer
+
+    checks = []
+    types = definition.get("type")
+    if types:
+        if isinstance(types, str):
+            types = (types,)
+        type_checks = []
+        type_definitions = []
+        for offset, type_name in enumerate(types):
+            type_definition = validator.types_mapping.get(type_name)
+            if type_definition is None:
+                return None
+            included = f"_included_{index}_{offset}"
+            excluded = f"_excluded_{index}_{offset}"
+            namespace[included] = type_definition.included_types
+            namespace[excluded] = type_definition.excluded_types
+            type_definitions.append(
+                (type_definition.included_types, type_definition.excluded_types)
+            )
+            type_checks.append(
+                f"(isinstance(value, {included}) "
+                f"and not isinstance(value, {excluded}))"
+            )
+        checks.append("(" + " or ".join(type_checks) + ")")
+        rules["types"] = f"_types_{index}"
+        namespace[rules["types"]] = tuple(type_definitions)
+
+    if "check_with" in definition:
+        if definition["check_with"] != "uuid":
+            return None
+        namespace["_is_uuid"] = validator._is_uuid
+        checks.append("_is_uuid(value)")
+        rules["uuid"] = "_is_uuid"
+
+    if checks:
+        rules["check"] = " and ".join(checks)
+    return rules
+
+
+def _row_lines(rules: Dict) -> List[str]:
+    """
+    Generate the lines of the single document function that handle a field.
+    :param rules: The compiled rules of the field.
+    :return: The generated lines.
+    """
+    field = rules["field"]
+    lines: List[str] = []
+    if rules["required"]:
+        lines += [
+            f"    if {field} not in document:",
+            "        return False",
+        ]
+    lines += [
+        f"    if {field} in document:",
+        f"        value = document[{field}]",
+    ]
+
+    if rules["coerce"]:
+        lines += [
+            "        try:",
+            f"            value = document[{field}] = {rules['coerce']}(value)",
+            "        except Exception:",
+        ]
+        if rules["nullable"]:
+            lines += [
+                "            if value is not None:",
+                "                return False",
+            ]
+        else:
+            lines.append("            return False")
+
+    lines.append("        if value is None:")
+    lines.append(
+        "            pass" if rules["nullable"] else "            return False"
+    )
+    if rules["check"]:
+        lines += [
+            f"        elif not ({rules['check']}):",
+            "            return False",
+        ]
+    return lines
+
+
+def _column_lines(rules: Dict, columns: bool = False) -> List[str]:
+    """
+    Generate the lines of the list of documents functions that handle a field.
+    :param rules: The compiled rules of the field.
+    :param columns: Whether to generate the lines of the function that keeps the
+                    values of the field rather than setting them in the documents.
+    :return: The generated lines.
+    """
+    field = rules["field"]
+    lines = [
+        "    try:",
+        f"        values = [document[{field}] for document in documents]",
+        "        missing = False",
+        "    except KeyError:",
+        f"        values = [document.get({field}, _missing) for document in documents]",
+        "        missing = True",
+    ]
+
+    if rules["required"]:
+        lines += [
+            "    if missing:",
+            "        invalid.update(i for i, value in enumerate(values) "
+            "if value is _missing)",
+        ]
+
+    if rules["coerce"]:
+        lines.append(
+            f"    values = _coerce_column({rules['coerce']}, values, invalid, "
+            f"{rules['nullable']}, missing)",
+        )
+    if rules["coerce"] and not columns:
+        lines += [
+            "    if missing:",
+            "        for document, value in zip(documents, values):",
+            "            if value is not _missing:",
+            f"                document[{field}] = value",
+            "    else:",
+            "        for document, value in zip(documents, values):",
+            f"            document[{field}] = value",
+        ]
+
+    lines.append(
+        f"    invalid.update(_invalid_values(values, {rules['types']}, "
+        f"{rules['nullable']}, {rules['uuid']}))"
+    )
+    if columns:
+        lines += [
+            "    if missing:",
+            "        values = [None if value is _missing else value for value in values]",
+            f"    columns[{field}] = values",
+        ]
+    return lines
+
+
+def _coerce_column(
+    coercer: Callable, values: List, invalid: Set[int], nullable: bool, missing: bool
+) -> List:
+    """
+    Coerce a column of values, recording the values that cannot be coerced as
+    invalid.
+    :param coercer: The coercer of the field.
+    :param values: The values of the field across every document.
+    :param invalid: The indexes of the invalid documents.
+    :param nullable: Whether the field is nullable.
+    :param missing: Whether the field is missing from any document.
+    :return: The coerced values.
+    """
+    if not missing:
+        try:
+            return list(map(coercer, values))
+        except Exception:
+            pass
+
+    coerced = []
+    for index, value in enumerate(values):
+        if value is _MISSING:
+            coerced.append(value)
+            continue
+        try:
+            coerced.append(coercer(value))
+        except Exception:
+            if not (nullable and value is None):
+                invalid.add(index)
+            coerced.append(value)
+    return coerced
+
+
+def _invalid_values(
+    values: List, types: Optional[Tuple], nullable: bool, is_uuid: Optional[Callable]
+) -> List[int]:
+    """
+    Check a column of values. Types are checked once for each distinct type in the
+    column, and UUIDs once for each distinct value.
+    :param values: The values of the field across every document.
+    :param types: The included and excluded types of each allowed type, if the
+                  field has a type rule.
+    :param nullable: Whether the field is nullable.
+    :param is_uuid: The UUID check, if the field has one.
+    :return: The indexes of the invalid values.
+    """
+    bad_types = set()
+    for value_type in set(map(type, values)):
+        if value_type is _Missing:
+            continue
+        if value_type is type(None):
+            if not nullable:
+                bad_types.add(value_type)
+        elif types and not any(
+            issubclass(value_type, included) and not issubclass(value_type, excluded)
+            for included, excluded in types
+        ):
+            bad_types.add(value_type)
+
+    bad_values = set()
+    if is_uuid is not None:
+        bad_values = set(
+            value
+            for value in set(values)
+            if value is not None
+            and value is not _MISSING
+            and type(value) not in bad_types
+            and not is_uuid(value)
+        )
+
+    if not bad_types and not bad_values:
+        return []
+    return [
+        index
+        for index, value in enumerate(values)
+        if type(value) in bad_types or (bad_values and value in bad_values)
+    ]
+
+
+def _coercer(validator: Validator, coerce) -> Optional[Callable]:
+    """
+    Find the function a coerce rule refers to.
+    :param validator: The validator the schema was compiled for.
+    :param coerce: The value of the coerce rule.
+    :return: A callable, or None if the rule cannot be compiled.
+    """
+    if isinstance(coerce, str):
+        return getattr(validator, f"_normalize_coerce_{coerce}", None)
+    if callable(coerce):
+        return coerce
+    return None
@@ -0,0 +1,34 @@
+from threading import RLock
+from typing import Any, Callable
+
+# Reentrant, as a factory may read another lazy attribute.
+_lock = RLock()
+
+
+class LazyClassAttribute:
+    """
+    A class attribute whose value is built the first time it is read, rather than
+    when the class is defined. The value then replaces the attribute on the class
+    that defined it, so it is shared by every subclass that does not set its own.
+    """
+
+    def __init__(self, factory: Callable[[type], Any]):
+        """
+        :param factory: Builds the value, given the class that defined the
+                        attribute.
+        """
+        self.factory = factory
+        self.owner = None
+        self.name = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.owner = owner
+        self.name = name
+
+    def __get__(self, instance, owner: type) -> Any:
+        with _lock:
+            value = self.owner.__dict__.get(self.name)
+            if value is self:
+                value = self.factory(self.owner)
+                setattr(self.owner, self.name, value)
+        return value
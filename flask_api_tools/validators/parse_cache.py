@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict
+
+
+class ParseCache:
+    """
+    A bounded, thread-safe LRU cache of parse results, keyed by the kind of parse
+    and the value parsed. Only immutable results should be cached, as they are
+    shared by every caller.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        :param maxsize: The maximum number of results kept.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """
+        :return: The number of results cached.
+        """
+        return len(self._entries)
+
+    def get(self, kind: str, value: Any, parse: Callable[[Any], Any]) -> Any:
+        """
+        Return the cached result of parsing a value, parsing it on a miss.
+        Exceptions raised by the parser are not cached.
+        :param kind: The kind of parse, so that one cache can serve many parsers.
+        :param value: The value to parse.
+        :param parse: The parser.
+        :return: The parsed value.
+        """
+        # The type is part of the key, as equal values of different types such as
+        # 1 and True may not parse to the same result.
+        key = (kind, type(value), value)
+        try:
+            with self._lock:
+                result = self._entries[key]
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable values are never cached.
+            return parse(value)
+
+        with self._lock:
+            self.misses += 1
+        result = parse(value)
+        with self._lock:
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        """
+        Remove every cached result and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        :return: The hits, misses, current size and maximum size of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
@@ -0,0 +1,91 @@
+from collections.abc import Mapping
+from typing import Dict, Tuple
+
+
+class _Missing:
+    """
+    The type of the marker for a field missing from a record.
+    """
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+# Stands in for the value of a field missing from a record.
+_MISSING = _Missing()
+
+
+class Record(Mapping):
+    """
+    A compact, read-only row with the fields of a dataset's schema. The values are
+    held in a single tuple in schema order, so a record costs far less memory than
+    a dict while still behaving like a read-only mapping.
+    """
+
+    __slots__ = ("_values",)
+
+    # The fields of the schema, in order, and the position of each field.
+    _fields: Tuple = ()
+    _index: Dict = {}
+
+    def __init__(self, values: Tuple):
+        """
+        :param values: The value of every field in schema order, with _MISSING for
+                       the fields the row does not have.
+        """
+        self._values = values
+
+    @classmethod
+    def from_document(cls, document: Dict) -> "Record":
+        """
+        Build a record from a validated document.
+        :param document: The normalised document.
+        :return: A Record.
+        :raise ValueError: if the document has fields that are not in the schema.
+        """
+        values = tuple(document.get(field, _MISSING) for field in cls._fields)
+        if len(document) != len(values) - values.count(_MISSING):
+            unknown = sorted(str(k) for k in document if k not in cls._index)
+            raise ValueError(
+                f"Records can only hold fields in the schema: {', '.join(unknown)}"
+            )
+        return cls(values)
+
+    def __getitem__(self, key):
+        value = self._values[self._index[key]]
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key) -> bool:
+        index = self._index.get(key)
+        return index is not None and self._values[index] is not _MISSING
+
+    def __iter__(self):
+        for field, value in zip(self._fields, self._values):
+            if value is not _MISSING:
+                yield field
+
+    def __len__(self) -> int:
+        return len(self._values) - self._values.count(_MISSING)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    @classmethod
+    def for_fields(cls, name: str, fields: Tuple) -> type:
+        """
+        Generate a record type for a fixed set of fields.
+        :param name: The name of the record type.
+        :param fields: The fields, in order.
+        :return: A subclass of Record.
+        """
+        return type(
+            name,
+            (cls,),
+            {
+                "__slots__": (),
+                "_fields": tuple(fields),
+                "_index": {field: index for index, field in enumerate(fields)},
+            },
+        )
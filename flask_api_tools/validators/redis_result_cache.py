@@ -0,0 +1,88 @@
+from .result_cache import ResultCache
+from flask import current_app
+from typing import Any, Dict, Optional
+
+
+class RedisResultCache(ResultCache):
+    """
+    A cache of validation results kept in Redis, so that it is shared by every
+    worker. Evicting results is left to the TTL and the Redis maxmemory policy.
+    The hit and miss counters only count this process's lookups.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        ttl: Optional[float] = 300,
+        max_bytes: Optional[int] = None,
+        prefix: str = "flask_api_tools:result_cache:",
+    ):
+        """
+        :param redis: A Redis client. Defaults to ``current_app.redis``.
+        :param ttl: The number of seconds a result is kept for, or None to keep
+                    results until Redis evicts them.
+        :param max_bytes: The maximum size of a single encoded result, or None for
+                          no limit.
+        :param prefix: The prefix of every key the cache sets.
+        """
+        super(RedisResultCache, self).__init__(maxsize=0, ttl=ttl, max_bytes=max_bytes)
+        self.prefix = prefix
+        self._redis = redis
+
+    @property
+    def redis(self):
+        """
+        :return: The Redis client, which is the app's client unless one was given.
+        """
+        return self._redis if self._redis is not None else current_app.redis
+
+    def __len__(self) -> int:
+        """
+        :return: The number of results cached.
+        """
+        return sum(1 for _ in self.redis.scan_iter(match=f"{self.prefix}*"))
+
+    def clear(self) -> None:
+        """
+        Remove every cached result and reset the counters.
+        """
+        keys = list(self.redis.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.redis.delete(*keys)
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, Any]:
+        """
+        :return: The hits, misses and hit rate of this process, and the limits of
+                 the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+                "ttl": self.ttl,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _read(self, key: str) -> Optional[bytes]:
+        """
+        Read an encoded result.
+        :param key: The key of the result.
+        :return: The encoded result, or None if it is not cached.
+        """
+        return self.redis.get(f"{self.prefix}{key}")
+
+    def _write(self, key: str, data: bytes) -> None:
+        """
+        Store an encoded result.
+        :param key: The key of the result.
+        :param data: The encoded result.
+        """
+        if self.max_bytes is not None and len(data) > self.max_bytes:
+            return
+
+        ttl = None if self.ttl is None else max(1, int(self.ttl * 1000))
+        self.redis.set(f"{self.prefix}{key}", data, px=ttl)
@@ -0,0 +1,222 @@
+import json
+import time
+
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from threading import Lock
+from typing import Any, Dict, Optional
+
+# The types JSON holds as they are.
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+# The keys of the one-item dicts that hold the values JSON has no type for. A
+# result's own one-item dict with one of these keys is held under "__dict__".
+_TAGS = ("__date__", "__datetime__", "__tuple__", "__dict__")
+
+
+class ResultCache:
+    """
+    A bounded, thread-safe LRU cache of validation results, with optional expiry
+    and a cap on the memory used. Results are stored as JSON, so every hit returns
+    a new copy that the caller is free to change, and reading a result never runs
+    code. Dates, datetimes that are naive or have a fixed offset, and tuples are
+    tagged so that they are read back as the same type.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        :param maxsize: The maximum number of results kept.
+        :param ttl: The number of seconds a result is kept for, or None to keep
+                    results until they are evicted.
+        :param max_bytes: The maximum size of the encoded results kept, or None
+                          for no limit.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """
+        :return: The number of results cached.
+        """
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        :return: The share of lookups that were hits, from 0 to 1.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: str) -> Any:
+        """
+        Return a copy of a cached result.
+        :param key: The key of the result.
+        :return: The result, or None if it is not cached.
+        """
+        data = self._read(key)
+        result = None
+        if data is not None:
+            try:
+                result = _decode(json.loads(data))
+            except (ValueError, TypeError, AttributeError):
+                data = None
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return result
+
+    def set(self, key: str, result: Any) -> None:
+        """
+        Cache a result. Results holding values that cannot be encoded are not
+        cached.
+        :param key: The key of the result.
+        :param result: The result.
+        """
+        try:
+            data = json.dumps(_encode(result), separators=(",", ":")).encode()
+        except (ValueError, TypeError):
+            return
+        self._write(key, data)
+
+    def clear(self) -> None:
+        """
+        Remove every cached result and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, Any]:
+        """
+        :return: The hits, misses, hit rate, current size and limits of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _read(self, key: str) -> Optional[bytes]:
+        """
+        Read an encoded result, dropping it if it has expired.
+        :param key: The key of the result.
+        :return: The encoded result, or None if it is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires, data = entry
+            if expires is not None and expires <= time.monotonic():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return data
+
+    def _write(self, key: str, data: bytes) -> None:
+        """
+        Store an encoded result, evicting the least recently used results to stay
+        within the limits.
+        :param key: The key of the result.
+        :param data: The encoded result.
+        """
+        if self.max_bytes is not None and len(data) > self.max_bytes:
+            return
+
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires, data)
+            self._bytes += len(data)
+
+            while len(self._entries) > self.maxsize or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        """
+        Remove a result. The lock must be held.
+        :param key: The key of the result.
+        """
+        expires, data = self._entries.pop(key)
+        self._bytes -= len(data)
+
+
+def _encode(value) -> Any:
+    """
+    Convert a result to the values JSON can hold, tagging the values it cannot.
+    :param value: The result.
+    :return: The value to serialise.
+    :raise TypeError: if the result holds a value that cannot be encoded.
+    """
+    kind = type(value)
+    if kind in _JSON_SCALARS:
+        return value
+    if kind is list:
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        encoded = {}
+        for key, item in value.items():
+            if type(key) is not str:
+                raise TypeError(f"Keys of type {type(key).__name__} cannot be encoded")
+            encoded[key] = _encode(item)
+        if len(encoded) == 1 and next(iter(encoded)) in _TAGS:
+            return {"__dict__": encoded}
+        return encoded
+    if kind is tuple:
+        return {"__tuple__": [_encode(item) for item in value]}
+    if kind is datetime and (value.tzinfo is None or type(value.tzinfo) is timezone):
+        return {"__datetime__": value.isoformat()}
+    if kind is date:
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"Values of type {kind.__name__} cannot be encoded")
+
+
+def _decode(value) -> Any:
+    """
+    Rebuild a result from its decoded JSON.
+    :param value: The decoded JSON.
+    :return: The result.
+    """
+    if type(value) is list:
+        return [_decode(item) for item in value]
+    if type(value) is not dict:
+        return value
+
+    if len(value) == 1:
+        tag, item = next(iter(value.items()))
+        if tag == "__dict__":
+            return {key: _decode(nested) for key, nested in item.items()}
+        if tag == "__tuple__":
+            return tuple(_decode(nested) for nested in item)
+        if tag == "__datetime__":
+            return datetime.fromisoformat(item)
+        if tag == "__date__":
+            return date.fromisoformat(item)
+    return {key: _decode(item) for key, item in value.items()}
@@ -1,16 +1,47 @@
 import bleach
+import re
+import threading
+import time
 
 from .data_set import DataSet
+from .lazy_class_attribute import LazyClassAttribute
 from .validator import Validator
 from cerberus import DocumentError
-from copy import copy
-from typing import Dict
+from copy import copy, deepcopy
+from typing import Any, Dict, List, Optional, Set
+
+# bleach leaves strings without markup, entities or control characters unchanged,
+# so those strings are not parsed at all.
+_NEEDS_CLEANING = re.compile(r"[<>&\x00-\x08\x0b-\x1f]")
 
 
 class SanitisedDataSet(DataSet):
 
-    _validator: Validator = Validator()
-    _validator_config: Dict = copy(_validator._config)
+    allowed_tags = bleach.sanitizer.ALLOWED_TAGS
+    allowed_attributes = bleach.sanitizer.ALLOWED_ATTRIBUTES
+    allowed_protocols = bleach.sanitizer.ALLOWED_PROTOCOLS
+    strip: bool = False
+    strip_comments: bool = True
+
+    # How deeply nested dicts and lists may be. Deeper values raise a ValueError
+    # rather than being left unsanitised. Set to None for no limit.
+    sanitise_max_depth: Optional[int] = 32
+
+    # When True, values are stored as given and only sanitised the first time
+    # they are read.
+    lazy: bool = False
+
+    # The keys whose values have not been sanitised yet, in lazy mode.
+    _unsanitised: Set = frozenset()
+
+    _validator: Validator = LazyClassAttribute(lambda owner: Validator())
+    _validator_config: Dict = LazyClassAttribute(
+        lambda owner: copy(owner._validator._config)
+    )
+
+    # bleach cleaners are not thread-safe, so each thread builds its own cleaner
+    # for each dataset.
+    _cleaners = threading.local()
 
     def __init__(self, *args, **kwargs):
         """
@@ -27,7 +58,87 @@ class SanitisedDataSet(DataSet):
         :param key: The key.
         :param value: The value.
         """
-        super(SanitisedDataSet, self).__setitem__(key, self._sanitise_value(value))
+        if self.lazy:
+            super(SanitisedDataSet, self).__setitem__(key, value)
+            self._mark_unsanitised((key,))
+        else:
+            super(SanitisedDataSet, self).__setitem__(key, self._sanitise_value(value))
+
+    def __getitem__(self, key):
+        """
+        Override the standard __getitem__ method to sanitise lazily set data.
+        :param key: The key.
+        """
+        if key in self._unsanitised:
+            self._sanitise_key(key)
+        return super(SanitisedDataSet, self).__getitem__(key)
+
+    def __iter__(self):
+        """
+        Defining __iter__ stops dict() and ** unpacking from copying the stored
+        values directly, so they read each value through __getitem__ instead.
+        """
+        return super(SanitisedDataSet, self).__iter__()
+
+    def __eq__(self, other):
+        self._sanitise_all()
+        return super(SanitisedDataSet, self).__eq__(other)
+
+    def __ne__(self, other):
+        self._sanitise_all()
+        return super(SanitisedDataSet, self).__ne__(other)
+
+    def __repr__(self):
+        self._sanitise_all()
+        return super(SanitisedDataSet, self).__repr__()
+
+    def get(self, key, default=None):
+        """
+        Override the standard get method to sanitise lazily set data.
+        :param key: The key.
+        :param default: A default if the value is not found.
+        """
+        if key in self._unsanitised:
+            self._sanitise_key(key)
+        return super(SanitisedDataSet, self).get(key, default)
+
+    def items(self):
+        """
+        Override the standard items method to sanitise lazily set data.
+        """
+        self._sanitise_all()
+        return super(SanitisedDataSet, self).items()
+
+    def values(self):
+        """
+        Override the standard values method to sanitise lazily set data.
+        """
+        self._sanitise_all()
+        return super(SanitisedDataSet, self).values()
+
+    def copy(self):
+        """
+        Override the standard copy method to sanitise lazily set data.
+        """
+        self._sanitise_all()
+        return super(SanitisedDataSet, self).copy()
+
+    def pop(self, key, *args):
+        """
+        Override the standard pop method to sanitise lazily set data.
+        :param key: The key.
+        :param *args: A default if the value is not found.
+        """
+        if key in self._unsanitised:
+            self._sanitise_key(key)
+        return super(SanitisedDataSet, self).pop(key, *args)
+
+    def popitem(self):
+        """
+        Override the standard popitem method to sanitise lazily set data.
+        """
+        self._sanitise_all()
+        return super(SanitisedDataSet, self).popitem()
 
     def update(self, mapping={}, **kwargs):
         """
@@ -35,11 +146,9 @@ class SanitisedDataSet(DataSet):
         :param mapping: A mapping to be set.
         :param **kwargs: kwargs.
         """
-        for key, value in mapping.items():
-            self.__setitem__(key, value)
-
-        for key, value in kwargs.items():
-            self.__setitem__(key, value)
+        cache: Dict[str, str] = {}
+        self._update(mapping, cache)
+        self._update(kwargs, cache)
 
     def setdefault(self, key, value=None):
         """
@@ -47,6 +156,11 @@ class SanitisedDataSet(DataSet):
         :param key: The key of the value to be retrieved.
         :param value: A default if the value is not found.
         """
+        if self.lazy:
+            if key not in self:
+                self[key] = value
+            return self[key]
+
         return super(SanitisedDataSet, self).setdefault(
             key, self._sanitise_value(value)
         )
@@ -60,11 +174,298 @@ class SanitisedDataSet(DataSet):
         """
         return cls.validate_object(request_data)
 
-    def _sanitise_value(self, value):
+    @classmethod
+    def _warm_up(cls, validators: int) -> Dict[str, float]:
+        """
+        Compile the validators of this dataset and build the calling thread's
+        cleaner, cleaning a string so that the parser is loaded.
+        :param validators: The number of compiled validators to add to the pool,
+                           up to its size.
+        :return: The seconds each step took.
+        """
+        timings = super(SanitisedDataSet, cls)._warm_up(validators)
+
+        start = time.perf_counter()
+        cls._cleaner().clean("<p>warm-up</p>")
+        timings["sanitiser"] = time.perf_counter() - start
+
+        return timings
+
+    @classmethod
+    def _from_document(cls, document: Dict, cache: Optional[Dict[str, str]] = None):
+        """
+        Build the dataset for a validated document, sanitising each value as it is
+        set rather than copying the document first.
+        :param document: The normalised document.
+        :param cache: Cleaned strings by their original value, which can be shared
+                      between documents.
+        :return: Validated data
+        :raise DocumentError: if a value is nested deeper than sanitise_max_depth.
         """
-        Sanitise the passed value to prevent malicious string values.
+        data_set = cls()
+        cache = {} if cache is None else cache
+        if cls.lazy:
+            data_set._update(document, cache)
+            return data_set
+
+        for key, value in document.items():
+            super(SanitisedDataSet, data_set).__setitem__(
+                key, data_set._sanitise_field(key, value, cache)
+            )
+        return data_set
+
+    @classmethod
+    def _from_documents(cls, documents: List[Dict]) -> List:
+        """
+        Build the datasets for a list of validated documents. Strings repeated
+        across the documents are only sanitised once, and every dataset shares
+        the cleaned string.
+        :param documents: The normalised documents.
+        :return: Validated data
+        :raise DocumentError: if a value is nested deeper than sanitise_max_depth.
+        """
+        cache: Dict[str, str] = {}
+        return [cls._from_document(document, cache) for document in documents]
+
+    @classmethod
+    def _to_records(cls, documents: List[Dict]) -> List:
+        """
+        Build the records for a list of validated documents, sanitising the
+        documents in place first.
+        :param documents: The normalised documents.
+        :return: A list of records.
+        :raise DocumentError: if a value is nested deeper than sanitise_max_depth.
+        """
+        cls._sanitise_documents(documents)
+        return super(SanitisedDataSet, cls)._to_records(documents)
+
+    @classmethod
+    def _to_columns(cls, values: Dict[str, List], length: int):
+        """
+        Build the columns from the validated values of each field, sanitising the
+        values in place first. Strings repeated across the values are only
+        sanitised once.
+        :param values: The values of each field, with None for missing values.
+        :param length: The number of rows.
+        :return: Columns.
+        :raise DocumentError: if a value is nested deeper than sanitise_max_depth.
+        """
+        cache: Dict[str, str] = {}
+        sanitiser = cls()
+        for field, column in values.items():
+            for index, value in enumerate(column):
+                column[index] = sanitiser._sanitise_field(field, value, cache)
+        return super(SanitisedDataSet, cls)._to_columns(values, length)
+
+    @classmethod
+    def _sanitise_documents(cls, documents: List[Dict]) -> None:
+        """
+        Sanitise a list of validated documents in place. Strings repeated across
+        the documents are only sanitised once.
+        :param documents: The normalised documents.
+        :raise DocumentError: if a value is nested deeper than sanitise_max_depth.
+        """
+        cache: Dict[str, str] = {}
+        sanitiser = cls()
+        for document in documents:
+            for key, value in document.items():
+                document[key] = sanitiser._sanitise_field(key, value, cache)
+
+    def _update(self, mapping, cache: Dict[str, str]) -> None:
+        """
+        Set every value of a mapping, sanitising strings through a cache of
+        strings already cleaned.
+        :param mapping: A mapping to be set.
+        :param cache: Cleaned strings by their original value.
+        """
+        if self.lazy:
+            super(SanitisedDataSet, self).update(mapping)
+            self._mark_unsanitised(mapping.keys())
+            return
+
+        for key, value in mapping.items():
+            super(SanitisedDataSet, self).__setitem__(
+                key, self._sanitise_value(value, cache)
+            )
+
+    def _mark_unsanitised(self, keys) -> None:
+        """
+        Record keys whose values were set without being sanitised.
+        :param keys: The keys.
+        """
+        if not self._unsanitised:
+            self._unsanitised = set()
+        self._unsanitised.update(keys)
+
+    def _sanitise_key(self, key) -> None:
+        """
+        Sanitise a lazily set value and store the result for later reads.
+        :param key: The key.
+        """
+        self._unsanitised.discard(key)
+        if super(SanitisedDataSet, self).__contains__(key):
+            value = super(SanitisedDataSet, self).__getitem__(key)
+            super(SanitisedDataSet, self).__setitem__(key, self._sanitise_value(value))
+
+    def _sanitise_all(self) -> None:
+        """
+        Sanitise every lazily set value.
+        """
+        for key in list(self._unsanitised):
+            self._sanitise_key(key)
+
+    def _sanitise_value(self, value, cache: Optional[Dict[str, str]] = None):
+        """
+        Sanitise the passed value to prevent malicious string values. Strings in
+        nested dicts and lists are sanitised in a single pass, and each distinct
+        string is only cleaned once. Only the containers with a string that changes
+        are copied, so the passed value is never modified.
         :param value: The value to be sanitised
+        :param cache: Cleaned strings by their original value, which can be shared
+                      between calls.
+        :return: The sanitised value.
+        :raise ValueError: if dicts and lists are nested deeper than
+                           sanitise_max_depth.
         """
         if type(value) == str:
-            return bleach.clean(value)
+            return self._sanitise_string(value, {} if cache is None else cache)
+        if isinstance(value, (dict, list)):
+            cache = {} if cache is None else cache
+            try:
+                return self._sanitise_container(value, cache, {}, 1)
+            except _CyclicValue:
+                # A container that refers back to itself cannot be copied one part
+                # at a time, so the whole value is copied and sanitised in place.
+                return self._sanitise_container(deepcopy(value), cache, {}, 1, True)
         return value
+
+    def _sanitise_field(self, field, value, cache: Dict[str, str]):
+        """
+        Sanitise the value of a validated field, reporting a value nested too
+        deeply as a validation error of the field.
+        :param field: The field.
+        :param value: The value.
+        :param cache: Cleaned strings by their original value.
+        :return: The sanitised value.
+        :raise DocumentError: if the value is nested deeper than sanitise_max_depth.
+        """
+        try:
+            return self._sanitise_value(value, cache)
+        except _NestedTooDeeply as e:
+            raise DocumentError({field: [str(e)]}) from e
+
+    def _sanitise_string(self, value: str, cache: Dict[str, str]) -> str:
+        """
+        Sanitise a string, using the cache of strings already cleaned.
+        :param value: The string.
+        :param cache: Cleaned strings by their original value.
+        :return: The sanitised string.
+        """
+        try:
+            return cache[value]
+        except KeyError:
+            pass
+
+        cleaned = value
+        if _NEEDS_CLEANING.search(value) is not None:
+            cleaned = self._cleaner().clean(value)
+        cache[value] = cleaned
+        return cleaned
+
+    def _sanitise_container(
+        self,
+        container,
+        cache: Dict[str, str],
+        seen: Dict[int, Any],
+        depth: int,
+        in_place: bool = False,
+    ):
+        """
+        Sanitise the strings in a dict or list and any dicts and lists nested in
+        it. The container is copied the first time one of its values changes, and
+        left as it is otherwise. Containers reachable more than once are only walked
+        once, and share the same result.
+        :param container: A dict or list.
+        :param cache: Cleaned strings by their original value.
+        :param seen: The sanitised containers by the id of the original, or None
+                     for the containers still being walked.
+        :param depth: How deeply the container is nested.
+        :param in_place: Whether to change the container rather than copy it.
+        :return: The container, or a sanitised copy of it.
+        :raise ValueError: if the container is nested deeper than
+                           sanitise_max_depth.
+        :raise _CyclicValue: if the container refers back to itself and is not
+                             being sanitised in place.
+        """
+        try:
+            sanitised = seen[id(container)]
+        except KeyError:
+            pass
+        else:
+            if sanitised is None:
+                raise _CyclicValue()
+            return sanitised
+        if self.sanitise_max_depth is not None and depth > self.sanitise_max_depth:
+            raise _NestedTooDeeply(
+                f"nested deeper than {self.sanitise_max_depth} levels"
+            )
+        sanitised = seen[id(container)] = container if in_place else None
+
+        items = (
+            container.items() if isinstance(container, dict) else enumerate(container)
+        )
+        for key, item in items:
+            if type(item) == str:
+                cleaned = self._sanitise_string(item, cache)
+                if cleaned == item:
+                    continue
+            elif isinstance(item, (dict, list)):
+                cleaned = self._sanitise_container(
+                    item, cache, seen, depth + 1, in_place
+                )
+            else:
+                continue
+            if cleaned is not item:
+                if sanitised is None:
+                    sanitised = copy(container)
+                sanitised[key] = cleaned
+
+        if sanitised is None:
+            sanitised = container
+        seen[id(container)] = sanitised
+        return sanitised
+
+    @classmethod
+    def _cleaner(cls) -> bleach.Cleaner:
+        """
+        Return this thread's cleaner for the dataset, configured from the allowed
+        tags, attributes and protocols. The cleaner is built the first time it is
+        used, so those settings should not be changed at runtime.
+        :return: A bleach Cleaner.
+        """
+        cleaners = getattr(cls._cleaners, "cleaners", None)
+        if cleaners is None:
+            cleaners = cls._cleaners.cleaners = {}
+
+        cleaner = cleaners.get(cls)
+        if cleaner is None:
+            cleaner = cleaners[cls] = bleach.Cleaner(
+                tags=cls.allowed_tags,
+                attributes=cls.allowed_attributes,
+                protocols=cls.allowed_protocols,
+                strip=cls.strip,
+                strip_comments=cls.strip_comments,
+            )
+        return cleaner
+
+
+class _NestedTooDeeply(ValueError):
+    """
+    Raised when a value to be sanitised is nested deeper than sanitise_max_depth.
+    """
+
+
+class _CyclicValue(Exception):
+    """
+    Raised when a value to be sanitised refers back to itself.
+    """
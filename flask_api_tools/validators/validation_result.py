@@ -0,0 +1,47 @@
+from typing import Dict, List
+
+
+class ValidationResult:
+    """
+    The outcome of validating a list of objects without stopping at the first
+    invalid object.
+    """
+
+    def __init__(self, valid: List, errors: Dict[int, Dict]):
+        """
+        :param valid: The validated data of every valid object, in order.
+        :param errors: The validation errors of every invalid object, by index.
+        """
+        self.valid = valid
+        self.errors = errors
+
+    def __repr__(self) -> str:
+        return f"<ValidationResult valid={self.valid_count} errors={self.error_count}>"
+
+    @property
+    def total(self) -> int:
+        """
+        :return: The number of objects validated.
+        """
+        return self.valid_count + self.error_count
+
+    @property
+    def valid_count(self) -> int:
+        """
+        :return: The number of valid objects.
+        """
+        return len(self.valid)
+
+    @property
+    def error_count(self) -> int:
+        """
+        :return: The number of invalid objects.
+        """
+        return len(self.errors)
+
+    @property
+    def is_valid(self) -> bool:
+        """
+        :return: True if every object was valid.
+        """
+        return not self.errors
@@ -1,13 +1,46 @@
 import uuid
 from datetime import date, datetime
 
+from .parse_cache import ParseCache
 from cerberus import Validator as Cerberus
+from typing import Any, Callable, Optional
 
 
 class Validator(Cerberus):
     def __init__(self, *args, **kwargs):
+        """
+        Accepts the same arguments as the Cerberus validator, plus:
+        :param parse_cache_size: If set, dates, datetimes and UUIDs are parsed once
+                                 per distinct value and the results are kept in an
+                                 LRU cache of this size.
+        """
+        parse_cache_size = kwargs.pop("parse_cache_size", None)
+        self.parse_cache: Optional[ParseCache] = (
+            ParseCache(parse_cache_size) if parse_cache_size else None
+        )
         super(Validator, self).__init__(*args, **kwargs)
 
+    def _get_child_validator(self, *args, **kwargs):
+        """
+        Share the parse cache with the validators Cerberus creates for nested
+        documents.
+        """
+        child = super(Validator, self)._get_child_validator(*args, **kwargs)
+        child.parse_cache = self.parse_cache
+        return child
+
+    def _parse(self, kind: str, value: Any, parse: Callable[[Any], Any]) -> Any:
+        """
+        Parse a value, through the parse cache if there is one.
+        :param kind: The kind of parse.
+        :param value: The value to parse.
+        :param parse: The parser.
+        :return: The parsed value
+        """
+        if self.parse_cache is None:
+            return parse(value)
+        return self.parse_cache.get(kind, value, parse)
+
     def _check_with_uuid(self, field, value):
         """
         Custom checker for validating UUIDs
@@ -16,11 +49,16 @@ class Validator(Cerberus):
         :param field: The field being checked
         :param value: The value to check
         """
-        if value is not None:
-            try:
-                uuid.UUID(value)
-            except ValueError:
-                self._error(field, "Must be a UUID")
+        if value is not None and not self._is_uuid(value):
+            self._error(field, "Must be a UUID")
+
+    def _is_uuid(self, value) -> bool:
+        """
+        Check whether a value can be parsed as a UUID.
+        :param value: The value to check
+        :return: True if the value is a UUID
+        """
+        return self._parse("uuid", value, _is_uuid)
 
     def _normalize_coerce_to_string(self, value):
         """
@@ -116,10 +154,7 @@ class Validator(Cerberus):
         :param value: The value to coerce
         :return The coerced value
         """
-        try:
-            return date.fromisoformat(value)
-        except:
-            return None
+        return self._parse("date", value, _to_date)
 
     def _normalize_coerce_to_datetime(self, value):
         """
@@ -129,7 +164,26 @@ class Validator(Cerberus):
         :param value: The value to coerce
         :return The coerced value
         """
-        try:
-            return datetime.fromisoformat(value)
-        except:
-            return None
+        return self._parse("datetime", value, _to_datetime)
+
+
+def _is_uuid(value) -> bool:
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _to_date(value) -> Optional[date]:
+    try:
+        return date.fromisoformat(value)
+    except:
+        return None
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value)
+    except:
+        return None
@@ -0,0 +1,57 @@
+from .validator import Validator
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+
+class ValidatorPool:
+    """
+    A pool of validators compiled for a single schema. A validator is only ever
+    checked out by one thread at a time, so concurrent validation never shares
+    a validator's state.
+    """
+
+    def __init__(self, factory: Callable[[], Validator], size: int = 8):
+        """
+        :param factory: Callable returning a newly compiled validator.
+        :param size: The maximum number of idle validators kept for reuse.
+        """
+        self.factory = factory
+        self.size = size
+        self._idle: deque = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        """
+        :return: The number of idle validators in the pool.
+        """
+        return len(self._idle)
+
+    def acquire(self) -> Validator:
+        """
+        Check out an idle validator, compiling a new one if none are free.
+        :return: A Validator.
+        """
+        try:
+            return self._idle.pop()
+        except IndexError:
+            return self.factory()
+
+    def release(self, validator: Validator) -> None:
+        """
+        Return a validator to the pool. Once the pool is full, the oldest idle
+        validator is dropped.
+        :param validator: The validator.
+        """
+        self._idle.append(validator)
+
+    @contextmanager
+    def validator(self) -> Iterator[Validator]:
+        """
+        Check out a validator for the duration of a ``with`` block.
+        :return: A Validator.
+        """
+        validator = self.acquire()
+        try:
+            yield validator
+        finally:
+            self.release(validator)
@@ -22,7 +22,7 @@ setuptools.setup(
     python_requires=">=3.8",
     install_requires=[
         "flask >= 1.1",
-        "flask-limiter >= 1.3",
+        "flask-limiter >= 1.3, < 2",
         "redis >= 2.10",
         "bleach >= 3.1",
         "cerberus >= 1.3",
@@ -0,0 +1,283 @@
+import asyncio
+import fakeredis
+import pytest
+import redis
+import sys
+import threading
+
+from unittest import mock
+
+from flask import Flask
+from flask_api_tools.rate_limiting.async_rate_limiter import AsyncRateLimiter
+from flask_api_tools.rate_limiting.in_memory_limiter import InMemoryLimiter
+from flask_api_tools.rate_limiting.scripts import SCRIPT_HIT_ALL
+from flask_limiter.errors import RateLimitExceeded
+from limits import parse
+
+# Older fakeredis releases have no async client.
+requires_async_redis = pytest.mark.skipif(
+    not hasattr(fakeredis, "FakeAsyncRedis"), reason="needs fakeredis.FakeAsyncRedis"
+)
+
+
+def async_redis(server=None):
+    return fakeredis.FakeAsyncRedis(server=server or fakeredis.FakeServer())
+
+
+def limited_app(async_server, server=None, **kwargs):
+    app = Flask(__name__)
+    sync_client = fakeredis.FakeStrictRedis(server=server or fakeredis.FakeServer())
+    with mock.patch("redis.from_url", return_value=sync_client):
+        limiter = InMemoryLimiter(
+            app=app,
+            key_func=lambda: "client",
+            storage_uri="redis://localhost",
+            async_redis_client=lambda: async_redis(async_server),
+            **kwargs,
+        )
+
+    @app.route("/")
+    @limiter.async_limit("5/second;2/minute")
+    async def index():
+        return "ok"
+
+    return app, limiter, index
+
+
+def request(app, view):
+    with app.test_request_context("/"):
+        return asyncio.run(view())
+
+
+async def async_limiter(limiter):
+    return limiter.async_limiter
+
+
+@requires_async_redis
+class TestAsyncRateLimiter:
+    def test_hit(self):
+        pytest.importorskip("lupa")
+        limiter = AsyncRateLimiter(async_redis())
+        item = parse("2/minute")
+
+        async def hits():
+            return [await limiter.hit(item, "client") for _ in range(3)]
+
+        assert asyncio.run(hits()) == [True, True, False]
+
+    def test_hit_all_stops_at_first_exceeded(self):
+        pytest.importorskip("lupa")
+        client = async_redis()
+        limiter = AsyncRateLimiter(client)
+        minute, hour = parse("1/minute"), parse("10/hour")
+        limits = [(minute, ["client"]), (hour, ["client"])]
+
+        async def hits():
+            return [await limiter.hit_all(limits) for _ in range(2)]
+
+        assert asyncio.run(hits()) == [0, 1]
+        assert asyncio.run(client.get(hour.key_for("client"))) == b"1"
+
+    def test_test_and_window_stats(self):
+        client = async_redis()
+        limiter = AsyncRateLimiter(client)
+        item = parse("2/minute")
+
+        async def stats():
+            await client.set(item.key_for("client"), 1, ex=60)
+            before = await limiter.test(item, "client"), await limiter.get_window_stats(
+                item, "client"
+            )
+            await client.incr(item.key_for("client"))
+            return before, await limiter.test(item, "client")
+
+        (allowed, (reset, remaining)), exceeded = asyncio.run(stats())
+        assert allowed and not exceeded
+        assert remaining == 1
+        assert reset > 0
+
+    def test_check(self):
+        server = fakeredis.FakeServer()
+        limiter = AsyncRateLimiter(async_redis(server))
+        assert asyncio.run(limiter.check())
+
+        server.connected = False
+        assert not asyncio.run(limiter.check())
+
+    def test_shares_counts_with_sync_storage(self):
+        pytest.importorskip("lupa")
+        server = fakeredis.FakeServer()
+        app, limiter, _ = limited_app(server, server=server)
+        item = parse("2/minute")
+
+        async def hits():
+            return [await limiter.async_limiter.hit(item, "client") for _ in range(2)]
+
+        limiter._limiter.hit(item, "client")
+        assert asyncio.run(hits()) == [True, False]
+
+
+@requires_async_redis
+class TestInMemoryLimiterAsyncLimit:
+    def test_limits_async_view(self):
+        pytest.importorskip("lupa")
+        app, limiter, index = limited_app(fakeredis.FakeServer())
+
+        assert request(app, index) == "ok"
+        assert request(app, index) == "ok"
+        with pytest.raises(RateLimitExceeded):
+            request(app, index)
+        # The sync storage was never used.
+        assert limiter._hit_all_script is None
+        assert f"{__name__}.index" in limiter._exempt_routes
+
+    def test_falls_back_to_memory(self):
+        server = fakeredis.FakeServer()
+        server.connected = False
+        app, limiter, index = limited_app(server, in_memory_fallback=["1/minute"])
+
+        assert request(app, index) == "ok"
+        assert limiter._storage_dead
+        with pytest.raises(RateLimitExceeded):
+            request(app, index)
+
+    def test_falls_back_to_memory_without_fallback_limits(self):
+        server = fakeredis.FakeServer()
+        server.connected = False
+        app, limiter, index = limited_app(server, in_memory_fallback_enabled=True)
+
+        assert request(app, index) == "ok"
+        assert limiter._storage_dead
+        assert request(app, index) == "ok"
+        # The view's own limit of 2 a minute is checked in memory.
+        with pytest.raises(RateLimitExceeded):
+            request(app, index)
+
+    def test_recovers_from_fallback(self):
+        pytest.importorskip("lupa")
+        server = fakeredis.FakeServer()
+        server.connected = False
+        app, limiter, index = limited_app(server, in_memory_fallback=["1/minute"])
+        assert request(app, index) == "ok"
+        assert limiter._storage_dead
+
+        server.connected = True
+        # Flask-Limiter waits a second before its first check for recovery.
+        limiter._Limiter__last_check_backend = 0
+
+        assert request(app, index) == "ok"
+        assert not limiter._storage_dead
+        assert limiter._Limiter__check_backend_count == 0
+        assert request(app, index) == "ok"
+        with pytest.raises(RateLimitExceeded):
+            request(app, index)
+
+    def test_storage_error_without_fallback(self):
+        server = fakeredis.FakeServer()
+        server.connected = False
+        app, limiter, index = limited_app(server)
+
+        with pytest.raises(redis.exceptions.ConnectionError):
+            request(app, index)
+
+    def test_memory_storage(self):
+        app = Flask(__name__)
+        limiter = InMemoryLimiter(app=app, key_func=lambda: "client")
+
+        @app.route("/")
+        @limiter.async_limit("1/minute")
+        async def index():
+            return "ok"
+
+        assert limiter._async_redis is None
+        assert request(app, index) == "ok"
+        with pytest.raises(RateLimitExceeded):
+            request(app, index)
+
+    def test_check_storage_async(self):
+        server = fakeredis.FakeServer()
+        app, limiter, _ = limited_app(server)
+        assert asyncio.run(limiter.check_storage_async())
+
+        server.connected = False
+        assert not asyncio.run(limiter.check_storage_async())
+
+    def test_builds_async_client(self):
+        app = Flask(__name__)
+        with mock.patch("redis.from_url"):
+            limiter = InMemoryLimiter(app=app, storage_uri="redis://localhost:6379/2")
+
+        assert limiter.async_limiter is None
+        assert isinstance(asyncio.run(async_limiter(limiter)), AsyncRateLimiter)
+        kwargs = limiter._async_redis().connection_pool.connection_kwargs
+        assert kwargs["db"] == 2
+
+    def test_client_for_each_event_loop(self):
+        server = fakeredis.FakeServer()
+        clients = []
+        app = Flask(__name__)
+        with mock.patch("redis.from_url"):
+            limiter = InMemoryLimiter(
+                app=app,
+                storage_uri="redis://localhost",
+                async_redis_client=lambda: clients.append(async_redis(server))
+                or clients[-1],
+            )
+
+        async def twice():
+            return await async_limiter(limiter), await async_limiter(limiter)
+
+        first, again = asyncio.run(twice())
+        second = asyncio.run(async_limiter(limiter))
+
+        assert first is again
+        assert second is not first
+        assert [first.redis, second.redis] == clients
+        # The limiter of the first loop was dropped once the loop closed.
+        assert list(limiter._async_limiters.values()) == [second]
+
+    def test_through_test_client(self):
+        pytest.importorskip("asgiref")
+        pytest.importorskip("lupa")
+        if not hasattr(fakeredis, "TcpFakeServer"):
+            pytest.skip("needs fakeredis.TcpFakeServer")
+
+        server = fakeredis.TcpFakeServer(("127.0.0.1", 0))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            host, port = server.server_address
+            # The fake server drops the connection after an error reply, such as the
+            # NOSCRIPT of a script's first call.
+            redis.Redis(host=host, port=port).script_load(SCRIPT_HIT_ALL)
+            app = Flask(__name__)
+            limiter = InMemoryLimiter(
+                app=app, key_func=lambda: "client", storage_uri=f"redis://{host}:{port}"
+            )
+
+            @app.route("/")
+            @limiter.async_limit("2/minute")
+            async def index():
+                return "ok"
+
+            # Flask runs each async view on a new event loop.
+            client = app.test_client()
+            statuses = [client.get("/").status_code for _ in range(3)]
+
+            assert statuses == [200, 200, 429]
+            assert not limiter._storage_dead
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestInMemoryLimiterWithoutAsyncRedis:
+    def test_sync_checks_are_used(self):
+        app = Flask(__name__)
+        # A None entry makes importing redis.asyncio fail, as with redis < 4.2.
+        with mock.patch.dict(sys.modules, {"redis.asyncio": None}):
+            with mock.patch("redis.from_url"):
+                limiter = InMemoryLimiter(app=app, storage_uri="redis://localhost")
+
+        assert limiter._async_redis is None
+        assert asyncio.run(async_limiter(limiter)) is None
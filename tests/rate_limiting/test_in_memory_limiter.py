@@ -1,8 +1,15 @@
 import copy
+import fakeredis
 import pytest
+import redis
 
+from unittest import mock
+
+from flask import Flask, current_app
 from flask_api_tools.rate_limiting.in_memory_limiter import InMemoryLimiter
+from limits import parse
 from limits.errors import ConfigurationError
+from limits.storage import RedisStorage
 
 
 class TestInMemoryLimiter:
@@ -29,3 +36,169 @@ class TestInMemoryLimiter:
 
         # Implicit assert no exceptions raised
         limiter._check_storage()
+
+
+def redis_limiter(app, **kwargs):
+    client = fakeredis.FakeStrictRedis(server=fakeredis.FakeServer())
+    with mock.patch("redis.from_url", return_value=client):
+        return InMemoryLimiter(
+            app=app,
+            key_func=lambda: "client",
+            storage_uri="redis://localhost",
+            **kwargs,
+        )
+
+
+def limited_route(app, limiter, limits):
+    # Requests share the app context the app fixture pushes, so their ``g`` too,
+    # unless they are made to a different app.
+    assert app is not current_app
+
+    @app.route("/")
+    @limiter.limit(limits)
+    def index():
+        return "ok"
+
+    return app.test_client()
+
+
+class TestInMemoryLimiterMultipleLimits:
+    def test_one_call_for_every_limit(self):
+        pytest.importorskip("lupa")
+        app = Flask(__name__)
+        limiter = redis_limiter(app)
+        client = limited_route(app, limiter, "5/second;2/minute;10/hour")
+        limiter._hit_all()
+        limiter._hit_all_script = mock.Mock(wraps=limiter._hit_all_script)
+
+        assert client.get("/").status_code == 200
+        assert client.get("/").status_code == 200
+        assert client.get("/").status_code == 429
+        assert limiter._hit_all_script.call_count == 3
+
+    def test_stops_at_first_exceeded_limit(self):
+        pytest.importorskip("lupa")
+        app = Flask(__name__)
+        limiter = redis_limiter(app)
+        client = limited_route(app, limiter, "1/minute;10/hour")
+        hour = parse("10/hour")
+
+        client.get("/")
+        assert client.get("/").status_code == 429
+        assert limiter.limiter.get_window_stats(hour, "client", "index")[1] == 9
+
+    def test_headers(self):
+        pytest.importorskip("lupa")
+        headers = []
+        for storage_uri in ("redis://localhost", "memory://"):
+            app = Flask(__name__)
+            app.config["RATELIMIT_HEADERS_ENABLED"] = True
+            if storage_uri == "memory://":
+                limiter = InMemoryLimiter(app=app, key_func=lambda: "client")
+            else:
+                limiter = redis_limiter(app)
+            client = limited_route(app, limiter, "5/second;2/minute")
+
+            response = client.get("/")
+            headers.append(
+                [response.headers[f"X-RateLimit-{h}"] for h in ("Limit", "Remaining")]
+            )
+        assert headers[0] == headers[1] == ["5", "4"]
+
+    def test_memory_storage_falls_back(self):
+        app = Flask(__name__)
+        limiter = InMemoryLimiter(app=app, key_func=lambda: "client")
+        client = limited_route(app, limiter, "5/second;2/minute")
+
+        assert limiter._hit_all() is None
+        assert [client.get("/").status_code for _ in range(3)] == [200, 200, 429]
+
+    def test_moving_window_falls_back(self, app):
+        limiter = redis_limiter(app, strategy="moving-window")
+
+        assert limiter._hit_all() is None
+
+
+class TestInMemoryLimiterRedisPool:
+    def test_shares_redis_client(self, app):
+        limiter = InMemoryLimiter(app=app, redis_client=app.redis)
+
+        assert limiter._storage.storage is app.redis
+        assert limiter._storage.check()
+        limiter._storage.incr("LIMITER/shared", 60, elastic_expiry=True)
+        assert app.redis.get("LIMITER/shared") == b"1"
+        assert limiter.async_limiter is None
+
+    def test_shares_connection_pool_from_config(self, app):
+        app.config["RATELIMIT_REDIS_CLIENT"] = app.redis.connection_pool
+        limiter = InMemoryLimiter(app=app)
+
+        assert limiter._storage.storage.connection_pool is app.redis.connection_pool
+
+    def test_shares_async_client(self, app):
+        async_client = mock.sentinel.async_client
+        limiter = InMemoryLimiter(
+            app=app, redis_client=app.redis, async_redis_client=async_client
+        )
+
+        assert limiter._async_redis() is async_client
+
+    def test_redis_options(self, app):
+        app.config["RATELIMIT_REDIS_MAX_CONNECTIONS"] = 7
+        app.config["RATELIMIT_REDIS_SOCKET_TIMEOUT"] = 0.5
+        app.config["RATELIMIT_REDIS_SOCKET_CONNECT_TIMEOUT"] = 0.25
+        app.config["RATELIMIT_REDIS_HEALTH_CHECK_INTERVAL"] = 30
+        with mock.patch.object(RedisStorage, "check", return_value=True):
+            limiter = InMemoryLimiter(app=app, storage_uri="redis://localhost")
+
+        pool = limiter._storage.storage.connection_pool
+        assert pool.max_connections == 7
+        assert pool.connection_kwargs["socket_timeout"] == 0.5
+        assert pool.connection_kwargs["socket_connect_timeout"] == 0.25
+        assert pool.connection_kwargs["health_check_interval"] == 30
+
+    def test_redis_options_of_async_client(self, app):
+        pytest.importorskip("redis.asyncio")
+        app.config["RATELIMIT_REDIS_MAX_CONNECTIONS"] = 7
+        with mock.patch.object(RedisStorage, "check", return_value=True):
+            limiter = InMemoryLimiter(app=app, storage_uri="redis://localhost")
+
+        async_pool = limiter._async_redis().connection_pool
+        assert async_pool.max_connections == 7
+
+    def test_redis_options_ignored_for_other_storage(self, app):
+        app.config["RATELIMIT_REDIS_MAX_CONNECTIONS"] = 7
+        limiter = InMemoryLimiter(app=app)
+
+        assert limiter._storage_options == {}
+        assert limiter.pool_stats() == {}
+
+    def test_client_ignored_for_other_storage(self, app):
+        limiter = InMemoryLimiter(
+            app=app, redis_client=app.redis, storage_uri="memory://"
+        )
+
+        assert not isinstance(limiter._storage, RedisStorage)
+
+    def test_pool_stats(self, app):
+        limiter = InMemoryLimiter(app=app, redis_client=app.redis)
+        limiter._storage.check()
+
+        stats = limiter.pool_stats()
+        assert stats["created"] >= 1
+        assert stats["in_use"] == 0
+        assert stats["available"] == stats["created"]
+        assert stats["shared"]
+
+    def test_blocking_pool_stats(self, app):
+        pool = redis.BlockingConnectionPool(max_connections=4)
+        with mock.patch.object(RedisStorage, "check", return_value=True):
+            limiter = InMemoryLimiter(app=app, redis_client=pool)
+
+        assert limiter.pool_stats() == {
+            "max_connections": 4,
+            "created": 0,
+            "in_use": 0,
+            "available": 0,
+            "shared": True,
+        }
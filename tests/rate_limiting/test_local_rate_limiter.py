@@ -0,0 +1,128 @@
+import fakeredis
+import pytest
+import time
+
+from unittest import mock
+
+from flask_api_tools.rate_limiting.in_memory_limiter import InMemoryLimiter
+from flask_api_tools.rate_limiting.local_rate_limiter import LocalRateLimiter
+from limits import parse
+from limits.storage import MemoryStorage, RedisStorage
+from limits.strategies import FixedWindowRateLimiter, MovingWindowRateLimiter
+
+
+def local_limiter(storage, **kwargs):
+    return LocalRateLimiter(FixedWindowRateLimiter(storage), **kwargs)
+
+
+class TestLocalRateLimiter:
+    def test_hits_are_sent_in_batches(self):
+        storage = MemoryStorage()
+        limiter = local_limiter(storage, batch_size=10)
+        item = parse("100/minute")
+
+        assert all(limiter.hit(item, "client") for _ in range(25))
+        assert limiter.storage_hits == 3
+        assert limiter.local_hits == 22
+        assert storage.get(item.key_for("client")) == 23
+
+        limiter.flush()
+        assert storage.get(item.key_for("client")) == 25
+
+    def test_limit_is_exact_for_one_worker(self):
+        limiter = local_limiter(MemoryStorage(), batch_size=10)
+        item = parse("5/minute")
+
+        hits = [limiter.hit(item, "client") for _ in range(8)]
+        assert hits == [True] * 5 + [False] * 3
+        assert not limiter.test(item, "client")
+        assert limiter.get_window_stats(item, "client")[1] == 0
+
+    def test_over_admission_is_bounded(self):
+        storage = MemoryStorage()
+        workers = [local_limiter(storage, batch_size=5) for _ in range(3)]
+        item = parse("20/minute")
+
+        admitted = sum(workers[i % 3].hit(item, "client") for i in range(200))
+        assert 20 <= admitted <= 20 + 3 * 5
+
+    def test_sync_interval(self):
+        limiter = local_limiter(MemoryStorage(), sync_interval=0)
+        item = parse("100/minute")
+
+        for _ in range(5):
+            limiter.hit(item, "client")
+        assert limiter.storage_hits == 5
+        assert limiter.local_hits == 0
+
+    def test_window_ends(self):
+        limiter = local_limiter(MemoryStorage())
+        item = parse("2/minute")
+        limiter.hit(item, "client")
+        limiter.hit(item, "client")
+        assert not limiter.hit(item, "client")
+
+        key = item.key_for("client")
+        limiter._quotas[key].reset = 0
+        limiter.storage().clear(key)
+        assert limiter.hit(item, "client")
+
+    def test_redis_storage(self):
+        pytest.importorskip("lupa")
+        client = fakeredis.FakeStrictRedis(server=fakeredis.FakeServer())
+        with mock.patch("redis.from_url", return_value=client):
+            storage = RedisStorage("redis://localhost")
+        limiter = local_limiter(storage, batch_size=4)
+        item = parse("100/minute")
+
+        for _ in range(6):
+            limiter.hit(item, "client")
+        key = item.key_for("client")
+        assert int(client.get(key)) == 6
+        assert 0 < client.ttl(key) <= 60
+        assert limiter.storage_hits == 2
+
+    def test_redis_key_without_expiry_is_given_one(self):
+        pytest.importorskip("lupa")
+        client = fakeredis.FakeStrictRedis(server=fakeredis.FakeServer())
+        with mock.patch("redis.from_url", return_value=client):
+            storage = RedisStorage("redis://localhost")
+        limiter = local_limiter(storage)
+        item = parse("100/minute")
+        key = item.key_for("client")
+        client.set(key, 5)
+
+        limiter.hit(item, "client")
+
+        assert int(client.get(key)) == 6
+        assert 0 < client.ttl(key) <= 60
+        assert 0 < limiter.get_window_stats(item, "client")[0] - time.time() <= 60
+
+    def test_clear(self):
+        limiter = local_limiter(MemoryStorage())
+        limiter.hit(parse("100/minute"), "client")
+        limiter.clear()
+        assert limiter._quotas == {}
+
+    def test_other_strategies(self):
+        with pytest.raises(ValueError):
+            LocalRateLimiter(MovingWindowRateLimiter(MemoryStorage()))
+
+    def test_in_memory_limiter(self, app):
+        app.config["RATELIMIT_LOCAL_QUOTA"] = True
+        app.config["RATELIMIT_LOCAL_BATCH_SIZE"] = 5
+        limiter = InMemoryLimiter(app=app)
+
+        assert isinstance(limiter.limiter, LocalRateLimiter)
+        assert limiter.limiter.batch_size == 5
+
+        limiter.limiter.hit(parse("100/minute"), "client")
+        limiter.reset()
+        assert limiter.limiter._quotas == {}
+
+    def test_in_memory_limiter_other_strategy(self, app):
+        app.config["RATELIMIT_LOCAL_QUOTA"] = True
+        app.config["RATELIMIT_STRATEGY"] = "moving-window"
+        limiter = InMemoryLimiter(app=app)
+
+        assert isinstance(limiter.limiter, MovingWindowRateLimiter)
@@ -0,0 +1,139 @@
+import logging
+import time
+
+from flask_api_tools.rate_limiting.in_memory_limiter import InMemoryLimiter
+from flask_api_tools.rate_limiting.storage_monitor import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    StorageMonitor,
+)
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def monitored_limiter(app, check=lambda: True):
+    limiter = InMemoryLimiter(app=app, in_memory_fallback_enabled=True)
+    limiter._storage.check = check
+    return limiter
+
+
+def failing():
+    raise ConnectionError("storage unreachable")
+
+
+def slow():
+    time.sleep(0.02)
+    return True
+
+
+class TestStorageMonitor:
+    def test_stays_closed(self, app):
+        monitor = StorageMonitor(monitored_limiter(app))
+
+        assert monitor.probe() == CLOSED
+        assert monitor.latency is not None
+        assert monitor.error_rate == 0
+
+    def test_opens_on_latency(self, app):
+        limiter = monitored_limiter(app, check=slow)
+        monitor = StorageMonitor(limiter, max_latency=0.01)
+
+        assert monitor.probe() == OPEN
+        assert limiter._storage_dead
+        assert limiter.limiter is limiter._fallback_limiter
+
+    def test_opens_on_error_rate(self, app):
+        limiter = monitored_limiter(app)
+        monitor = StorageMonitor(limiter, max_error_rate=0.5, window=4)
+
+        assert monitor.probe() == CLOSED
+        limiter._storage.check = failing
+        assert monitor.probe() == OPEN
+        assert monitor.error_rate == 0.5
+
+        monitor = StorageMonitor(limiter, max_error_rate=0.5, window=4)
+        limiter._storage_dead = False
+        limiter._storage.check = lambda: True
+        monitor.probe()
+        monitor.probe()
+        limiter._storage.check = lambda: False
+        assert monitor.probe() == CLOSED
+        assert monitor.probe() == OPEN
+
+    def test_opens_when_a_request_falls_back(self, app):
+        limiter = monitored_limiter(app)
+        monitor = StorageMonitor(limiter)
+
+        limiter._storage_dead = True
+        assert monitor.probe() == OPEN
+
+    def test_recovers(self, app):
+        limiter = monitored_limiter(app, check=failing)
+        monitor = StorageMonitor(limiter, max_error_rate=0.5, recovery_probes=3)
+        monitor.probe()
+
+        limiter._storage.check = lambda: True
+        assert [monitor.probe() for _ in range(3)] == [HALF_OPEN, HALF_OPEN, CLOSED]
+        assert not limiter._storage_dead
+        assert monitor.error_rate == 0
+
+    def test_half_open_probe_fails(self, app):
+        limiter = monitored_limiter(app, check=failing)
+        monitor = StorageMonitor(limiter, max_error_rate=0.5)
+        monitor.probe()
+
+        limiter._storage.check = lambda: True
+        assert monitor.probe() == HALF_OPEN
+        limiter._storage.check = slow
+        monitor.max_latency = 0.01
+        assert monitor.probe() == OPEN
+        assert limiter._storage_dead
+
+    def test_changes_are_logged_to_app_handlers(self, app):
+        handler = RecordingHandler()
+        app.logger.addHandler(handler)
+        limiter = monitored_limiter(app, check=failing)
+        monitor = StorageMonitor(limiter, max_error_rate=0.5, recovery_probes=1)
+
+        limiter.logger.setLevel(logging.INFO)
+        try:
+            monitor.probe()
+            limiter._storage.check = lambda: True
+            monitor.probe()
+        finally:
+            limiter.logger.setLevel(logging.NOTSET)
+
+        changes = [m for m in handler.messages if "circuit" in m]
+        assert len(changes) == 2
+        assert "closed -> open" in changes[0]
+        assert "open -> closed" in changes[1]
+
+    def test_background_thread(self, app):
+        app.config["RATELIMIT_MONITOR_INTERVAL"] = 0.01
+        limiter = InMemoryLimiter(app=app, in_memory_fallback_enabled=True)
+        try:
+            assert limiter.monitor.is_alive()
+            assert not limiter._Limiter__should_check_backend()
+
+            limiter._storage.check = failing
+            deadline = time.time() + 2
+            while limiter.monitor.state != OPEN and time.time() < deadline:
+                time.sleep(0.01)
+            assert limiter._storage_dead
+        finally:
+            limiter.monitor.stop(timeout=1)
+        assert not limiter.monitor.is_alive()
+
+    def test_needs_fallback(self, app):
+        app.config["RATELIMIT_MONITOR_INTERVAL"] = 0.01
+        limiter = InMemoryLimiter(app=app)
+
+        assert limiter.monitor is None
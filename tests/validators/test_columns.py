@@ -0,0 +1,66 @@
+import pytest
+
+from array import array
+from flask_api_tools.validators import Columns
+
+
+class TestColumns:
+    schema = {
+        "integer_1": {"type": "integer"},
+        "float_1": {"type": "float", "nullable": True},
+        "string_1": {"type": "string", "required": True},
+        "number_1": {"type": ["integer", "float"], "required": True},
+    }
+
+    def test_typed_columns(self):
+        documents = [
+            {"integer_1": 1, "float_1": 0.5, "string_1": "a", "number_1": 1},
+            {"float_1": None, "string_1": "b", "number_1": 2.5},
+        ]
+
+        columns = Columns.from_documents(self.schema, documents)
+
+        assert columns == {
+            "integer_1": array("q", [1, 0]),
+            "float_1": array("d", [0.5, 0.0]),
+            "string_1": ["a", "b"],
+            "number_1": [1, 2.5],
+        }
+        assert columns.length == 2
+        assert sorted(columns.nulls) == ["float_1", "integer_1"]
+
+    def test_null_bitmaps(self):
+        documents = [
+            {"float_1": None if i % 3 == 0 else float(i), "string_1": "", "number_1": 1}
+            for i in range(10)
+        ]
+
+        columns = Columns.from_documents(self.schema, documents)
+
+        assert columns.nulls["float_1"] == bytearray([0b01001001, 0b10])
+        assert [i for i in range(10) if columns.is_null("float_1", i)] == [0, 3, 6, 9]
+        assert all(columns.is_null("integer_1", i) for i in range(10))
+        assert not columns.is_null("string_1", 0)
+
+        with pytest.raises(IndexError):
+            columns.is_null("float_1", 10)
+
+    def test_require_all(self):
+        documents = [{"integer_1": 1, "string_1": "a", "number_1": 1, "float_1": 1.0}]
+
+        columns = Columns.from_documents(self.schema, documents, require_all=True)
+
+        assert sorted(columns.nulls) == ["float_1"]
+
+    def test_values_that_do_not_fit_an_array(self):
+        documents = [{"integer_1": 2**64, "string_1": "a", "number_1": 1}]
+
+        columns = Columns.from_documents(self.schema, documents)
+
+        assert columns["integer_1"] == [2**64]
+
+    def test_unknown_fields(self):
+        with pytest.raises(ValueError) as e:
+            Columns.from_documents(self.schema, [{"string_1": "a", "z": 1}])
+
+        assert str(e.value) == "Columns can only hold fields in the schema: z"
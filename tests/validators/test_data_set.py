@@ -1,9 +1,22 @@
+from array import array
 from cerberus import DocumentError
 from datetime import date, datetime
-from flask_api_tools.validators import DataSet, Validator
+from flask_api_tools.validators import (
+    DataSet,
+    ResultCache,
+    ValidationResult,
+    Validator,
+)
 import pytest
 
 
+class ParallelExample(DataSet):
+    schema = {
+        "integer_1": {"type": "integer", "coerce": "to_integer"},
+        "string_1": {"type": "string", "required": True},
+    }
+
+
 class TestDataSet:
     def test_validate_object(self):
         class Example(DataSet):
@@ -154,6 +167,22 @@ class TestDataSet:
         validated = Example.validate_many(data)
         assert validated == result
 
+    def test_validate_objects_from_a_generator(self):
+        class Example(DataSet):
+            schema = {
+                "integer_1": {"type": "integer", "coerce": "to_integer"},
+            }
+
+        def rows(count):
+            return ({"integer_1": str(i)} for i in range(count))
+
+        result = [{"integer_1": i} for i in range(3)]
+        assert Example.validate_objects(rows(3)) == result
+        assert Example.validate_objects(rows(3), layout="records") == result
+        columns = Example.validate_objects(rows(3), layout="columnar")
+        assert columns == {"integer_1": array("q", [0, 1, 2])}
+        assert Example.validate_many({"data": map(dict, result)}) == result
+
     def test_validate_many_no_data(self):
         class Example(DataSet):
             schema = {
@@ -166,6 +195,162 @@ class TestDataSet:
         validated = Example.validate_many(data)
         assert validated == result
 
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_validate_objects_in_parallel(self, executor):
+        data = [{"integer_1": str(i), "string_1": "a"} for i in range(50)]
+        result = [{"integer_1": i, "string_1": "a"} for i in range(50)]
+
+        validated = ParallelExample.validate_objects(
+            data, workers=3, executor=executor, chunk_size=7
+        )
+
+        assert validated == result
+        assert all(type(row) is ParallelExample for row in validated)
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_validate_objects_in_parallel_reports_the_first_error(self, executor):
+        data = [{"integer_1": str(i), "string_1": "a"} for i in range(50)]
+        data[12] = {"integer_1": "12"}
+        data[40] = {"integer_1": "40", "string_1": 40}
+
+        with pytest.raises(DocumentError) as error:
+            ParallelExample.validate_objects(
+                data, workers=4, executor=executor, chunk_size=5
+            )
+
+        assert error.value.args[0] == {"string_1": ["required field"]}
+
+    def test_validate_objects_in_parallel_unknown_executor(self):
+        with pytest.raises(ValueError):
+            ParallelExample.validate_objects([{}], workers=2, executor="cluster")
+
+    @pytest.mark.parametrize("compile_mode", [None, "fast"])
+    def test_validate_objects_partial(self, compile_mode):
+        class Example(DataSet):
+            schema = {
+                "string_1": {"type": "string", "check_with": "uuid"},
+                "integer_1": {"type": "integer", "coerce": "to_integer"},
+            }
+
+        Example.compile_mode = compile_mode
+
+        data = [
+            {"string_1": "7c674878-e544-431c-8c11-f11565299cac", "integer_1": "1"},
+            {"string_1": "not a uuid", "integer_1": "2"},
+            {"string_1": "7c674878-e544-431c-8c11-f11565299cac", "integer_1": "3"},
+            {"integer_1": "four"},
+        ]
+
+        result = Example.validate_objects_partial(data)
+
+        assert isinstance(result, ValidationResult)
+        assert result.valid == [
+            {"string_1": "7c674878-e544-431c-8c11-f11565299cac", "integer_1": 1},
+            {"string_1": "7c674878-e544-431c-8c11-f11565299cac", "integer_1": 3},
+        ]
+        assert all(type(row) is Example for row in result.valid)
+        assert result.errors == {
+            1: {"string_1": ["Must be a UUID"]},
+            3: {
+                "integer_1": [
+                    "field 'integer_1' cannot be coerced: invalid literal for int() "
+                    "with base 10: 'four'",
+                    "must be of integer type",
+                ]
+            },
+        }
+        assert result.total == 4
+        assert result.valid_count == 2
+        assert result.error_count == 2
+        assert not result.is_valid
+
+    def test_validate_objects_partial_all_valid(self):
+        class Example(DataSet):
+            schema = {
+                "string_1": {"type": "string"},
+            }
+
+        result = Example.validate_objects_partial(iter([{"string_1": "a"}]))
+
+        assert result.valid == [{"string_1": "a"}]
+        assert result.errors == {}
+        assert result.is_valid
+        assert Example.validate_objects_partial([]).total == 0
+
+    def test_iter_validate_objects(self):
+        class Example(DataSet):
+            schema = {
+                "integer_1": {"type": "integer", "coerce": "to_integer"},
+            }
+
+        consumed = []
+
+        def rows():
+            for i in range(3):
+                consumed.append(i)
+                yield {"integer_1": str(i)}
+
+        validated = Example.iter_validate_objects(rows())
+        assert consumed == []
+
+        assert next(validated) == {"integer_1": 0}
+        assert consumed == [0]
+        assert type(next(validated)) is Example
+        assert list(validated) == [{"integer_1": 2}]
+
+    def test_iter_validate_objects_fails_fast(self):
+        class Example(DataSet):
+            schema = {
+                "string_1": {"type": "string"},
+            }
+
+        validated = Example.iter_validate_objects(
+            [{"string_1": "a"}, {"string_1": 1337}, {"string_1": "b"}]
+        )
+
+        assert next(validated) == {"string_1": "a"}
+        with pytest.raises(DocumentError):
+            next(validated)
+
+    def test_iter_validate_objects_collects_errors(self):
+        class Example(DataSet):
+            schema = {
+                "string_1": {"type": "string"},
+            }
+
+        errors = {}
+        validated = Example.iter_validate_objects(
+            [{"string_1": 1337}, {"string_1": "a"}, {"string_2": "b"}], errors=errors
+        )
+
+        assert list(validated) == [{"string_1": "a"}]
+        assert errors == {
+            0: {"string_1": ["must be of string type"]},
+            2: {"string_2": ["unknown field"]},
+        }
+
+    def test_iter_validate_many(self):
+        class Example(DataSet):
+            schema = {
+                "string_1": {"type": "string", "check_with": "uuid"},
+            }
+
+        data = {
+            "data": iter(
+                [
+                    {"string_1": "7c674878-e544-431c-8c11-f11565299cac"},
+                    {"string_1": "not a uuid"},
+                ]
+            )
+        }
+        errors = {}
+
+        validated = list(Example.iter_validate_many(data, errors=errors))
+
+        assert validated == [{"string_1": "7c674878-e544-431c-8c11-f11565299cac"}]
+        assert errors == {1: {"string_1": ["Must be a UUID"]}}
+        assert list(Example.iter_validate_many({})) == []
+
     def test_a_simple_validation_failure(self):
         class Example(DataSet):
             schema = {
@@ -311,6 +496,441 @@ class TestDataSet:
         with pytest.raises(DocumentError):
             validated = Example2.validate_object(data)
 
+    def test_compiled_validator_is_reused(self):
+        class Example(DataSet):
+            schema = {
+                "string_1": {"type": "string", "check_with": "uuid"},
+            }
+
+        data = {
+            "string_1": "7c674878-e544-431c-8c11-f11565299cac",
+        }
+
+        Example.validate_object(data)
+        pool = Example._validator_pool()
+        validator = pool.acquire()
+        pool.release(validator)
+        Example.validate_objects([data, data])
+
+        assert Example._validator_pool() is pool
+        assert pool.acquire() is validator
+        assert validator is not Example._validator
+        assert Example._validator.schema is None
+
+    def test_compiled_validator_is_keyed_by_config(self):
+        class Example(DataSet):
+            schema = {
+                "string_1": {"type": "string", "check_with": "uuid"},
+            }
+
+        strict = Example._validator_pool().acquire()
+        Example.allow_unknown = True
+        relaxed = Example._validator_pool().acquire()
+
+        assert strict is not relaxed
+        assert not strict.allow_unknown
+        assert relaxed.allow_unknown
+
+    def test_clear_validator_cache(self):
+        class Example(DataSet):
+            schema = {
+                "string_1": {"type": "string", "check_with": "uuid"},
+            }
+
+        class ExampleChild(Example):
+            pass
+
+        data = {
+            "string_2": "7c674878-e544-431c-8c11-f11565299cac",
+        }
+        result = {
+            "string_2": "7c674878-e544-431c-8c11-f11565299cac",
+        }
+
+        with pytest.raises(DocumentError):
+            validated = Example.validate_object(data)
+
+        with pytest.raises(DocumentError):
+            validated = ExampleChild.validate_object(data)
+
+        Example.schema = {
+            "string_2": {"type": "string", "check_with": "uuid"},
+        }
+
+        # The compiled schema is used until the cache is cleared.
+        with pytest.raises(DocumentError):
+            validated = Example.validate_object(data)
+
+        Example.clear_validator_cache()
+
+        validated = Example.validate_object(data)
+        assert validated == result
+
+        validated = ExampleChild.validate_object(data)
+        assert validated == result
+
+    @pytest.mark.parametrize("compile_mode", [None, "fast"])
+    def test_validated_document_is_adopted(self, compile_mode):
+        class Example(DataSet):
+            schema = {
+                "integer_1": {"type": "integer", "coerce": "to_integer"},
+            }
+
+        Example.compile_mode = compile_mode
+        data = {
+            "integer_1": "12345",
+        }
+
+        validated = Example.validate_object(data)
+        if compile_mode is None:
+            assert Example._validator_pool().acquire().document is validated
+
+        assert type(validated) is Example
+        assert validated == {"integer_1": 12345}
+        assert data == {"integer_1": "12345"}
+        assert [type(v) for v in Example.validate_objects([data, data])] == [
+            Example,
+            Example,
+        ]
+
+    def test_validated_document_is_copied_for_custom_datasets(self):
+        class Example(DataSet):
+            schema = {
+                "string_1": {"type": "string", "coerce": "to_string"},
+            }
+
+            def __setitem__(self, key, value):
+                super(Example, self).__setitem__(key, value.upper())
+
+        validated = Example.validate_object({"string_1": "abc"})
+
+        assert type(validated) is Example
+        assert validated == {"string_1": "abc"}
+        assert Example._new_document({"string_1": "abc"}) == {"string_1": "abc"}
+        assert type(Example._new_document({})) is dict
+
+    @pytest.mark.parametrize("compile_mode", [None, "fast"])
+    def test_as_records(self, compile_mode):
+        class Example(DataSet):
+            schema = {
+                "integer_1": {"type": "integer", "coerce": "to_integer"},
+                "string_1": {"type": "string"},
+            }
+
+        Example.compile_mode = compile_mode
+        data = [
+            {"integer_1": "1", "string_1": "a"},
+            {"integer_1": 2},
+        ]
+
+        records = Example.as_records(data)
+
+        assert records == [{"integer_1": 1, "string_1": "a"}, {"integer_1": 2}]
+        assert all(type(record) is Example.record_type() for record in records)
+        assert Example.record_type().__name__ == "ExampleRecord"
+        assert Example.as_records([]) == []
+
+        with pytest.raises(DocumentError):
+            Example.as_records([{"integer_1": "one"}])
+
+    @pytest.mark.parametrize("compile_mode", [None, "fast"])
+    def test_validate_many_layouts(self, compile_mode):
+        class Example(DataSet):
+            schema = {
+                "integer_1": {"type": "integer", "coerce": "to_integer"},
+                "float_1": {"type": "float", "nullable": True},
+                "string_1": {"type": "string"},
+            }
+
+        Example.compile_mode = compile_mode
+        response = {
+            "data": [
+                {"integer_1": "1", "float_1": 0.5, "string_1": "a"},
+                {"integer_1": 2, "float_1": None},
+            ]
+        }
+        result = [
+            {"integer_1": 1, "float_1": 0.5, "string_1": "a"},
+            {"integer_1": 2, "float_1": None},
+        ]
+
+        assert Example.validate_many(response) == result
+        assert Example.validate_many(response, layout="records") == result
+
+        columns = Example.validate_many(response, layout="columnar")
+        assert columns == {
+            "integer_1": array("q", [1, 2]),
+            "float_1": array("d", [0.5, 0.0]),
+            "string_1": ["a", None],
+        }
+        assert columns.is_null("float_1", 1)
+        assert columns.is_null("string_1", 1)
+
+        empty = Example.validate_many({}, layout="columnar")
+        assert empty.length == 0
+        assert empty["integer_1"] == array("q")
+
+    def test_validate_objects_unknown_layout(self):
+        with pytest.raises(ValueError):
+            ParallelExample.validate_objects([], layout="other")
+
+        with pytest.raises(ValueError):
+            ParallelExample.validate_objects([], workers=2, layout="columnar")
+
+    def test_record_type_is_cleared_with_the_validator_cache(self):
+        class Example(DataSet):
+            schema = {
+                "string_1": {"type": "string"},
+            }
+
+        record_type = Example.record_type()
+        assert Example.record_type() is record_type
+
+        Example.schema = {
+            "string_1": {"type": "string"},
+            "string_2": {"type": "string"},
+        }
+        Example.clear_validator_cache()
+
+        assert Example.record_type()._fields == ("string_1", "string_2")
+
+    @pytest.mark.parametrize("compile_mode", [None, "fast"])
+    def test_result_cache(self, compile_mode, monkeypatch):
+        class Example(DataSet):
+            result_cache = ResultCache()
+            schema = {
+                "integer_1": {"type": "integer", "coerce": "to_integer"},
+            }
+
+        Example.compile_mode = compile_mode
+        data = {"integer_1": "1"}
+
+        first = Example.validate_object(data)
+        monkeypatch.setattr(
+            Example, "_validate_with_validator", pytest.fail, raising=False
+        )
+        monkeypatch.setattr(Example, "_fast_validator", lambda: pytest.fail())
+        second = Example.validate_object({"integer_1": "1"})
+
+        assert second == first == {"integer_1": 1}
+        assert second is not first
+        assert type(second) is Example
+
+        second["integer_1"] = 2
+        assert Example.validate_object(data) == {"integer_1": 1}
+        assert Example.result_cache.info()["hits"] == 2
+
+    def test_result_cache_for_lists(self):
+        class Example(DataSet):
+            result_cache = ResultCache()
+            schema = {
+                "integer_1": {"type": "integer", "coerce": "to_integer"},
+            }
+
+        data = [{"integer_1": "1"}, {"integer_1": 2}]
+
+        assert Example.validate_objects(data) == [{"integer_1": 1}, {"integer_1": 2}]
+        assert Example.validate_objects(data, layout="records") == [
+            {"integer_1": 1},
+            {"integer_1": 2},
+        ]
+        columns = Example.validate_objects(data, layout="columnar")
+        assert list(columns["integer_1"]) == [1, 2]
+        assert Example.result_cache.info()["hits"] == 2
+
+        with pytest.raises(DocumentError):
+            Example.validate_objects([{"integer_1": "one"}])
+        with pytest.raises(DocumentError):
+            Example.validate_objects([{"integer_1": "one"}])
+        assert len(Example.result_cache) == 1
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_result_cache_is_not_used_by_workers(self, executor):
+        ParallelExample.result_cache = ResultCache()
+        try:
+            data = [{"integer_1": str(i), "string_1": "a"} for i in range(10)]
+            validated = ParallelExample.validate_objects(
+                data, workers=2, executor=executor, chunk_size=3
+            )
+
+            assert validated == [{"integer_1": i, "string_1": "a"} for i in range(10)]
+            assert len(ParallelExample.result_cache) == 0
+            assert ParallelExample.result_cache.info()["misses"] == 0
+        finally:
+            ParallelExample.result_cache = None
+
+    def test_result_cache_never_makes_invalid_input_valid(self):
+        class Example(DataSet):
+            result_cache = ResultCache()
+            schema = {
+                "1": {"type": "string"},
+            }
+
+        assert Example.validate_object({"1": "x"}) == {"1": "x"}
+        with pytest.raises(DocumentError):
+            Example.validate_object({1: "x"})
+        assert len(Example.result_cache) == 1
+
+    def test_result_cache_keys(self):
+        cache = ResultCache()
+
+        class Example(DataSet):
+            result_cache = cache
+            schema = {
+                "string_1": {"type": "string"},
+            }
+
+        class Other(Example):
+            pass
+
+        key = Example._result_key({"a": 1, "b": 2})
+        assert key == Example._result_key({"b": 2, "a": 1})
+        assert key != Other._result_key({"a": 1, "b": 2})
+        assert key != Example._result_key({"a": 1, "b": 3})
+        assert Example._result_key({"a": date(2020, 1, 1)}) is None
+        assert Example._result_key({1: "x"}) is None
+        assert Example._result_key({"a": (1, 2)}) is None
+        assert Example._result_key([{"a": [1, {"b": None}]}]) is not None
+
+        Example.schema = {
+            "string_1": {"type": "string", "nullable": True},
+        }
+        Example.clear_validator_cache()
+        assert key != Example._result_key({"a": 1, "b": 2})
+
+    def test_validate_patch(self):
+        class Example(DataSet):
+            schema = {
+                "integer_1": {"type": "integer", "coerce": "to_integer"},
+                "date_1": {"type": "date", "nullable": True, "coerce": "to_date"},
+                "string_1": {"type": "string", "required": True},
+            }
+
+        original = Example.validate_object(
+            {"integer_1": "1", "date_1": "2020-01-31", "string_1": "a"}
+        )
+
+        validated = Example.validate_patch(original, {"integer_1": "2"})
+
+        assert validated == {
+            "integer_1": 2,
+            "date_1": date(2020, 1, 31),
+            "string_1": "a",
+        }
+        assert type(validated) is Example
+        assert original["integer_1"] == 1
+
+        patch = {"integer_1": "two", "unknown": 1}
+        with pytest.raises(DocumentError) as patch_error:
+            Example.validate_patch(original, patch)
+
+        with pytest.raises(DocumentError) as error:
+            Example.validate_object({**original, **patch})
+
+        assert sorted(patch_error.value.args[0]) == ["integer_1", "unknown"]
+        assert patch_error.value.args == error.value.args
+
+    def test_validate_patch_only_validates_changed_fields(self, monkeypatch):
+        class Example(DataSet):
+            schema = {
+                "integer_1": {"type": "integer", "coerce": "to_integer"},
+                "integer_2": {"type": "integer", "coerce": "to_integer"},
+            }
+
+        coerced = []
+        monkeypatch.setattr(
+            Validator,
+            "_normalize_coerce_to_integer",
+            lambda self, value: coerced.append(value) or int(value),
+        )
+
+        validated = Example.validate_patch(
+            {"integer_1": 1, "integer_2": 2}, {"integer_2": "3"}
+        )
+
+        assert validated == {"integer_1": 1, "integer_2": 3}
+        assert coerced == ["3"]
+
+    def test_validate_patch_checks_dependent_fields(self):
+        class Example(DataSet):
+            schema = {
+                "kind": {"type": "string"},
+                "size": {"type": "integer", "dependencies": {"kind": ["box"]}},
+                "colour": {"type": "string", "excludes": "pattern"},
+                "pattern": {"type": "string"},
+                "label": {"type": "string", "dependencies": "^colour"},
+            }
+
+        original = Example.validate_object({"kind": "box", "size": 1, "colour": "red"})
+
+        assert Example.validate_patch(original, {"size": 2})["size"] == 2
+        assert Example.validate_patch(original, {"label": "a"})["label"] == "a"
+
+        with pytest.raises(DocumentError) as e:
+            Example.validate_patch(original, {"kind": "bag"})
+        assert list(e.value.args[0]) == ["size"]
+
+        with pytest.raises(DocumentError) as e:
+            Example.validate_patch(original, {"pattern": "spots"})
+        assert list(e.value.args[0]) == ["colour"]
+
+        with pytest.raises(DocumentError) as e:
+            Example.validate_patch({"kind": "box"}, {"label": "a"})
+        assert list(e.value.args[0]) == ["label"]
+
+    def test_precompile_all(self):
+        class Example(DataSet):
+            schema = {
+                "string_1": {"type": "string"},
+            }
+
+        class FastExample(Example):
+            compile_mode = "fast"
+
+        class Base(DataSet):
+            pass
+
+        class Child(Base, FastExample):
+            pass
+
+        timings = Example.precompile_all(validators=2)
+
+        prefix = f"{__name__}.TestDataSet.test_precompile_all.<locals>"
+        assert list(timings) == [
+            f"{prefix}.Example",
+            f"{prefix}.FastExample",
+            f"{prefix}.Child",
+        ]
+        assert list(timings[f"{prefix}.Example"]) == ["validator"]
+        assert list(timings[f"{prefix}.FastExample"]) == [
+            "validator",
+            "fast_validator",
+        ]
+        assert len(Example._validator_pool()) == 2
+        assert FastExample._validator_key() in DataSet._fast_validators
+        assert Base._validator_key() not in DataSet._validator_pools
+
+    def test_precompile_all_adds_to_the_pool(self):
+        class Example(DataSet):
+            validator_pool_size = 3
+            schema = {
+                "string_1": {"type": "string"},
+            }
+
+        Example.validate_object({"string_1": "a"})
+        pool = Example._validator_pool()
+        assert len(pool) == 1
+
+        Example.precompile_all(validators=1)
+        assert len(pool) == 2
+        validators = [pool.acquire(), pool.acquire()]
+        assert validators[0] is not validators[1]
+        for validator in validators:
+            pool.release(validator)
+
+        Example.precompile_all(validators=5)
+        assert len(pool) == 3
+
     def test_replacing_validator(self):
         DataSet.set_validator(Validator(allow_unknown=True))
 
@@ -0,0 +1,259 @@
+import pytest
+from cerberus import DocumentError
+from flask_api_tools.validators import DataSet, Validator
+from flask_api_tools.validators.fast_validator import compile_schema
+
+schema = {
+    "string_1": {"type": "string", "check_with": "uuid"},
+    "string_2": {"type": "string", "coerce": "to_string"},
+    "string_3": {
+        "type": "string",
+        "nullable": True,
+        "coerce": "to_nullable_string",
+    },
+    "integer_1": {"type": "integer", "coerce": "to_integer"},
+    "integer_2": {
+        "type": "integer",
+        "nullable": True,
+        "coerce": "to_nullable_integer",
+    },
+    "boolean_1": {"type": "boolean", "coerce": "to_bool"},
+    "float_1": {"type": "float", "coerce": "to_float"},
+    "date_1": {"type": "date", "nullable": True, "coerce": "to_date"},
+    "number_1": {"type": ["integer", "float"], "required": True},
+}
+
+valid = {
+    "string_1": "7c674878-e544-431c-8c11-f11565299cac",
+    "string_2": None,
+    "string_3": "",
+    "integer_1": "5",
+    "integer_2": None,
+    "boolean_1": "True",
+    "float_1": "1.5",
+    "date_1": "2020-01-01",
+    "number_1": 3,
+}
+
+documents = [
+    valid,
+    {**valid, "string_1": "not a uuid"},
+    {**valid, "string_1": None},
+    {**valid, "string_1": 1337},
+    {**valid, "integer_1": "five"},
+    {**valid, "integer_2": "5.5"},
+    {**valid, "boolean_1": "yes"},
+    {**valid, "date_1": "not a date"},
+    {**valid, "number_1": True},
+    {**valid, "number_1": None},
+    {**valid, "unknown": 1},
+    {k: v for k, v in valid.items() if k != "number_1"},
+    {k: v for k, v in valid.items() if k != "string_2"},
+    {},
+]
+
+
+class Example(DataSet):
+    schema = schema
+
+
+class FastExample(DataSet):
+    compile_mode = "fast"
+    schema = schema
+
+
+def outcome(data_set, document):
+    try:
+        return data_set.validate_object(document)
+    except DocumentError as e:
+        return e.args[0]
+
+
+class TestFastValidator:
+    @pytest.mark.parametrize("document", documents)
+    def test_matches_validator(self, document):
+        assert FastExample._fast_validator() is not None
+        assert outcome(FastExample, document) == outcome(Example, document)
+
+    @pytest.mark.parametrize("document", documents)
+    def test_matches_validator_with_config(self, document):
+        class Relaxed(Example):
+            allow_unknown = True
+            require_all = True
+
+        class FastRelaxed(FastExample):
+            allow_unknown = True
+            require_all = True
+
+        assert outcome(FastRelaxed, document) == outcome(Relaxed, document)
+
+    @pytest.mark.parametrize("document", documents)
+    def test_matches_validator_when_purging(self, document):
+        class Purging(Example):
+            purge_unknown = True
+
+        class FastPurging(FastExample):
+            purge_unknown = True
+
+        assert outcome(FastPurging, document) == outcome(Purging, document)
+
+    def test_validate_objects(self):
+        assert FastExample.validate_objects([valid, valid]) == Example.validate_objects(
+            [valid, valid]
+        )
+
+        with pytest.raises(DocumentError):
+            FastExample.validate_objects([valid, {}])
+
+    def test_validate_objects_from_a_generator(self):
+        assert FastExample.validate_objects(
+            dict(valid) for _ in range(2)
+        ) == Example.validate_objects([valid, valid])
+        assert FastExample._fast_validator().validate_many(
+            dict(valid) for _ in range(2)
+        ) == FastExample._fast_validator().validate_many([valid, valid])
+
+    def test_input_is_not_modified(self):
+        document = dict(valid)
+
+        FastExample.validate_object(document)
+
+        assert document == valid
+
+    def test_unsupported_rules_fall_back(self):
+        class FastFallback(DataSet):
+            compile_mode = "fast"
+            schema = {
+                "string_1": {"type": "string", "maxlength": 3},
+            }
+
+        assert FastFallback._fast_validator() is None
+        assert FastFallback.validate_object({"string_1": "abc"}) == {"string_1": "abc"}
+
+        with pytest.raises(DocumentError):
+            FastFallback.validate_object({"string_1": "abcd"})
+
+    def test_unsupported_config_falls_back(self):
+        validator = Validator(schema=schema, ignore_none_values=True)
+
+        assert compile_schema(validator) is None
+
+    def test_unsupported_coercer_falls_back(self):
+        validator = Validator(
+            schema={"string_1": {"type": "string", "coerce": ["to_string"]}}
+        )
+
+        assert compile_schema(validator) is None
+
+    def test_clear_validator_cache(self):
+        class FastCached(DataSet):
+            compile_mode = "fast"
+            schema = {
+                "string_1": {"type": "string"},
+            }
+
+        fast_validator = FastCached._fast_validator()
+        assert FastCached._fast_validator() is fast_validator
+
+        FastCached.clear_validator_cache()
+        assert FastCached._fast_validator() is not fast_validator
+
+    def test_validate_many_matches_validate(self):
+        fast_validator = FastExample._fast_validator()
+
+        batch = fast_validator.validate_many(documents)
+
+        assert batch == [fast_validator.validate(d) for d in documents]
+        assert batch[0] is not None
+        assert batch[1] is None
+
+    def test_validate_many_with_config(self):
+        class FastRelaxed(FastExample):
+            allow_unknown = True
+            require_all = True
+
+        class FastPurging(FastExample):
+            purge_unknown = True
+
+        for data_set in (FastRelaxed, FastPurging):
+            fast_validator = data_set._fast_validator()
+
+            batch = fast_validator.validate_many(documents)
+
+            assert batch == [fast_validator.validate(d) for d in documents]
+
+    def test_validate_many_falls_back_for_non_dictionaries(self):
+        fast_validator = FastExample._fast_validator()
+
+        assert fast_validator.validate_many([valid, None]) == [None, None]
+
+    def test_bulk_validate_objects(self):
+        rows = [
+            {**valid, "integer_1": str(i), "date_1": f"2020-01-{i % 28 + 1:02}"}
+            for i in range(100)
+        ]
+
+        assert FastExample.validate_objects(rows) == Example.validate_objects(rows)
+        assert all(
+            type(row) is FastExample for row in FastExample.validate_objects(rows)
+        )
+
+    @pytest.mark.parametrize("document", documents[1:])
+    def test_bulk_validate_objects_raises_for_first_invalid_row(self, document):
+        rows = [valid, document, {}]
+
+        with pytest.raises(DocumentError) as fast_error:
+            FastExample.validate_objects(rows)
+
+        with pytest.raises(DocumentError) as error:
+            Example.validate_objects(rows)
+
+        assert fast_error.value.args == error.value.args
+
+    def test_columnar_layout_matches_validator(self):
+        class Strict(Example):
+            allow_unknown = False
+
+        class FastStrict(FastExample):
+            allow_unknown = False
+
+        rows = [valid, {k: v for k, v in valid.items() if k != "string_2"}]
+
+        columns = FastStrict.validate_objects(rows, layout="columnar")
+
+        assert FastStrict._fast_validator().validate_columns(rows) is not None
+        assert columns == Strict.validate_objects(rows, layout="columnar")
+        assert columns.is_null("string_2", 1)
+        assert rows[0] == valid
+
+    @pytest.mark.parametrize("document", documents[1:])
+    def test_columnar_layout_raises_for_first_invalid_row(self, document):
+        rows = [valid, document, {}]
+
+        assert FastExample._fast_validator().validate_columns(rows) is None
+
+        with pytest.raises(DocumentError) as fast_error:
+            FastExample.validate_objects(rows, layout="columnar")
+
+        with pytest.raises(DocumentError) as error:
+            Example.validate_objects(rows, layout="columnar")
+
+        assert fast_error.value.args == error.value.args
+
+    def test_columnar_layout_with_unknown_fields(self):
+        class FastRelaxed(FastExample):
+            allow_unknown = True
+
+        class FastPurging(FastExample):
+            allow_unknown = False
+            purge_unknown = True
+
+        rows = [{**valid, "unknown": 1}]
+
+        assert FastRelaxed._fast_validator().columns_function is None
+        with pytest.raises(ValueError):
+            FastRelaxed.validate_objects(rows, layout="columnar")
+
+        columns = FastPurging.validate_objects(rows, layout="columnar")
+        assert "unknown" not in columns
+        assert rows[0]["unknown"] == 1
@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The most time importing the package and DataSet may take, in microseconds.
+IMPORT_TIME_BUDGET = 500000
+
+
+def import_time(code: str):
+    """
+    Run code in a new interpreter with -X importtime.
+    :param code: The code.
+    :return: The cumulative import time of each module imported at the top level,
+             rather than by another module, in microseconds, and what the code
+             printed.
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line[len("import time:") :].split("|")
+            # Modules imported by other modules are indented.
+            if cumulative.strip().isdigit() and not module[1:].startswith(" "):
+                times[module.strip()] = int(cumulative)
+    return times, result.stdout.strip()
+
+
+class TestImportTime:
+    def test_data_set_does_not_load_the_sanitiser(self):
+        times, output = import_time(
+            "import sys\n"
+            "from flask_api_tools.validators import DataSet\n"
+            "print('bleach' in sys.modules, 'flask' in sys.modules)"
+        )
+
+        assert output == "False False"
+        assert not any("sanitised_data_set" in module for module in times)
+
+    def test_import_time_is_within_budget(self):
+        baseline, _ = import_time("pass")
+        times, _ = import_time("from flask_api_tools.validators import DataSet")
+
+        # Modules imported through importlib are not timed themselves, but every
+        # module they import is.
+        total = sum(times.values()) - sum(baseline.values())
+        assert "flask_api_tools.validators.fast_validator" in times
+        assert total < IMPORT_TIME_BUDGET
+
+    def test_names_are_loaded_when_used(self):
+        _, output = import_time(
+            "import sys\n"
+            "import flask_api_tools.validators as validators\n"
+            "print('bleach' in sys.modules)\n"
+            "print(validators.SanitisedDataSet.__name__, 'bleach' in sys.modules)\n"
+            "print(validators.warmup.__name__, 'warmup' in dir(validators))"
+        )
+
+        assert output.splitlines() == [
+            "False",
+            "SanitisedDataSet True",
+            "warmup True",
+        ]
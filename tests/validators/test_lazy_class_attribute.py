@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+from flask_api_tools.validators.lazy_class_attribute import LazyClassAttribute
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestLazyClassAttribute:
+    def test_value_is_built_once(self):
+        built = []
+
+        class Example:
+            value = LazyClassAttribute(lambda owner: built.append(owner) or 1)
+
+        class Child(Example):
+            pass
+
+        assert Child.value == 1
+        assert Example.value == 1
+        assert built == [Example]
+        assert Example.__dict__["value"] == 1
+
+    def test_validator_config_can_be_read_first(self):
+        # The factory of _validator_config reads _validator, so this would hang
+        # rather than fail if reading a lazy attribute in a factory deadlocked.
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "from flask_api_tools.validators import DataSet, SanitisedDataSet\n"
+                "print(type(DataSet._validator_config).__name__)\n"
+                "print(type(SanitisedDataSet._validator_config).__name__)",
+            ],
+            capture_output=True,
+            check=True,
+            env=dict(os.environ, PYTHONPATH=ROOT),
+            text=True,
+            timeout=60,
+        )
+
+        assert result.stdout.split() == ["dict", "dict"]
@@ -0,0 +1,85 @@
+import threading
+
+from datetime import date
+from flask_api_tools.validators.parse_cache import ParseCache
+
+
+class TestParseCache:
+    def test_results_are_cached(self):
+        calls = []
+
+        def parse(value):
+            calls.append(value)
+            return date.fromisoformat(value)
+
+        cache = ParseCache(maxsize=4)
+
+        assert cache.get("date", "2020-01-01", parse) == date(2020, 1, 1)
+        assert cache.get("date", "2020-01-01", parse) == date(2020, 1, 1)
+        assert calls == ["2020-01-01"]
+        assert cache.info() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 4}
+
+    def test_keys_include_the_kind_and_type(self):
+        cache = ParseCache(maxsize=4)
+
+        assert cache.get("a", 1, lambda value: "int") == "int"
+        assert cache.get("a", True, lambda value: "bool") == "bool"
+        assert cache.get("b", 1, lambda value: "other") == "other"
+        assert len(cache) == 3
+
+    def test_least_recently_used_results_are_evicted(self):
+        cache = ParseCache(maxsize=2)
+
+        cache.get("kind", "a", str.upper)
+        cache.get("kind", "b", str.upper)
+        cache.get("kind", "a", str.upper)
+        cache.get("kind", "c", str.upper)
+
+        assert len(cache) == 2
+        assert cache.get("kind", "a", str.lower) == "A"
+        assert cache.get("kind", "b", str.lower) == "b"
+
+    def test_exceptions_and_unhashable_values_are_not_cached(self):
+        cache = ParseCache(maxsize=2)
+
+        try:
+            cache.get("int", "one", int)
+        except ValueError:
+            pass
+
+        assert cache.get("list", [1, 2], len) == 2
+        assert len(cache) == 0
+
+    def test_clear(self):
+        cache = ParseCache(maxsize=2)
+        cache.get("kind", "a", str.upper)
+        cache.get("kind", "a", str.upper)
+
+        cache.clear()
+
+        assert cache.info() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 2}
+
+    def test_concurrent_use(self):
+        cache = ParseCache(maxsize=50)
+        threads = 8
+        iterations = 2000
+        barrier = threading.Barrier(threads)
+        results = []
+
+        def work():
+            barrier.wait()
+            results.extend(
+                cache.get("int", str(i % 100), int) == i % 100
+                for i in range(iterations)
+            )
+
+        workers = [threading.Thread(target=work) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert len(results) == threads * iterations
+        assert all(results)
+        assert cache.hits + cache.misses == threads * iterations
+        assert len(cache) == 50
@@ -0,0 +1,56 @@
+import pytest
+import sys
+
+from flask_api_tools.validators import Record
+
+
+class TestRecord:
+    def test_mapping_interface(self):
+        ExampleRecord = Record.for_fields("ExampleRecord", ("a", "b", "c"))
+        record = ExampleRecord.from_document({"a": 1, "c": None})
+
+        assert record["a"] == 1
+        assert record["c"] is None
+        assert record.get("b", "default") == "default"
+        assert "a" in record
+        assert "b" not in record
+        assert "z" not in record
+        assert list(record) == ["a", "c"]
+        assert len(record) == 2
+        assert dict(record) == {"a": 1, "c": None}
+        assert record == {"a": 1, "c": None}
+        assert {"a": 1, "c": None} == record
+        assert repr(record) == "ExampleRecord({'a': 1, 'c': None})"
+
+        with pytest.raises(KeyError):
+            record["b"]
+
+        with pytest.raises(KeyError):
+            record["z"]
+
+    def test_records_are_read_only(self):
+        ExampleRecord = Record.for_fields("ExampleRecord", ("a",))
+        record = ExampleRecord.from_document({"a": 1})
+
+        with pytest.raises(TypeError):
+            record["a"] = 2
+
+        with pytest.raises(AttributeError):
+            record.a = 2
+
+    def test_unknown_fields(self):
+        ExampleRecord = Record.for_fields("ExampleRecord", ("a",))
+
+        with pytest.raises(ValueError) as e:
+            ExampleRecord.from_document({"a": 1, "z": 2})
+
+        assert str(e.value) == "Records can only hold fields in the schema: z"
+
+    def test_records_are_smaller_than_dicts(self):
+        fields = tuple(f"field_{i}" for i in range(20))
+        ExampleRecord = Record.for_fields("ExampleRecord", fields)
+        document = {field: index for index, field in enumerate(fields)}
+        record = ExampleRecord.from_document(document)
+
+        size = sys.getsizeof(record) + sys.getsizeof(record._values)
+        assert size < sys.getsizeof(document) * 0.6
@@ -0,0 +1,46 @@
+import pickle
+
+from flask_api_tools.validators import RedisResultCache
+
+
+class TestRedisResultCache:
+    def test_results_are_shared_through_redis(self, app):
+        cache = RedisResultCache(ttl=60)
+        other = RedisResultCache(redis=app.redis, ttl=60)
+
+        cache.set("key", {"a": [1, 2]})
+
+        assert other.get("key") == {"a": [1, 2]}
+        assert other.get("missing") is None
+        assert other.info()["hit_rate"] == 0.5
+        assert len(cache) == 1
+        assert 0 < app.redis.pttl("flask_api_tools:result_cache:key") <= 60000
+
+    def test_large_results_are_not_cached(self, app):
+        cache = RedisResultCache(max_bytes=100)
+
+        cache.set("key", "a" * 200)
+
+        assert cache.get("key") is None
+
+    def test_clear(self, app):
+        cache = RedisResultCache(prefix="test:")
+        app.redis.set("other", 1)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert app.redis.get("other") == b"1"
+
+    def test_results_written_by_others_are_not_unpickled(self, app):
+        cache = RedisResultCache()
+
+        class Payload:
+            def __reduce__(self):
+                return (exec, ("raise SystemExit('unpickled')",))
+
+        app.redis.set("flask_api_tools:result_cache:key", pickle.dumps(Payload()))
+
+        assert cache.get("key") is None
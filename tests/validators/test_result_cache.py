@@ -0,0 +1,117 @@
+import pickle
+import pytest
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from flask_api_tools.validators import ResultCache
+from flask_api_tools.validators import result_cache
+
+
+class TestResultCache:
+    def test_hits_are_copies(self):
+        cache = ResultCache()
+        result = {"a": [1, 2]}
+
+        assert cache.get("key") is None
+        cache.set("key", result)
+        hit = cache.get("key")
+        hit["a"].append(3)
+
+        assert hit is not result
+        assert cache.get("key") == {"a": [1, 2]}
+        assert cache.info()["hits"] == 2
+        assert cache.info()["misses"] == 1
+        assert cache.hit_rate == pytest.approx(2 / 3)
+
+    def test_least_recently_used_results_are_evicted(self):
+        cache = ResultCache(maxsize=2)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_results_expire(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+        cache = ResultCache(ttl=10)
+
+        cache.set("a", 1)
+        now[0] += 9
+        assert cache.get("a") == 1
+        now[0] += 1
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_memory_is_capped(self):
+        cache = ResultCache(max_bytes=200)
+
+        cache.set("a", "a" * 80)
+        cache.set("b", "b" * 80)
+        cache.set("c", "c" * 80)
+        cache.set("d", "d" * 300)
+
+        assert cache.get("a") is None
+        assert cache.get("b") == "b" * 80
+        assert cache.get("c") == "c" * 80
+        assert cache.get("d") is None
+        assert cache.info()["bytes"] <= 200
+
+    def test_results_keep_their_types(self):
+        cache = ResultCache()
+        result = {
+            "date": date(2020, 1, 31),
+            "datetime": datetime(2020, 1, 31, 12, 30),
+            "utc": datetime(2020, 1, 31, 12, 30, tzinfo=timezone.utc),
+            "tuple": (1, [2.5, None], {"a": True}),
+            "tagged": {"__date__": "not a date"},
+            "nested": {"__dict__": {"__tuple__": "x"}},
+        }
+
+        cache.set("a", result)
+        hit = cache.get("a")
+
+        assert hit == result
+        assert type(hit["datetime"]) is datetime
+        assert type(hit["date"]) is date
+        assert type(hit["tuple"]) is tuple
+
+    @pytest.mark.parametrize(
+        "result", [lambda: None, {1: "a"}, {"a": {1, 2}}, {"a": Decimal("1")}]
+    )
+    def test_results_that_cannot_be_encoded_are_not_cached(self, result):
+        cache = ResultCache()
+
+        cache.set("a", result)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_results_are_not_unpickled(self):
+        cache = ResultCache()
+        cache._write("a", pickle.dumps({"a": 1}))
+
+        assert cache.get("a") is None
+        assert cache.info()["misses"] == 1
+
+    def test_clear(self):
+        cache = ResultCache()
+        cache.set("a", 1)
+        cache.get("a")
+
+        cache.clear()
+
+        assert cache.info() == {
+            "hits": 0,
+            "misses": 0,
+            "hit_rate": 0.0,
+            "size": 0,
+            "maxsize": 1024,
+            "bytes": 0,
+            "max_bytes": None,
+        }
@@ -1,4 +1,6 @@
+import json
 import pytest
+import threading
 from cerberus import DocumentError
 from flask_api_tools.validators import DataSet, SanitisedDataSet, Validator
 
@@ -189,3 +191,304 @@ class TestSanitisedDataSet:
 
         validated = Example1.validate_object(data)
         assert validated == result
+
+    def test_allowed_tags_can_be_set_per_class(self):
+        class Example(SanitisedDataSet):
+            allowed_tags = {"b"}
+            allowed_attributes = {}
+            strip = True
+
+        data = Example({"name": "<b>bold</b> <i>italic</i> <script>x</script>"})
+        default = SanitisedDataSet({"name": "<b>bold</b> <i>italic</i>"})
+
+        assert data["name"] == "<b>bold</b> italic x"
+        assert default["name"] == "<b>bold</b> <i>italic</i>"
+
+    def test_strings_without_markup_are_not_parsed(self):
+        value = "A plain string with \"quotes\", 'apostrophes'\tand\nnewlines"
+
+        data = SanitisedDataSet({"name": value})
+
+        assert data["name"] is value
+
+    def test_control_characters_are_cleaned(self):
+        data = SanitisedDataSet({"name": "a\r\nb\x00c\x0cd"})
+
+        assert data["name"] == "a\nbc?d"
+
+    def test_cleaner_is_reused_per_thread(self):
+        class Example(SanitisedDataSet):
+            pass
+
+        cleaner = Example._cleaner()
+        other_threads = []
+        thread = threading.Thread(
+            target=lambda: other_threads.append(Example._cleaner())
+        )
+        thread.start()
+        thread.join()
+
+        assert Example._cleaner() is cleaner
+        assert SanitisedDataSet._cleaner() is not cleaner
+        assert other_threads[0] is not cleaner
+
+    def test_nested_values_are_copied_on_write(self):
+        nested = {"name": "<script>", "tags": ["<b>ok</b>", "<script>", 5]}
+        items = [{"label": "<script>"}, {"label": "plain"}]
+        clean = {"name": "plain", "tags": ["<b>ok</b>"]}
+
+        data = SanitisedDataSet({"nested": nested, "items": items, "clean": clean})
+
+        assert data == {
+            "nested": {
+                "name": "&lt;script&gt;",
+                "tags": ["<b>ok</b>", "&lt;script&gt;", 5],
+            },
+            "items": [{"label": "&lt;script&gt;"}, {"label": "plain"}],
+            "clean": {"name": "plain", "tags": ["<b>ok</b>"]},
+        }
+        assert nested == {"name": "<script>", "tags": ["<b>ok</b>", "<script>", 5]}
+        assert items == [{"label": "<script>"}, {"label": "plain"}]
+        assert data["items"][1] is items[1]
+        assert data["clean"] is clean
+
+    def test_nested_values_are_sanitised_when_validated(self):
+        class Example(SanitisedDataSet):
+            schema = {
+                "items": {"type": "list"},
+            }
+
+        request_data = {"items": [{"label": "<script>"}]}
+        validated = Example.validate(request_data)
+
+        assert validated == {"items": [{"label": "&lt;script&gt;"}]}
+        assert request_data == {"items": [{"label": "<script>"}]}
+
+    @pytest.mark.parametrize("layout", ["rows", "records", "columnar"])
+    def test_validating_does_not_change_the_input(self, layout):
+        class Example(SanitisedDataSet):
+            schema = {
+                "a": {"type": "dict"},
+            }
+
+        data = {"a": {"b": ["<script>"], "c": "<script>"}}
+        Example.validate_object(data)
+        Example.validate_objects([data], layout=layout)
+
+        assert data == {"a": {"b": ["<script>"], "c": "<script>"}}
+
+    def test_each_distinct_string_is_cleaned_once(self, monkeypatch):
+        cleaned = []
+
+        class Example(SanitisedDataSet):
+            pass
+
+        cleaner = Example._cleaner()
+        clean = cleaner.clean
+        monkeypatch.setattr(
+            cleaner, "clean", lambda value: cleaned.append(value) or clean(value)
+        )
+        shared = {"label": "<i>x</i>"}
+
+        data = Example(
+            {
+                "first": "<script>",
+                "second": ["<script>", {"third": "<script>"}],
+                "shared": [shared, shared],
+            }
+        )
+
+        assert cleaned == ["<script>", "<i>x</i>"]
+        assert data["second"] == ["&lt;script&gt;", {"third": "&lt;script&gt;"}]
+
+    def test_max_depth(self):
+        class Example(SanitisedDataSet):
+            sanitise_max_depth = 2
+
+        data = Example({"name": {"first": ["<script>"]}})
+        assert data["name"] == {"first": ["&lt;script&gt;"]}
+
+        with pytest.raises(ValueError):
+            Example({"name": {"first": [["<script>"]]}})
+
+    @pytest.mark.parametrize("layout", ["rows", "records", "columnar"])
+    def test_max_depth_when_validated(self, layout):
+        class Example(SanitisedDataSet):
+            sanitise_max_depth = 2
+            schema = {
+                "name": {"type": "dict"},
+            }
+
+        deep = {"name": {"first": [["<script>"]]}}
+        with pytest.raises(DocumentError) as e:
+            Example.validate(deep)
+        assert e.value.args[0] == {"name": ["nested deeper than 2 levels"]}
+
+        with pytest.raises(DocumentError):
+            Example.validate_objects([{"name": {}}, deep], layout=layout)
+
+    def test_cyclic_values_are_walked_once(self):
+        cyclic = ["<script>"]
+        cyclic.append(cyclic)
+
+        data = SanitisedDataSet({"cyclic": cyclic})
+
+        assert data["cyclic"][0] == "&lt;script&gt;"
+        assert data["cyclic"][1] is data["cyclic"]
+        assert cyclic[0] == "<script>"
+
+    def test_lazy_values_are_sanitised_when_read(self, monkeypatch):
+        class Example(SanitisedDataSet):
+            lazy = True
+
+        cleaned = []
+        cleaner = Example._cleaner()
+        clean = cleaner.clean
+        monkeypatch.setattr(
+            cleaner, "clean", lambda value: cleaned.append(value) or clean(value)
+        )
+
+        data = Example({"first": "<p>", "second": "<h1>", "third": "<div>"})
+        assert cleaned == []
+
+        assert data["first"] == "&lt;p&gt;"
+        assert data["first"] == "&lt;p&gt;"
+        assert data.get("second") == "&lt;h1&gt;"
+        assert cleaned == ["<p>", "<h1>"]
+
+        assert list(data.values()) == ["&lt;p&gt;", "&lt;h1&gt;", "&lt;div&gt;"]
+        assert cleaned == ["<p>", "<h1>", "<div>"]
+
+    def test_lazy_values_cannot_be_read_unsanitised(self):
+        class Example(SanitisedDataSet):
+            lazy = True
+
+        def lazy():
+            data = Example({"name": "<script>"})
+            data["other"] = "<script>"
+            data.setdefault("default", "<script>")
+            return data
+
+        result = {
+            "name": "&lt;script&gt;",
+            "other": "&lt;script&gt;",
+            "default": "&lt;script&gt;",
+        }
+
+        assert lazy() == result
+        assert dict(lazy()) == result
+        assert {**lazy()} == result
+        assert dict(lazy().items()) == result
+        assert lazy().copy() == result
+        assert lazy().pop("name") == "&lt;script&gt;"
+        assert lazy().popitem()[1] == "&lt;script&gt;"
+        assert "<script>" not in repr(lazy())
+        assert json.dumps(lazy()) == json.dumps(result)
+
+    def test_lazy_values_can_be_deleted(self):
+        class Example(SanitisedDataSet):
+            lazy = True
+
+        data = Example({"name": "<script>"})
+        del data["name"]
+
+        assert data.get("name") is None
+        assert data == {}
+
+    def test_lazy_validation(self):
+        class Example(ExampleSanitisedDataSet):
+            lazy = True
+
+        validated = Example.validate(self.input)
+
+        assert validated["key_string"] == "&lt;script&gt;"
+        assert validated == self.output
+
+    def test_validate_many_cleans_each_distinct_string_once(self, monkeypatch):
+        class Example(SanitisedDataSet):
+            schema = {
+                "label": {"type": "string"},
+                "tags": {"type": "list"},
+            }
+
+        cleaned = []
+        cleaner = Example._cleaner()
+        clean = cleaner.clean
+        monkeypatch.setattr(
+            cleaner, "clean", lambda value: cleaned.append(value) or clean(value)
+        )
+        rows = [
+            {"label": f"<p>{i % 3}</p>", "tags": ["<p>tag</p>", "plain"]}
+            for i in range(30)
+        ]
+
+        validated = Example.validate_many({"data": rows})
+
+        assert sorted(cleaned) == ["<p>0</p>", "<p>1</p>", "<p>2</p>", "<p>tag</p>"]
+        assert validated[3] == {
+            "label": "&lt;p&gt;0&lt;/p&gt;",
+            "tags": ["&lt;p&gt;tag&lt;/p&gt;", "plain"],
+        }
+        assert validated[0]["label"] is validated[3]["label"]
+        assert all(type(row) is Example for row in validated)
+
+        result = Example.validate_objects_partial(rows + [{"label": 1, "tags": []}])
+        assert result.valid == validated
+        assert result.errors == {30: {"label": ["must be of string type"]}}
+
+    def test_as_records(self):
+        class Example(SanitisedDataSet):
+            schema = {
+                "label": {"type": "string"},
+                "tags": {"type": "list"},
+            }
+
+        rows = [
+            {"label": "<p>label</p>", "tags": ["<p>tag</p>", "plain"]},
+            {"label": "plain", "tags": []},
+        ]
+
+        records = Example.as_records(rows)
+
+        assert records == [
+            {
+                "label": "&lt;p&gt;label&lt;/p&gt;",
+                "tags": ["&lt;p&gt;tag&lt;/p&gt;", "plain"],
+            },
+            {"label": "plain", "tags": []},
+        ]
+        assert rows[0]["label"] == "<p>label</p>"
+
+    def test_columnar_layout(self):
+        class Example(SanitisedDataSet):
+            schema = {
+                "label": {"type": "string"},
+                "count": {"type": "integer"},
+            }
+
+        rows = [
+            {"label": "<p>label</p>", "count": 1},
+            {"label": "plain", "count": 2},
+        ]
+
+        columns = Example.validate_many({"data": rows}, layout="columnar")
+
+        assert columns["label"] == ["&lt;p&gt;label&lt;/p&gt;", "plain"]
+        assert list(columns["count"]) == [1, 2]
+
+    def test_validate_patch(self):
+        class Example(SanitisedDataSet):
+            schema = {
+                "label": {"type": "string"},
+                "notes": {"type": "string"},
+            }
+
+        original = Example.validate({"label": "<p>label</p>", "notes": "plain"})
+
+        validated = Example.validate_patch(original, {"notes": "<p>notes</p>"})
+
+        assert validated == {
+            "label": "&lt;p&gt;label&lt;/p&gt;",
+            "notes": "&lt;p&gt;notes&lt;/p&gt;",
+        }
+        assert type(validated) is Example
@@ -274,3 +274,61 @@ class TestValidator:
         validator = Validator(schema=schema)
         assert validator.validate(data), validator.errors
         assert validator.document == result
+
+    def test_parse_cache(self):
+        schema = {
+            "string_1": {"type": "string", "check_with": "uuid"},
+            "string_2": {"type": "date", "nullable": True, "coerce": "to_date"},
+            "string_3": {"type": "datetime", "coerce": "to_datetime"},
+        }
+        data = {
+            "string_1": "7c674878-e544-431c-8c11-f11565299cac",
+            "string_2": "1900-01-31",
+            "string_3": "1900-01-31T09:30:00.532649",
+        }
+        result = {
+            "string_1": "7c674878-e544-431c-8c11-f11565299cac",
+            "string_2": date.fromisoformat("1900-01-31"),
+            "string_3": datetime.fromisoformat("1900-01-31T09:30:00.532649"),
+        }
+
+        validator = Validator(schema=schema, parse_cache_size=16)
+        for _ in range(3):
+            assert validator.validate(data), validator.errors
+            assert validator.document == result
+
+        assert validator.parse_cache.info() == {
+            "hits": 6,
+            "misses": 3,
+            "size": 3,
+            "maxsize": 16,
+        }
+
+        assert not validator.validate({**data, "string_1": "not a uuid"})
+        assert validator.errors == {"string_1": ["Must be a UUID"]}
+        assert validator.validate({**data, "string_2": "not a date"})
+        assert validator.document["string_2"] is None
+
+    def test_parse_cache_is_optional(self):
+        validator = Validator()
+
+        assert validator.parse_cache is None
+        assert validator._normalize_coerce_to_date("1900-01-31") == date(1900, 1, 31)
+
+    def test_parse_cache_is_shared_with_child_validators(self):
+        schema = {
+            "dict_1": {
+                "type": "dict",
+                "schema": {"string_1": {"type": "string", "check_with": "uuid"}},
+            },
+        }
+        data = {
+            "dict_1": {"string_1": "7c674878-e544-431c-8c11-f11565299cac"},
+        }
+
+        validator = Validator(schema=schema, parse_cache_size=16)
+        assert validator.validate(data), validator.errors
+        assert validator.validate(data), validator.errors
+
+        assert validator.parse_cache.hits == 1
+        assert validator.parse_cache.misses == 1
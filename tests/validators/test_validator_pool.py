@@ -0,0 +1,112 @@
+import sys
+import threading
+
+from cerberus import DocumentError
+from flask_api_tools.validators import DataSet, Validator
+from flask_api_tools.validators.validator_pool import ValidatorPool
+
+
+class StrictExample(DataSet):
+    schema = {
+        "string_1": {"type": "string", "check_with": "uuid"},
+    }
+
+
+class UnknownExample(DataSet):
+    allow_unknown = True
+    schema = {
+        "integer_1": {"type": "integer", "coerce": "to_integer"},
+    }
+
+
+class RequiredExample(DataSet):
+    require_all = True
+    schema = {
+        "string_1": {"type": "string", "coerce": "to_string"},
+        "float_1": {"type": "float", "coerce": "to_float"},
+    }
+
+
+class TestValidatorPool:
+    def test_acquire_compiles_when_empty(self):
+        pool = ValidatorPool(Validator, size=2)
+
+        first = pool.acquire()
+        second = pool.acquire()
+
+        assert first is not second
+        assert len(pool) == 0
+
+    def test_release_reuses_validators(self):
+        pool = ValidatorPool(Validator, size=2)
+
+        with pool.validator() as validator:
+            assert len(pool) == 0
+
+        assert len(pool) == 1
+        assert pool.acquire() is validator
+
+    def test_pool_is_bounded(self):
+        pool = ValidatorPool(Validator, size=2)
+
+        for validator in [pool.acquire() for _ in range(5)]:
+            pool.release(validator)
+
+        assert len(pool) == 2
+
+    def test_concurrent_validation_of_several_data_sets(self):
+        threads = 16
+        iterations = 200
+        barrier = threading.Barrier(threads)
+        failures = []
+
+        def work(offset):
+            barrier.wait()
+            try:
+                for i in range(iterations):
+                    case = (i + offset) % 4
+                    if case == 0:
+                        validated = StrictExample.validate_object(
+                            {"string_1": "7c674878-e544-431c-8c11-f11565299cac"}
+                        )
+                        assert validated == {
+                            "string_1": "7c674878-e544-431c-8c11-f11565299cac"
+                        }
+                    elif case == 1:
+                        validated = UnknownExample.validate_objects(
+                            [{"integer_1": str(i), "extra": i}]
+                        )
+                        assert validated == [{"integer_1": i, "extra": i}]
+                    elif case == 2:
+                        validated = RequiredExample.validate_object(
+                            {"string_1": None, "float_1": str(i)}
+                        )
+                        assert validated == {"string_1": "", "float_1": float(i)}
+                    else:
+                        try:
+                            RequiredExample.validate_object({"extra": i})
+                        except DocumentError as e:
+                            assert e.args[0] == {
+                                "extra": ["unknown field"],
+                                "float_1": ["required field"],
+                                "string_1": ["required field"],
+                            }
+                        else:
+                            raise AssertionError("Expected a DocumentError")
+            except Exception as e:
+                failures.append(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            workers = [threading.Thread(target=work, args=(n,)) for n in range(threads)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert not failures, failures
+        assert not StrictExample._validator.schema
+        assert not UnknownExample._validator.allow_unknown
@@ -0,0 +1,24 @@
+import logging
+
+from flask_api_tools.validators import SanitisedDataSet, warmup
+
+
+class WarmupExample(SanitisedDataSet):
+    schema = {
+        "string_1": {"type": "string"},
+    }
+
+
+class TestWarmup:
+    def test_warmup(self, app, caplog):
+        app.logger.setLevel(logging.DEBUG)
+
+        with caplog.at_level(logging.DEBUG, logger=app.logger.name):
+            timings = warmup(app)
+
+        steps = timings[f"{__name__}.WarmupExample"]
+        assert list(steps) == ["validator", "sanitiser"]
+        assert all(seconds >= 0 for seconds in steps.values())
+        assert len(WarmupExample._validator_pool()) >= 1
+        assert f"Warmed up {len(timings)} datasets in" in caplog.text
+        assert f"Warmed up {__name__}.WarmupExample: validator" in caplog.text